@@ -1,9 +1,67 @@
 # app.py
-from flask import Flask, render_template
+from flask import Flask, abort, jsonify, render_template, request, send_file
+from functools import lru_cache
 from pathlib import Path
+from werkzeug.security import safe_join
+import hashlib
+import mimetypes
 from src.config import CONFIG
-
-app = Flask(__name__, template_folder="templates")
+from src.core.pipeline import surface_path
+from src.utils.file_io import ENCODINGS, read_surface
+from src.utils.plotting import PLOTLY_JS, surface_payload
+
+# /static é servido por `static_artifact` (variantes pré-comprimidas + cache HTTP)
+app = Flask(__name__, template_folder="templates", static_folder=None)
+
+# Relativos ao app, não ao cwd: o wsgi.py importa o app de outro diretório
+DATA_DIR = Path(app.root_path) / "data"
+STATIC_DIR = Path(app.root_path) / "static"
+SURFACES = ("di", "spread", "ipca")
+
+# HTMLs mudam a cada execução do pipeline: sempre revalidar (ETag -> 304).
+# O plotly.js só muda com a versão do plotly.
+CACHE_CONTROL = {PLOTLY_JS: "public, max-age=86400"}
+DEFAULT_CACHE_CONTROL = "public, no-cache"
+
+
+@lru_cache(maxsize=256)
+def _content_hash(path: str, mtime_ns: int, size: int) -> str:
+    # mtime/tamanho na chave: um artefato regravado gera outro hash
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:32]
+
+
+@app.route("/static/<path:filename>")
+def static_artifact(filename):
+    """
+    Artefatos do pipeline com negociação de Content-Encoding (br > gzip > sem
+    compressão, conforme as variantes gravadas), ETag forte pelo hash do
+    conteúdo, Last-Modified e Cache-Control; requisições condicionais recebem 304.
+    """
+    path = safe_join(str(STATIC_DIR), filename)
+    if path is None or not Path(path).is_file():
+        abort(404)
+    path = Path(path)
+    stat = path.stat()
+    digest = _content_hash(str(path), stat.st_mtime_ns, stat.st_size)
+
+    served, encoding = path, None
+    for name, suffix in ENCODINGS.items():
+        variant = path.with_name(path.name + suffix)
+        if request.accept_encodings[name] and variant.is_file() \
+                and variant.stat().st_mtime_ns >= stat.st_mtime_ns:
+            served, encoding = variant, name
+            break
+
+    # Cada representação tem sua própria ETag forte
+    etag = digest if encoding is None else f"{digest}-{encoding}"
+    mimetype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    response = send_file(served, mimetype=mimetype, download_name=path.name, etag=etag,
+                         last_modified=stat.st_mtime, conditional=True, max_age=None)
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = CACHE_CONTROL.get(path.name, DEFAULT_CACHE_CONTROL)
+    return response
 
 
 @app.route("/")
@@ -41,5 +99,18 @@ def show_wla_summary():
     return render_template("summary_iframe.html", chart="static/ipca_summary_table.html")
 
 
+@app.route("/api/surface/<name>")
+def surface_api(name):
+    """Superfície em resolução total (datas x tenores), ?start=AAAA-MM-DD&end=AAAA-MM-DD."""
+    path = surface_path(DATA_DIR, name)
+    if name not in SURFACES or not path.is_file():
+        abort(404)
+    try:
+        df = read_surface(path, request.args.get("start") or None, request.args.get("end") or None)
+    except (ValueError, KeyError, TypeError):
+        abort(400)
+    return jsonify(surface_payload(df))
+
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,239 @@
+"""Micro-benchmarks of the finmath and calendars hot functions.
+
+Each case is timed with a calibrated number of calls per sample (doubled
+until one sample takes at least --min-time), repeated --repeat times; the
+best per-call time is reported. Results can be stored as a baseline and
+later runs compared against it.
+
+    python benchmarks/micro.py                              # print timings
+    python benchmarks/micro.py --save benchmarks/results/micro_baseline.json
+    python benchmarks/micro.py --compare benchmarks/results/micro_baseline.json --threshold 0.25
+
+In comparison mode the exit status is 1 when any case is slower than the
+baseline by more than the threshold.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+
+# name -> setup(); setup returns the zero-argument callable to time
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+
+def _dates():
+    import pandas as pd
+    start = pd.Timestamp("2025-06-30")
+    ends = pd.date_range("2025-07-01", periods=1000, freq="3D")
+    return start, pd.Timestamp("2031-03-17"), ends
+
+
+def _curve():
+    import pandas as pd
+    return pd.Series([0.14, 0.142, 0.139, 0.135, 0.133, 0.134],
+                     index=[1 / 252, 0.25, 1.0, 2.0, 5.0, 10.0])
+
+
+@case("flat_forward_interpolation[scalar]")
+def _flat_forward_scalar():
+    from finmath.termstructure.curve_models import flat_forward_interpolation
+    curve = _curve()
+    return lambda: flat_forward_interpolation(3.3, curve)
+
+
+@case("flat_forward_rates[array]")
+def _flat_forward_array():
+    import numpy as np
+    from finmath.termstructure.curve_models import flat_forward_rates
+    curve = _curve()
+    knots, rates = curve.index.to_numpy(), curve.to_numpy()
+    t = np.linspace(0.01, 12.0, 1000)
+    return lambda: flat_forward_rates(t, knots, rates)
+
+
+@case("forward_rate[scalar]")
+def _forward_rate():
+    from finmath.termstructure.curve_models import forward_rate
+    curve = _curve()
+    return lambda: forward_rate(1.5, 4.0, curve)
+
+
+def _daycount_cases():
+    """tf/days/workday over scalar and array dates for every convention."""
+    from calendars import DayCounts
+
+    for dc in DayCounts.dc_domain():
+        for method in ("tf", "days", "workday"):
+            for kind in ("scalar", "array"):
+                def setup(dc=dc, method=method, kind=kind):
+                    counts = DayCounts(dc.lower(), calendar="cdr_anbima")
+                    start, end, ends = _dates()
+                    if method == "workday":
+                        d = start if kind == "scalar" else ends
+                        return lambda: counts.workday(d, 5)
+                    d2 = end if kind == "scalar" else ends
+                    func = getattr(counts, method)
+                    return lambda: func(start, d2)
+                CASES[f"DayCounts.{method}[{dc},{kind}]"] = setup
+
+
+_daycount_cases()
+
+
+@case("CorpsCalcs1[coupon,rate]")
+def _corps_rate():
+    from finmath.brazilian_bonds.corporate_bonds import CorpsCalcs1
+    return lambda: CorpsCalcs1(expiry="2030-05-15", rate=0.12, coupon_rate=0.1,
+                               freq=2, ref_date="2025-06-30")
+
+
+@case("CorpsCalcs1[zero,price]")
+def _corps_price():
+    from finmath.brazilian_bonds.corporate_bonds import CorpsCalcs1
+    return lambda: CorpsCalcs1(expiry="2030-05-15", price=60.0, coupon_rate=0.0,
+                               ref_date="2025-06-30")
+
+
+def _bonds():
+    import pandas as pd
+    ref_date = pd.Timestamp("2025-06-30")
+    cash_flows = []
+    for m in ["2026-01-15", "2027-01-15", "2028-07-17", "2030-01-15", "2035-01-15"]:
+        dates = pd.date_range(end=m, periods=20, freq="6MS") + pd.Timedelta(days=14)
+        dates = [d for d in dates if d > ref_date]
+        cash_flows.append(pd.Series([6.0] * (len(dates) - 1) + [106.0], index=dates))
+    return ref_date, cash_flows
+
+
+@case("NelsonSiegelSvensson[fit]")
+def _nss_fit():
+    from finmath.termstructure.curve_models import NelsonSiegelSvensson
+    ref_date, cash_flows = _bonds()
+    prices = [101.0, 99.5, 98.0, 95.0, 90.0]
+    return lambda: NelsonSiegelSvensson(prices, cash_flows, ref_date=ref_date)
+
+
+@case("NelsonSiegelSvensson[fit_lambdas]")
+def _nss_fit_lambdas():
+    from finmath.termstructure.curve_models import NelsonSiegelSvensson
+    ref_date, cash_flows = _bonds()
+    prices = [101.0, 99.5, 98.0, 95.0, 90.0]
+    return lambda: NelsonSiegelSvensson(prices, cash_flows, ref_date=ref_date, fit_lambdas=True)
+
+
+@case("CurveBootstrap")
+def _bootstrap():
+    from finmath.termstructure.curve_models import CurveBootstrap
+    import pandas as pd
+    ref_date, cash_flows = _bonds()
+    bills = [pd.Series([100.0], index=[pd.Timestamp(m)])
+             for m in ["2025-10-01", "2026-01-02", "2026-07-01"]]
+    rates = [0.145, 0.146, 0.144, 0.141, 0.138, 0.135, 0.132]
+    return lambda: CurveBootstrap(bills + cash_flows[1:], rates=rates, ref_date=ref_date)
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+def calibrate(func, min_time):
+    """Calls per sample so that one sample takes at least `min_time` seconds."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_time:
+            return number
+        number *= 2
+
+
+def measure(func, min_time=0.05, repeat=5):
+    number = calibrate(func, min_time)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {"best_s": min(samples), "median_s": statistics.median(samples), "number": number}
+
+
+def run(names, min_time, repeat):
+    results = {}
+    for name in names:
+        try:
+            func = CASES[name]()
+            func()  # warm caches (calendars, imports) outside the timing
+        except Exception as exc:  # convention not supported by the function
+            results[name] = {"error": f"{type(exc).__name__}: {exc}"}
+            print(f"{name:<48} skipped ({type(exc).__name__})")
+            continue
+        results[name] = measure(func, min_time, repeat)
+        print(f"{name:<48} {results[name]['best_s'] * 1e6:12.2f} us")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Names of cases slower than `baseline` by more than `threshold`."""
+    regressions = []
+    print(f"\n{'case':<48} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for name, current in results.items():
+        base = baseline.get(name, {})
+        if "best_s" not in current or "best_s" not in base:
+            continue
+        ratio = current["best_s"] / base["best_s"]
+        flag = ""
+        if ratio > 1.0 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<48} {base['best_s'] * 1e6:10.2f}us {current['best_s'] * 1e6:10.2f}us "
+              f"{ratio:7.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--filter", default="", help="only cases containing this text")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per sample")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", type=Path, help="write results as a baseline")
+    parser.add_argument("--compare", type=Path, help="baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative slowdown flagged as a regression (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    names = [n for n in CASES if args.filter in n]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # optimizer warnings would flood the output
+        results = run(names, args.min_time, args.repeat)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"✅ {args.save}")
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"\n‼️ {len(regressions)} regression(s) above {args.threshold:.0%}")
+            return 1
+        print(f"\n✅ no regression above {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""End-to-end benchmark of the main.py pipeline on synthetic data.
+
+Every scale runs in a fresh interpreter on data from utils.synthetic_data,
+and each stage of main.py is timed separately: wall time, peak RSS during
+the stage and rows/second. Results go to a JSON file meant to be diffed
+across commits.
+
+    python benchmarks/pipeline.py                       # small only
+    python benchmarks/pipeline.py --scales small medium large
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# name -> generate_synthetic_data kwargs
+SCALES = {
+    "small": dict(n_bonds=100, n_years=1),
+    "medium": dict(n_bonds=1000, n_years=10),
+    "large": dict(n_bonds=5000, n_years=30),
+}
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results" / "pipeline.json"
+
+
+def run_scale(scale, seed=0):
+    """Stage measurements for one scale (runs in the current process)."""
+    import pandas as pd
+
+    from config import CONFIG
+    from core.pipeline import (clean_surface, dedupe_surface, di_view, interpolate_ipca,
+                               load_ipca_surface, pivot_surface, render_di, render_ipca,
+                               render_spreads, spread_pivot)
+    from core.spread_calculator import compute_spreads
+    from core.windowing import build_observation_windows
+    from utils.file_io import load_inputs, parquet_available
+    from utils.filters import reindex_business_days
+    from utils.interpolation import interpolate_di_surface
+    from utils.plotting import LOD_MAX_DATES, write_figure
+    from utils.profiling import RunProfile
+    from utils.synthetic_data import write_synthetic_data
+
+    fmt = "parquet" if parquet_available() else "xlsx"
+    run = RunProfile()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        config = write_synthetic_data(tmp / "data", formats=(fmt,), seed=seed, **SCALES[scale])
+        static = tmp / "static"
+        static.mkdir()
+
+        # Etapas na ordem de main.py; rows = linhas de entrada da etapa
+        with run.span("load") as span:
+            surface, corp_base, yields_ts = load_inputs(config)
+            yields_ts = reindex_business_days(yields_ts, CONFIG["CALENDAR"])
+            span["rows"] = len(surface) + len(corp_base) + yields_ts.size
+        with run.span("clean", rows=len(surface)):
+            surface = clean_surface(surface)
+        with run.span("dedupe", rows=len(surface)):
+            surface = dedupe_surface(surface)
+        with run.span("pivot", rows=len(surface)):
+            pivot_surface(surface)
+        with run.span("interpolate_di_surface", rows=len(surface)):
+            yc_table = interpolate_di_surface(surface, CONFIG["TENORS"])
+        with run.span("render_di", rows=len(yc_table)):
+            fig, table = render_di(di_view(yc_table, CONFIG["TENORS"]), max_dates=LOD_MAX_DATES)
+            write_figure(fig, static / "di_surface.html", api="/api/surface/di")
+            if table is not None:
+                write_figure(table, static / "di_summary_table.html")
+        with run.span("build_observation_windows", rows=len(corp_base)):
+            windows = build_observation_windows(corp_base, yields_ts, CONFIG["OBS_WINDOW"])
+        with run.span("compute_spreads") as span:
+            corp_bonds, skipped = compute_spreads(corp_base, yields_ts, yc_table, windows, CONFIG["TENORS"],
+                                                  CONFIG["CALENDAR"])
+            span["rows"] = len(corp_bonds) + len(skipped)
+        with run.span("pivot_table", rows=len(corp_bonds)):
+            spread_surface = spread_pivot(corp_bonds, CONFIG["TENORS"])
+        with run.span("render_spreads", rows=len(corp_bonds)):
+            fig, table = render_spreads(spread_surface, corp_bonds, max_dates=LOD_MAX_DATES)
+            write_figure(fig, static / "spread_surface.html", api="/api/surface/spread")
+            if table is not None:
+                write_figure(table, static / "summary_table.html")
+        with run.span("ipca") as span:
+            ipca_surface = load_ipca_surface(config["WLA_CURVE_PATH"])
+            span["rows"] = len(ipca_surface)
+            fig, table = render_ipca(interpolate_ipca(ipca_surface, CONFIG["WLA_TENORS"]), ipca_surface,
+                                     max_dates=LOD_MAX_DATES)
+            write_figure(fig, static / "ipca_surface.html", api="/api/surface/ipca")
+            write_figure(table, static / "ipca_summary_table.html")
+        with run.span("export", rows=len(skipped)):
+            pd.DataFrame(skipped, columns=["Bond ID", "Obs Date", "Reason"]).to_csv(
+                tmp / "skipped_yields.csv", index=False)
+
+        html_bytes = sum(p.stat().st_size for p in static.iterdir())
+
+    results = {span.pop("name"): span for span in run.spans}
+    total = sum(stage["wall_s"] for stage in results.values())
+    return {
+        "params": {**SCALES[scale], "seed": seed, "format": fmt},
+        "total_wall_s": round(total, 4),
+        "peak_rss_mb": max(stage["peak_rss_mb"] for stage in results.values()),
+        "html_mb": round(html_bytes / 2**20, 2),
+        "stages": results,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--worker", choices=list(SCALES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        json.dump(run_scale(args.worker, args.seed), sys.stdout)
+        return
+
+    import numpy
+    import pandas
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "machine": platform.machine(),
+        "scales": {},
+    }
+    for scale in args.scales:
+        out = subprocess.run([sys.executable, __file__, "--worker", scale, "--seed", str(args.seed)],
+                             check=True, capture_output=True, text=True).stdout
+        report["scales"][scale] = result = json.loads(out.splitlines()[-1])
+        print(f"{scale:<7} total {result['total_wall_s']:9.2f} s   peak RSS {result['peak_rss_mb']:8.1f} MB")
+        for name, stage in result["stages"].items():
+            print(f"  {name:<26} {stage['wall_s']:9.3f} s {stage['peak_rss_mb']:8.1f} MB "
+                  f"{stage['rows_per_s'] or 0:14,.0f} rows/s")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    print(f"✅ {args.output}")
+
+
+if __name__ == "__main__":
+    main()
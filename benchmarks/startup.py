@@ -0,0 +1,54 @@
+"""Startup cost of the calendars package.
+
+Each sample imports the package in a fresh interpreter (numpy and pandas
+preloaded, since every caller has them already) and times only the import
+of the measured statement.
+
+    python benchmarks/startup.py [--repeat 20]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+CASES = {
+    "import calendars": "import calendars",
+    "DayCounts": "from calendars import DayCounts",
+    "DayCounts(cdr_anbima)": "from calendars import DayCounts\n"
+                             "DayCounts('bus/252', calendar='cdr_anbima')",
+}
+
+_TEMPLATE = (
+    "import time, numpy, pandas\n"
+    "t = time.perf_counter()\n"
+    "{statement}\n"
+    "print(time.perf_counter() - t)\n"
+)
+
+
+# Bytecode must be cached, or every sample measures compiling the sources
+_ENV = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+
+
+def sample(statement):
+    """Seconds taken by `statement` in a fresh interpreter."""
+    out = subprocess.run([sys.executable, "-c", _TEMPLATE.format(statement=statement)],
+                         check=True, capture_output=True, text=True, env=_ENV).stdout
+    return float(out.split()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    sample(CASES["DayCounts(cdr_anbima)"])  # warm the bytecode cache
+    for name, statement in CASES.items():
+        times = [sample(statement) * 1e3 for _ in range(args.repeat)]
+        print(f"{name:<24} median {statistics.median(times):7.2f} ms   "
+              f"min {min(times):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
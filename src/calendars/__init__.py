@@ -1,14 +1,26 @@
 __all__ = ['DayCounts', 'holidays', 'utils', 'libor', 'closest_next_monday', 'closest_previous_monday',
            'Y_INI', 'Y_END', 'brazil', 'BRCalendars', 'us', 'USTradingCalendar', 'Holidays', 'LiborEurON',
-           'LiborUsdON', 'AbstractBase']
+           'LiborUsdON', 'AbstractBase', 'CompiledCalendar', 'is_holiday', 'is_business_day']
 
-from calendars.daycounts import DayCounts
-from calendars import holidays
-from .holidays import Holidays, utils, libor, brazil, us
-from .holidays.utils import closest_next_monday,  closest_previous_monday, \
-    Y_INI, Y_END, InternationalLaborDay, USIndependenceDay, USVeteransDay, \
-    UKEarlyMayBank, UKLateSummerBank, UKSpringBank, Christmas, BoxingDay, \
-    NewYearsDay, AbstractBase
-from .holidays.libor import LiborAllTenorsAndCurrencies, LiborEurON, LiborUsdON
-from .holidays.brazil import BRCalendars
-from .holidays.us import USTradingCalendar
+from ._lazy import lazy_attributes
+
+# Everything is imported on first access: holiday engines set up pandas rules
+# and most processes only ever need one calendar
+_HOLIDAY_NAMES = ['Holidays', 'closest_next_monday', 'closest_previous_monday', 'Y_INI', 'Y_END',
+                  'InternationalLaborDay', 'USIndependenceDay', 'USVeteransDay', 'UKEarlyMayBank',
+                  'UKLateSummerBank', 'UKSpringBank', 'Christmas', 'BoxingDay', 'NewYearsDay',
+                  'AbstractBase', 'LiborAllTenorsAndCurrencies', 'LiborEurON', 'LiborUsdON',
+                  'BRCalendars', 'USTradingCalendar']
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    'DayCounts': ('.daycounts', 'DayCounts'),
+    'CompiledCalendar': ('.compiled', 'CompiledCalendar'),
+    'is_holiday': ('.compiled', 'is_holiday'),
+    'is_business_day': ('.compiled', 'is_business_day'),
+    'holidays': ('.holidays', None),
+    'utils': ('.holidays.utils', None),
+    'libor': ('.holidays.libor', None),
+    'brazil': ('.holidays.brazil', None),
+    'us': ('.holidays.us', None),
+    **{name: ('.holidays', name) for name in _HOLIDAY_NAMES},
+})
@@ -0,0 +1,32 @@
+"""Lazy package attributes (PEP 562).
+
+Packages list their public names as ``name -> (module, attribute)`` and the
+module is imported the first time the name is looked up, so importing a
+package only costs what its callers actually use.
+"""
+from importlib import import_module
+
+
+def lazy_attributes(package, namespace, exports):
+    """Module-level ``__getattr__`` and ``__dir__`` for `exports`.
+
+    An attribute of None exports the module itself. Resolved values are
+    stored in `namespace` (the package ``globals()``) so later lookups are
+    plain attribute hits.
+    """
+    def __getattr__(name):
+        try:
+            module, attribute = exports[name]
+        except KeyError:
+            raise AttributeError('module %r has no attribute %r'
+                                 % (package, name)) from None
+        value = import_module(module, package)
+        if attribute is not None:
+            value = getattr(value, attribute)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
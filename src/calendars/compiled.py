@@ -0,0 +1,112 @@
+"""Compiled calendars: O(1) holiday and business-day lookups.
+
+A compiled calendar is a pair of boolean tables with one entry per day from
+Y_INI to Y_END, so membership tests are a subtraction and an array index per
+date instead of a search through the holiday list.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .holidays import Holidays
+from .holidays.utils.constants import Y_END, Y_INI
+
+
+def _as_days(dates) -> np.ndarray:
+    """Any scalar/array of dates as datetime64[D] (NaT preserved)."""
+    arr = np.asarray(dates)
+    if arr.dtype.kind == "M":
+        return arr.astype("datetime64[D]")
+    if arr.ndim == 0:
+        return np.datetime64(pd.Timestamp(arr.item()).to_datetime64(), "D")
+    days = np.asarray(pd.to_datetime(arr.ravel())).astype("datetime64[D]")
+    return days.reshape(arr.shape)
+
+
+class CompiledCalendar(object):
+    """Day-indexed holiday and business-day tables for one calendar."""
+
+    FIRST_DAY = np.datetime64("%d-01-01" % Y_INI, "D")
+    LAST_DAY = np.datetime64("%d-12-31" % Y_END, "D")
+
+    def __init__(self, holidays, weekmask="1111100"):
+        self.weekmask = weekmask
+        days = np.arange(self.FIRST_DAY, self.LAST_DAY + 1)
+
+        holidays = _as_days(holidays).ravel()
+        holidays = holidays[~np.isnat(holidays)]
+        pos = (holidays - self.FIRST_DAY).astype(np.int64)
+        pos = pos[(pos >= 0) & (pos < len(days))]
+
+        self._holiday = np.zeros(len(days), dtype=bool)
+        self._holiday[pos] = True
+        self._business = np.is_busday(days, weekmask=weekmask) & ~self._holiday
+        # Business days strictly before each day of the table (and one past
+        # the end), so that counts between two days are a subtraction
+        self._before = np.concatenate([[0], np.cumsum(self._business)])
+
+    def _lookup(self, table, dates, outside):
+        days = _as_days(dates)
+        pos = (days - self.FIRST_DAY).astype(np.int64)
+        inside = ~np.isnat(days) & (pos >= 0) & (pos < len(table))
+        out = np.zeros(days.shape, dtype=bool)
+        out[inside] = table[pos[inside]]
+        rest = ~inside & ~np.isnat(days)
+        if rest.any():
+            out[rest] = outside(days[rest])
+        return out if out.ndim else bool(out)
+
+    def is_holiday(self, dates):
+        """Boolean mask of `dates` that are listed holidays (any weekday)."""
+        return self._lookup(self._holiday, dates, lambda d: np.zeros(d.shape, bool))
+
+    def is_business_day(self, dates):
+        """Boolean mask of `dates` that are business days; NaT is False."""
+        return self._lookup(
+            self._business, dates, lambda d: np.is_busday(d, weekmask=self.weekmask)
+        )
+
+    def _busdaycalendar(self):
+        return np.busdaycalendar(
+            weekmask=self.weekmask,
+            holidays=self.FIRST_DAY + np.flatnonzero(self._holiday),
+        )
+
+    def bus_range(self, start, end):
+        """Business days in [start, end] as a datetime64[D] array."""
+        start, end = _as_days(start), _as_days(end)
+        i, j = (start - self.FIRST_DAY).astype(np.int64), (end - self.FIRST_DAY).astype(np.int64)
+        if 0 <= i and j < len(self._business):
+            return self.FIRST_DAY + i + np.flatnonzero(self._business[i:j + 1])
+        days = np.arange(start, end + 1)
+        return days[np.is_busday(days, busdaycal=self._busdaycalendar())]
+
+    def bus_count(self, start, end):
+        """Business days in [start, end), like `numpy.busday_count`."""
+        start, end = np.broadcast_arrays(_as_days(start), _as_days(end))
+        i = (start - self.FIRST_DAY).astype(np.int64)
+        j = (end - self.FIRST_DAY).astype(np.int64)
+        n = len(self._business)
+        if i.size and min(i.min(), j.min()) >= 0 and max(i.max(), j.max()) <= n:
+            count = self._before[j] - self._before[i]
+        else:
+            count = np.busday_count(start, end, busdaycal=self._busdaycalendar())
+        return count if count.ndim else int(count)
+
+
+@lru_cache(maxsize=None)
+def compiled_calendar(calendar=None, weekmask="1111100"):
+    """Compiled version of a `Holidays` calendar, built once per name."""
+    cdr = Holidays.modify_calendar_name(calendar)
+    return CompiledCalendar(Holidays.holidays(cdr=cdr), weekmask=weekmask)
+
+
+def is_holiday(dates, calendar="cdr_anbima"):
+    """True where `dates` are holidays of `calendar` (array or scalar)."""
+    return compiled_calendar(calendar).is_holiday(dates)
+
+
+def is_business_day(dates, calendar="cdr_anbima"):
+    """True where `dates` are business days of `calendar` (array or scalar)."""
+    return compiled_calendar(calendar).is_business_day(dates)
@@ -1,4 +1,8 @@
+from datetime import date
+from functools import lru_cache
+
 from .holidays import Holidays
+from .compiled import compiled_calendar
 from pandas import to_datetime, Timestamp, DatetimeIndex, date_range, \
     DateOffset
 from pandas.tseries.offsets import MonthEnd, YearEnd
@@ -7,6 +11,21 @@ from numpy import busday_count, busday_offset, busdaycalendar, asarray, \
     broadcast, broadcast_arrays, ndarray, minimum, divmod, count_nonzero, \
     datetime64
 
+# Scalar date types that numpy can cast to datetime64[D] directly
+_SCALAR_DATES = (Timestamp, date, datetime64)
+
+
+@lru_cache(maxsize=None)
+def _busdaycalendar(calendar, weekmask):
+    """numpy business-day calendar, built once per (calendar, weekmask)"""
+    return busdaycalendar(weekmask=weekmask,
+                          holidays=Holidays.holidays(cdr=calendar))
+
+
+def _weekmask_key(weekmask):
+    """Hashable 7-tuple for any weekmask spelling accepted by numpy"""
+    return tuple(bool(b) for b in busdaycalendar(weekmask=weekmask).weekmask)
+
 
 class DayCounts(object):
     # Constants
@@ -96,8 +115,8 @@ class DayCounts(object):
         self.dc = dc
         self.adj = adj
         self.adjoffset = adjoffset
-        h = Holidays.holidays(cdr=calendar)
-        self.__busc = busdaycalendar(weekmask=weekmask, holidays=h)
+        # The calendar setter swaps in the (cached) holiday calendar
+        self.__busc = busdaycalendar(weekmask=weekmask)
         self.calendar = calendar
 
     def tf(self, d1, d2):
@@ -590,11 +609,18 @@ class DayCounts(object):
 
     # Add methods respecting the interface of BWDate class for compatibility
     def isbus(self, d):
-        """True if date is a business day"""
-        return self.following(d) == d
+        """True if date is a business day (vectorized, O(1) per date)"""
+        return compiled_calendar(self.calendar, self.weekmask).is_business_day(d)
+
+    def isholiday(self, d):
+        """True if date is a holiday of the calendar (vectorized)"""
+        return compiled_calendar(self.calendar, self.weekmask).is_holiday(d)
 
     def busdateroll(self, d, roll):
         """Rolls business date according to convention specified in roll"""
+        if isinstance(d, _SCALAR_DATES):  # fast path, no pandas round-trip
+            return Timestamp(busday_offset(datetime64(d, 'D'), self.adjoffset,
+                                           roll=roll, busdaycal=self.buscore))
         d = self._simple_cast(d)
         nd = busday_offset(d, offsets=self.adjoffset, roll=roll,
                            busdaycal=self.buscore)
@@ -602,6 +628,10 @@ class DayCounts(object):
 
     def workday(self, d, offset=0):
         """Mimics the workday function in Excel"""
+        if isinstance(d, _SCALAR_DATES) and isinstance(offset, int):
+            roll = self.adj or ('preceding' if offset >= 0 else 'following')
+            return Timestamp(busday_offset(datetime64(d, 'D'), offset,
+                                           roll=roll, busdaycal=self.buscore))
         d = self._simple_cast(d)
         if self.adj is None and isinstance(offset, int):
             if offset >= 0:
@@ -718,6 +748,15 @@ class DayCounts(object):
         d = self.eoy(d, offset)
         return self.following(d)
 
+    def bus_range(self, start_date, end_date):
+        """All business dates between start_date and end_date (inclusive) as
+        a datetime64[D] array, taken in one slice of the compiled calendar
+        """
+        start_date = datetime64(self.adjust(start_date), 'D')
+        end_date = datetime64(self.adjust(end_date), 'D')
+        return compiled_calendar(self.calendar,
+                                 self.weekmask).bus_range(start_date, end_date)
+
     def gendates(self, start_date, end_date):
         """Generator for dates in an interval assuming following in the
         lower end and preceding in the upper end
@@ -729,13 +768,9 @@ class DayCounts(object):
         assert isinstance(start_date, Timestamp), 'Start date must be scalar'
         assert isinstance(end_date, Timestamp), 'End date must be scalar'
         if start_date == end_date:
-            start_date = self.preceding(start_date)
-        else:
-            start_date = self.following(start_date)
-        end_date = self.preceding(end_date)
-        while start_date <= end_date:
-            yield start_date
-            start_date = self.workday(start_date, 1)
+            yield self.preceding(start_date)
+            return
+        yield from to_datetime(self.bus_range(start_date, end_date))
 
     @property
     def buscore(self):
@@ -760,8 +795,7 @@ class DayCounts(object):
 
     @weekmask.setter
     def weekmask(self, x):
-        h = self.holidays.values.astype('datetime64[D]')
-        self.__busc = busdaycalendar(weekmask=x, holidays=h)
+        self.__busc = _busdaycalendar(self.calendar, _weekmask_key(x))
 
     @property
     def weekends(self):
@@ -790,8 +824,7 @@ class DayCounts(object):
         # Save calendar
         self.__cal = x
         # Update buscore engine
-        h = Holidays.holidays(cdr=x)
-        self.__busc = busdaycalendar(weekmask=self.weekmask, holidays=h)
+        self.__busc = _busdaycalendar(x, _weekmask_key(self.weekmask))
 
     @property
     def adj(self):
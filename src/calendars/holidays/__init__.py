@@ -3,12 +3,18 @@ __all__ = ['USIndependenceDay', 'USVeteransDay', 'UKEarlyMayBank', 'UKLateSummer
            'closest_next_monday', 'Y_END', 'Y_INI', 'LiborAllTenorsAndCurrencies', 'BRCalendars', 'USTradingCalendar',
            'LiborEurON', 'LiborUsdON', 'AbstractBase']
 
-from .factory import Holidays
-from .utils import AbstractBase
-from .utils import closest_previous_monday, closest_next_monday, Y_END, Y_INI
-from .utils import InternationalLaborDay, USIndependenceDay, USVeteransDay, \
-    UKEarlyMayBank, UKLateSummerBank, UKSpringBank, Christmas, BoxingDay, \
-    NewYearsDay
-from .libor import LiborAllTenorsAndCurrencies, LiborEurON, LiborUsdON
-from .brazil import BRCalendars
-from .us import USTradingCalendar
+from .._lazy import lazy_attributes
+
+_UTILS_NAMES = ['AbstractBase', 'closest_previous_monday', 'closest_next_monday', 'Y_END', 'Y_INI',
+                'InternationalLaborDay', 'USIndependenceDay', 'USVeteransDay', 'UKEarlyMayBank',
+                'UKLateSummerBank', 'UKSpringBank', 'Christmas', 'BoxingDay', 'NewYearsDay']
+
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    'Holidays': ('.factory', 'Holidays'),
+    'LiborAllTenorsAndCurrencies': ('.libor', 'LiborAllTenorsAndCurrencies'),
+    'LiborEurON': ('.libor', 'LiborEurON'),
+    'LiborUsdON': ('.libor', 'LiborUsdON'),
+    'BRCalendars': ('.brazil', 'BRCalendars'),
+    'USTradingCalendar': ('.us', 'USTradingCalendar'),
+    **{name: ('.utils', name) for name in _UTILS_NAMES},
+})
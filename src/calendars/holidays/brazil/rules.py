@@ -0,0 +1,158 @@
+"""Rule-based Brazilian holiday calendars.
+
+Each calendar is a list of rules plus one-off exceptions (additions and
+removals) that pin it to the official published lists. Arrays for any year
+range are generated with a handful of vectorized NumPy operations and
+cached per (calendar, first year, last year).
+"""
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from calendars.holidays.utils.constants import Y_END
+
+# ---------------------------------------------------------------------------
+# Rules
+# ---------------------------------------------------------------------------
+# ("fixed", (month, day), first_year, last_year)
+# ("easter", days_from_easter_sunday, first_year, last_year)
+# ("year_end", None, first_year, last_year)  -> last weekday of the year
+# None as a year bound means unbounded.
+
+CARNIVAL_MONDAY = -48
+CARNIVAL_TUESDAY = -47
+HOLY_THURSDAY = -3
+GOOD_FRIDAY = -2
+CORPUS_CHRISTI = 60
+
+NATIONAL = [
+    ("fixed", (1, 1), None, None),      # Confraternização Universal
+    ("fixed", (4, 21), None, None),     # Tiradentes
+    ("fixed", (5, 1), None, None),      # Dia do Trabalho
+    ("fixed", (9, 7), None, None),      # Independência
+    ("fixed", (10, 12), None, None),    # Nossa Senhora Aparecida
+    ("fixed", (11, 2), None, None),     # Finados
+    ("fixed", (11, 15), None, None),    # Proclamação da República
+    ("fixed", (12, 25), None, None),    # Natal
+    ("easter", CARNIVAL_MONDAY, None, None),
+    ("easter", CARNIVAL_TUESDAY, None, None),
+    ("easter", GOOD_FRIDAY, None, None),
+    ("easter", CORPUS_CHRISTI, None, None),
+]
+
+B3_SAO_PAULO = [
+    ("fixed", (1, 25), None, None),     # Aniversário de São Paulo
+    ("fixed", (7, 9), None, None),      # Revolução Constitucionalista
+    ("fixed", (11, 20), 2004, None),    # Consciência Negra (municipal)
+    ("fixed", (12, 24), None, None),    # Véspera de Natal
+    ("year_end", None, None, None),     # Último dia útil do ano
+]
+
+CALENDARS = {
+    # Consciência Negra is national since 2024 (Lei 14.759/2023), but the
+    # published list this calendar reproduces predates the law; add
+    # ("fixed", (11, 20), 2024, None) to the rules once it is refreshed.
+    "cdr_anbima": {
+        "first_year": 1994,
+        "rules": NATIONAL + [("easter", HOLY_THURSDAY, None, 1999)],
+        "drop_weekends": False,
+        # Elections on a Monday; 2000 lists Easter Sunday, not Holy Thursday
+        "add": ["1994-10-03", "1996-10-03", "2000-04-23"],
+        "remove": [],
+    },
+    "cdr_b3_settlement": {
+        "first_year": 1997,
+        "rules": NATIONAL + B3_SAO_PAULO + [("easter", HOLY_THURSDAY, None, 2000)],
+        "drop_weekends": True,
+        # World Cup opening match in São Paulo
+        "add": ["2014-06-12"],
+        "remove": ["2000-01-25"],
+    },
+    # Legacy list of finmath.SwapCurve (2001-2031): ANBIMA with a few typos
+    "cdr_anbima_swap": {
+        "first_year": 1994,
+        "rules": NATIONAL + [("easter", HOLY_THURSDAY, None, 1999)],
+        "drop_weekends": False,
+        "add": ["1994-10-03", "1996-10-03", "2000-04-23", "2001-01-26"],
+        "remove": ["2001-02-26", "2003-03-04"],
+    },
+}
+
+# ---------------------------------------------------------------------------
+# Generators
+# ---------------------------------------------------------------------------
+
+
+def _dates(years: np.ndarray, months: np.ndarray, days: np.ndarray) -> np.ndarray:
+    ym = (years - 1970).astype("datetime64[Y]").astype("datetime64[M]") + (months - 1)
+    return ym.astype("datetime64[D]") + (days - 1)
+
+
+def easter_sunday(years) -> np.ndarray:
+    """Gregorian Easter Sunday for each year (anonymous algorithm)."""
+    y = np.asarray(years, dtype=np.int64)
+    a, b, c = y % 19, y // 100, y % 100
+    d, e = b // 4, b % 4
+    g = (b - (b + 8) // 25 + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    k = (32 + 2 * e + 2 * (c // 4) - h - c % 4) % 7
+    m = (a + 11 * h + 22 * k) // 451
+    n = h + k - 7 * m + 114
+    return _dates(y, n // 31, n % 31 + 1)
+
+
+def _apply_rule(rule, years: np.ndarray, easter: np.ndarray) -> np.ndarray:
+    kind, value, first, last = rule
+    keep = np.ones(len(years), dtype=bool)
+    if first is not None:
+        keep &= years >= first
+    if last is not None:
+        keep &= years <= last
+    years = years[keep]
+
+    if kind == "fixed":
+        month, day = value
+        return _dates(years, np.full(len(years), month), np.full(len(years), day))
+    if kind == "easter":
+        return easter[keep] + value
+    if kind == "year_end":
+        dec31 = _dates(years, np.full(len(years), 12), np.full(len(years), 31))
+        return np.busday_offset(dec31, 0, roll="backward")
+    raise ValueError(f"Unknown holiday rule {kind!r}")
+
+
+def generate_holidays(
+    rules, first_year: int, last_year: int, drop_weekends: bool = False
+) -> np.ndarray:
+    """Sorted unique holidays (datetime64[D]) of `rules` for the year range."""
+    years = np.arange(first_year, last_year + 1)
+    easter = easter_sunday(years)
+    dates = np.unique(np.concatenate([_apply_rule(r, years, easter) for r in rules]))
+    if drop_weekends:
+        dates = dates[np.is_busday(dates)]
+    return dates
+
+
+@lru_cache(maxsize=None)
+def holiday_array(
+    calendar: str, first_year: Optional[int] = None, last_year: int = Y_END
+) -> np.ndarray:
+    """Holidays of a named calendar, starting at its `first_year` by default.
+
+    The result is cached and read-only.
+    """
+    spec = CALENDARS[calendar]
+    first_year = spec["first_year"] if first_year is None else first_year
+    dates = generate_holidays(
+        spec["rules"], first_year, last_year, drop_weekends=spec["drop_weekends"]
+    )
+
+    add = np.array(spec["add"], dtype="datetime64[D]")
+    remove = np.array(spec["remove"], dtype="datetime64[D]")
+    years = add.astype("datetime64[Y]").astype(int) + 1970
+    add = add[(years >= first_year) & (years <= last_year)]
+    dates = np.setdiff1d(np.union1d(dates, add), remove)
+
+    dates.setflags(write=False)
+    return dates
@@ -1,31 +1,73 @@
-from .brazil import BRCalendars
-from .us import USTradingCalendar
-from .libor import LiborAllTenorsAndCurrencies, LiborEurON, LiborUsdON
+import re
+from functools import lru_cache
+from importlib import import_module
 
 
 class Holidays(object):
     STDCAL      = 'cdr_standard'
-    ENGINES     = [BRCalendars(), USTradingCalendar(), LiborAllTenorsAndCurrencies(), LiborEurON(), LiborUsdON()]
-    # Note that we instantiate the objects in the ENGINE variable because
-    # not all calendars are accessible via static methods. In this case,
-    # just passing the pointer will fail in the holidays() method
+    # Calendar name -> (engine module, engine class). Engines are imported
+    # and instantiated on first use, so importing the package does not build
+    # the pandas holiday rules of calendars nobody asked for. We instantiate
+    # them because not all calendars are accessible via static methods.
+    REGISTRY    = {
+        'cdr_anbima':         ('.brazil.core', 'BRCalendars'),
+        'cdr_b3_trading':     ('.brazil.core', 'BRCalendars'),
+        'cdr_b3_settlement':  ('.brazil.core', 'BRCalendars'),
+        'cdr_bz':             ('.brazil.core', 'BRCalendars'),
+        'cdr_us_trading':     ('.us.core', 'USTradingCalendar'),
+        'cdr_libor_base':     ('.libor.base', 'LiborAllTenorsAndCurrencies'),
+        'cdr_libor_usd':      ('.libor.base', 'LiborAllTenorsAndCurrencies'),
+        'cdr_libor_eur':      ('.libor.base', 'LiborAllTenorsAndCurrencies'),
+        'cdr_libor_gbp':      ('.libor.base', 'LiborAllTenorsAndCurrencies'),
+        'cdr_libor_gbp_on':   ('.libor.base', 'LiborAllTenorsAndCurrencies'),
+        'cdr_libor_chf':      ('.libor.base', 'LiborAllTenorsAndCurrencies'),
+        'cdr_libor_chf_on':   ('.libor.base', 'LiborAllTenorsAndCurrencies'),
+        'cdr_libor_jpy':      ('.libor.base', 'LiborAllTenorsAndCurrencies'),
+        'cdr_libor_jpy_on':   ('.libor.base', 'LiborAllTenorsAndCurrencies'),
+        'cdr_libor_eur_on':   ('.libor.eur_on', 'LiborEurON'),
+        'cdr_libor_usd_on':   ('.libor.usd_on', 'LiborUsdON'),
+    }
+
+    @staticmethod
+    def register(cdr, module, engine):
+        """Register calendar `cdr` as method `cdr` of `module.engine`"""
+        Holidays.REGISTRY[Holidays.modify_calendar_name(cdr)] = (module, engine)
+        Holidays._cached_holidays.cache_clear()
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def engine(module, engine):
+        """Engine instance, imported and built once per (module, class)"""
+        return getattr(import_module(module, __package__), engine)()
 
     @staticmethod
     def holidays(cdr=None):
-        """Factory interface"""
-        # Save original name for error message
-        cn      = cdr
-        cdr     = Holidays.modify_calendar_name(cdr)
-        if cdr is None or cdr == Holidays.STDCAL:
-            return []
-        for en in Holidays.ENGINES:
-            try:
-                h = getattr(en, cdr)
-                return h()
-            except AttributeError:
-                pass
-        raise NotImplementedError('Calendar `%s` not found. Please implement '
-                                  'it.' % cn)
+        """Factory interface
+
+        Composite names join calendars with `+` (union) and `&`
+        (intersection), evaluated left to right, e.g.
+        'cdr_anbima+cdr_us_trading'. Results are cached per calendar.
+        """
+        try:
+            return list(Holidays._cached_holidays(Holidays.modify_calendar_name(cdr)))
+        except KeyError:
+            raise NotImplementedError('Calendar `%s` not found. Please '
+                                      'implement it.' % cdr) from None
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _cached_holidays(cdr):
+        if cdr == Holidays.STDCAL:
+            return ()
+        parts = re.split(r'([+&])', cdr)
+        if len(parts) > 1:
+            h = set(Holidays._cached_holidays(parts[0]))
+            for op, name in zip(parts[1::2], parts[2::2]):
+                other = set(Holidays._cached_holidays(name))
+                h = h | other if op == '+' else h & other
+            return tuple(sorted(h))
+        module, engine = Holidays.REGISTRY[cdr]
+        return tuple(getattr(Holidays.engine(module, engine), cdr)())
 
     @staticmethod
     def modify_calendar_name(cdr=None):
@@ -33,6 +75,10 @@ class Holidays(object):
                 cdr == Holidays.STDCAL.replace('cdr_', ''):
             return Holidays.STDCAL
         assert isinstance(cdr, str), 'Cdr must be either None or a string'
+        if '+' in cdr or '&' in cdr:
+            parts = re.split(r'\s*([+&])\s*', cdr.strip())
+            return ''.join(p if p in '+&' else Holidays.modify_calendar_name(p)
+                           for p in parts)
         cdr = cdr.lower()
         # Save original name for error message below
         if 'cdr_' not in cdr:
@@ -3,10 +3,19 @@ __all__ = ['USIndependenceDay', 'USVeteransDay', 'UKEarlyMayBank',
            'NewYearsDay', 'InternationalLaborDay', 'closest_next_monday',
            'closest_previous_monday', 'Y_END', 'Y_INI', 'AbstractBase']
 
-from .abstract_base import AbstractBase
-from .international import InternationalLaborDay
-from .anglorules import USIndependenceDay, USVeteransDay, UKEarlyMayBank, \
-    UKLateSummerBank, UKSpringBank, Christmas, BoxingDay, NewYearsDay
-from .observances import closest_next_monday, closest_previous_monday
-from .constants import Y_END, Y_INI
+from ..._lazy import lazy_attributes
 
+_ANGLO_NAMES = ['USIndependenceDay', 'USVeteransDay', 'UKEarlyMayBank',
+                'UKLateSummerBank', 'UKSpringBank', 'Christmas', 'BoxingDay',
+                'NewYearsDay']
+
+# The rule modules import pandas.tseries.holiday; `constants` stays cheap
+__getattr__, __dir__ = lazy_attributes(__name__, globals(), {
+    'AbstractBase': ('.abstract_base', 'AbstractBase'),
+    'InternationalLaborDay': ('.international', 'InternationalLaborDay'),
+    'closest_next_monday': ('.observances', 'closest_next_monday'),
+    'closest_previous_monday': ('.observances', 'closest_previous_monday'),
+    'Y_END': ('.constants', 'Y_END'),
+    'Y_INI': ('.constants', 'Y_INI'),
+    **{name: ('.anglorules', name) for name in _ANGLO_NAMES},
+})
@@ -44,6 +44,10 @@ CONFIG = {
     },
 
 
+    # Calendário de dias úteis do pipeline: datas fora dele são sinalizadas,
+    # os yields são reindexados nele e os spreads contam dias úteis nele
+    "CALENDAR": "cdr_anbima",
+
     "OBS_WINDOW": 11323  # total days since [(2025 - 1994) x 365.25] >>> CONFIG["OBS_WINDOW"] = int((pd.Timestamp.today() - pd.Timestamp("1994-01-01")).days)
 
 
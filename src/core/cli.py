@@ -0,0 +1,128 @@
+# core/cli.py
+"""
+Linha de comando do pipeline (`spread-model`, ver [project.scripts]).
+
+    spread-model run                                   # tudo, igual a `python main.py`
+    spread-model run --only spreads                    # só spreads (e o que faltar antes)
+    spread-model run --start 2025-06-23 --end 2025-06-27 --bonds "XYZ 12 Corp"   # saídas em data/scratch
+    spread-model run --format html parquet --workers 1 --no-cache
+    spread-model stages                                # lista as etapas do DAG
+"""
+import argparse
+import os
+import sys
+
+from config import CONFIG
+from core.dag import StageRunner
+from core.pipeline import TABLE_FORMATS, build_stages, default_targets, pipeline_params
+from utils.file_io import parquet_available
+from utils.profiling import RunProfile
+
+FORMATS = ("html",) + TABLE_FORMATS
+
+# Saídas de uma execução completa (servidas pelo app.py) e, por padrão, das
+# execuções filtradas, que não devem sobrescrever as completas com resultados parciais
+OUTPUT_DIRS = {"static_dir": "static", "data_dir": "data"}
+SCRATCH_DIRS = {"static_dir": "data/scratch/static", "data_dir": "data/scratch"}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="spread-model",
+                                     description="Spreads de debêntures vs curva DI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="executa o pipeline (DAG de etapas com cache)")
+    run.add_argument("--only", nargs="+", metavar="ETAPA",
+                     help="só estas etapas (e as anteriores de que dependem)")
+    run.add_argument("--start", help="primeira data de observação (AAAA-MM-DD)")
+    run.add_argument("--end", help="última data de observação (AAAA-MM-DD)")
+    run.add_argument("--bonds", nargs="+", metavar="ID", help="ids das debêntures (ex.: 'XYZ 12 Corp')")
+    run.add_argument("--format", nargs="+", choices=FORMATS, default=["html"], dest="formats",
+                     help="saídas: gráficos HTML em --static-dir e/ou tabelas em --data-dir/tables")
+    run.add_argument("--workers", type=int, default=3,
+                     help="etapas simultâneas; 1 roda tudo em sequência no processo principal")
+    run.add_argument("--no-cache", dest="cache", action="store_false", help="não lê nem grava o cache")
+    run.add_argument("--cache-dir", default="data/cache")
+    run.add_argument("--static-dir", help="gráficos HTML (padrão: static; com filtros, data/scratch/static)")
+    run.add_argument("--data-dir", help="tabelas e CSVs (padrão: data; com filtros, data/scratch)")
+
+    commands.add_parser("stages", help="lista as etapas do DAG com entradas e saídas")
+    return parser
+
+
+def run_pipeline(args) -> int:
+    stages = build_stages()
+    names = {stage.name for stage in stages}
+    unknown = sorted(set(args.only or ()) - names)
+    if unknown:
+        print(f"‼️ Etapas desconhecidas: {', '.join(unknown)} (ver `spread-model stages`)", file=sys.stderr)
+        return 2
+    if "parquet" in args.formats and not parquet_available():
+        print("‼️ --format parquet requer pyarrow ou fastparquet", file=sys.stderr)
+        return 2
+
+    # Com --start/--end/--bonds as saídas vão para data/scratch, salvo diretórios explícitos
+    filtered = any(v is not None for v in (args.start, args.end, args.bonds))
+    for name, default in (SCRATCH_DIRS if filtered else OUTPUT_DIRS).items():
+        if getattr(args, name) is None:
+            setattr(args, name, default)
+    if filtered:
+        print(f"ℹ️ Execução filtrada: saídas em {args.static_dir} e {args.data_dir}")
+
+    # Cada etapa roda dentro de um span (wall, CPU, pico de memória, linhas);
+    # SPREAD_PROFILE=spreads,di_table grava perfis cProfile dessas etapas
+    profile = RunProfile.from_env()
+    os.makedirs(args.data_dir, exist_ok=True)
+    os.makedirs(args.static_dir, exist_ok=True)
+
+    runner = StageRunner(stages, cache_dir=args.cache_dir if args.cache else None,
+                         workers=args.workers, profile=profile, processes=args.workers > 1)
+    params = pipeline_params(CONFIG, static_dir=args.static_dir, data_dir=args.data_dir,
+                             start=args.start, end=args.end, bonds=args.bonds, formats=args.formats)
+    out = runner.run(params, targets=args.only or default_targets(args.formats))
+
+    # Diagnóstico: curvas DI e yields YAS carimbados em dias não úteis
+    if out.get("di_off_calendar") or out.get("yields_off_calendar"):
+        print(f"⚠️ Datas fora do calendário {params['calendar']}: {out.get('di_off_calendar', 0)} (DI), "
+              f"{out.get('yields_off_calendar', 0)} (YAS)")
+
+    # Diagnóstico opcional: verificar curvas com múltiplos tenores por data
+    if "di_selected" in out:
+        curva_por_data = (
+            out["di_selected"].groupby("obs_date")["tenor"]
+            .nunique()
+            .sort_values(ascending=False)
+        )
+        print("🧪 Curvas com mais tenores disponíveis:\n", curva_por_data.head())
+
+    cached = sorted(name for name, status in runner.status.items() if status == "cached")
+    if cached:
+        print(f"♻️ Etapas lidas do cache: {', '.join(cached)}")
+    if "spreads" in out:
+        print(f"✅ {len(out['spreads'])} spreads calculados. {len(out['skipped'])} observações ignoradas.")
+    for output in ("di_figures", "spread_figures", "ipca_figures", "skipped_csv", "tables"):
+        for path in out.get(output, ()):
+            print(f"📄 {path}")
+
+    print(profile.summary())
+    print(f"⏱️ Perfil da execução em {profile.write(os.path.join(args.data_dir, 'run_profile.json'))}")
+    return 0
+
+
+def list_stages() -> int:
+    for stage in build_stages():
+        flags = [f for f, on in (("processo", stage.process), ("sem cache", not stage.cache)) if on]
+        print(f"{stage.name:<16} {', '.join(stage.inputs)} -> {', '.join(stage.outputs)}"
+              + (f"  [{', '.join(flags)}]" if flags else ""))
+    return 0
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "stages":
+        return list_stages()
+    return run_pipeline(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,401 @@
+# core/dag.py
+"""
+Executor de etapas em DAG com cache em disco.
+
+Cada `Stage` declara as entradas (parâmetros da execução ou saídas de outras
+etapas) e as saídas. A chave de cache de uma etapa é o hash de:
+- versão do código: fonte da função da etapa (e das funções do mesmo módulo
+  que ela chama), dos módulos em `code` e de todos os módulos do projeto que
+  eles importam, direta ou indiretamente (ver `Stage.code_modules`);
+- entradas: parâmetros pelo conteúdo (arquivos pelo conteúdo em bytes) e
+  saídas de outras etapas pela chave da etapa que as produziu.
+
+Assim, mudar a lógica de spreads só invalida `spreads` e o que depende dela,
+e etapas independentes (ex.: DI e IPCA) rodam em paralelo: em threads, ou
+num processo à parte para as etapas com `process=True` (código Python puro,
+que em thread disputaria o GIL com o outro ramo).
+"""
+import ast
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import multiprocessing
+import pickle
+import types
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from utils.file_io import atomic_write
+
+# Incrementar invalida todos os caches (ex.: mudança no formato dos arquivos)
+CACHE_VERSION = "1"
+# Entradas mantidas por etapa (as usadas há mais tempo são apagadas): alternar
+# entre uma execução completa e uma filtrada não recalcula tudo a cada troca
+CACHE_ENTRIES = 4
+
+# Pacotes do projeto cujo fonte entra na versão do código das etapas. Em
+# `WHOLE_PACKAGES` os imports são em parte dinâmicos (atributos preguiçosos
+# de `calendars`, registro de calendários por nome), então basta a etapa
+# alcançar um módulo do pacote para o pacote inteiro entrar no hash.
+PROJECT_PACKAGES = ("calendars", "config", "core", "finmath", "utils")
+WHOLE_PACKAGES = ("calendars", "finmath")
+
+
+def _is_project(module: str) -> bool:
+    return module.split(".")[0] in PROJECT_PACKAGES
+
+
+def _module_file(module: str) -> Optional[Path]:
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):  # pai não é pacote: `module` é um atributo
+        return None
+    return None if spec is None or spec.origin is None else Path(spec.origin)
+
+
+@lru_cache(maxsize=None)
+def _parse_imports(path: Path, module: str, stamp: tuple) -> frozenset:
+    """Módulos importados (em qualquer ponto) pelo fonte de `module`; `stamp` invalida o cache."""
+    package = module if path.name == "__init__.py" else module.rpartition(".")[0]
+    found = set()
+    for node in ast.walk(ast.parse(path.read_bytes())):
+        if isinstance(node, ast.Import):
+            found.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parent = package.rsplit(".", node.level - 1)[0] if node.level > 1 else package
+                base = f"{parent}.{base}" if base else parent
+            found.add(base)
+            # `from pacote import submodulo`
+            found.update(f"{base}.{alias.name}" for alias in node.names)
+    return frozenset(found)
+
+
+def module_closure(modules) -> list:
+    """
+    Módulos do projeto alcançados a partir de `modules` pelos imports (e os
+    pacotes que os contêm), em ordem alfabética.
+    """
+    seen, todo = set(), [m for m in modules if _is_project(m)]
+    while todo:
+        module = todo.pop()
+        if module in seen:
+            continue
+        path = _module_file(module)
+        if path is None or path.suffix != ".py":
+            continue  # `from pacote import atributo`: não é módulo
+        seen.add(module)
+        todo.extend(module.rsplit(".", i)[0] for i in range(1, module.count(".") + 1))
+        stat = path.stat()
+        todo.extend(m for m in _parse_imports(path, module, (stat.st_mtime_ns, stat.st_size))
+                    if _is_project(m))
+
+    for package in {m.split(".")[0] for m in seen} & set(WHOLE_PACKAGES):
+        root = _module_file(package).parent
+        for path in root.rglob("*.py"):
+            parts = path.relative_to(root).with_suffix("").parts
+            seen.add(".".join((package,) + (parts[:-1] if parts[-1] == "__init__" else parts)))
+    return sorted(seen)
+
+
+def _code_objects(code: types.CodeType):
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _code_objects(const)
+
+
+def _function_deps(func, sources: dict, modules: set):
+    """
+    Fonte de `func` e das funções/classes do mesmo módulo que ela usa (em
+    `sources`) e os módulos do projeto de onde vêm os demais nomes que ela
+    usa (em `modules`). Constantes imutáveis do próprio módulo entram pelo
+    `repr` (listas e dicts podem mudar durante a execução e ficam de fora).
+    """
+    func = inspect.unwrap(func)
+    key = f"{func.__module__}.{func.__qualname__}"
+    if key in sources:
+        return
+    sources[key] = inspect.getsource(func)
+    if not hasattr(func, "__code__"):
+        return
+    names = {n for code in _code_objects(func.__code__) for n in code.co_names}
+    for name in sorted(names):
+        if name not in func.__globals__:
+            continue
+        obj = func.__globals__[name]
+        if isinstance(obj, types.ModuleType):
+            modules.add(obj.__name__)
+            continue
+        module = getattr(obj, "__module__", None)
+        if module == func.__module__ and inspect.isfunction(obj):
+            _function_deps(obj, sources, modules)
+        elif module == func.__module__ and inspect.isclass(obj):
+            sources[f"{module}.{obj.__qualname__}"] = inspect.getsource(obj)
+        elif isinstance(module, str) and _is_project(module) and (callable(obj) or inspect.isclass(obj)):
+            modules.add(module)
+        elif isinstance(obj, (str, bytes, int, float, tuple, frozenset)):
+            sources[f"{func.__module__}.{name}"] = repr(obj)
+
+
+@dataclass
+class Stage:
+    """
+    Etapa do DAG.
+
+    Args:
+        name (str): Nome único (também usado no perfil da execução)
+        func (callable): Recebe as entradas na ordem de `inputs`
+        inputs (tuple): Nomes de parâmetros da execução ou de saídas de etapas
+        outputs (tuple): Nomes das saídas; com mais de uma, `func` devolve uma tupla
+        code (tuple): Módulos (nome) ou funções cujo fonte entra na versão do
+            código da etapa, além do fonte de `func`
+        artifacts (bool): A etapa grava arquivos e devolve seus caminhos; o cache
+            só vale se os arquivos ainda existirem com o mesmo conteúdo
+        process (bool): Executa `func` no processo auxiliar do runner (entradas
+            e saídas precisam ser serializáveis com pickle)
+        cache (bool): False para etapas baratas (filtros) que não compensam o
+            espaço em disco; a chave continua valendo para as etapas seguintes
+    """
+    name: str
+    func: Callable
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    code: tuple = ()
+    artifacts: bool = False
+    process: bool = False
+    cache: bool = True
+
+    def _code_deps(self) -> Tuple[dict, list]:
+        sources, modules = {}, set()
+        for dep in (self.func,) + tuple(self.code):
+            if isinstance(dep, str):
+                modules.add(dep)
+            else:
+                _function_deps(dep, sources, modules)
+        return sources, module_closure(modules)
+
+    def code_modules(self) -> list:
+        """Módulos do projeto cujo fonte entra em `code_version`."""
+        return self._code_deps()[1]
+
+    def code_version(self) -> str:
+        h = hashlib.sha256(CACHE_VERSION.encode())
+        sources, modules = self._code_deps()
+        for name, source in sorted(sources.items()):
+            h.update(f"{name}\n{source}".encode())
+        for module in modules:
+            h.update(f"{module}\n".encode() + _module_file(module).read_bytes())
+        return h.hexdigest()
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def fingerprint(value) -> str:
+    """Hash do conteúdo de um parâmetro (arquivos pelos bytes, DataFrames pelos valores)."""
+    if isinstance(value, Path):
+        return _sha(value.read_bytes()) if value.is_file() else _sha(str(value).encode())
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        h = hashlib.sha256(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        h.update(repr(getattr(value, "columns", value.name)).encode())
+        return h.hexdigest()
+    if isinstance(value, dict):
+        return _sha(repr(sorted((k, fingerprint(v)) for k, v in value.items())).encode())
+    if isinstance(value, (list, tuple)):
+        return _sha(repr([fingerprint(v) for v in value]).encode())
+    return _sha(pickle.dumps(value))
+
+
+class StageRunner:
+    """
+    Executa um DAG de `Stage`s.
+
+    Args:
+        stages (list): Etapas (a ordem não importa; dependências vêm de inputs/outputs)
+        cache_dir: Diretório do cache (`<etapa>/<chave>.pkl`); None desliga o cache
+        workers (int): Etapas independentes executadas ao mesmo tempo
+        profile (RunProfile): Se dado, cada etapa executada vira um span (CPU da
+            thread da etapa; pico de memória por etapa só com `workers=1`, em
+            paralelo o pico de uma etapa incluiria o das outras)
+        processes (bool): Etapas com `process=True` rodam num processo auxiliar
+            (um só, então o ramo roda em sequência lá); False roda tudo em threads
+
+    Attributes:
+        status (dict): Etapa -> "run" ou "cached" após `run`
+    """
+
+    def __init__(self, stages: Sequence[Stage], cache_dir="data/cache", workers: int = 2,
+                 profile=None, processes: bool = True):
+        self.stages = {s.name: s for s in stages}
+        self.producer = {out: s.name for s in stages for out in s.outputs}
+        if len(self.producer) != sum(len(s.outputs) for s in stages):
+            raise ValueError("Saída declarada por mais de uma etapa!")
+        self.cache_dir = None if cache_dir is None else Path(cache_dir)
+        self.workers = workers
+        self.profile = profile
+        self.processes = processes
+        self.status = {}
+        self._process_pool = None
+
+    # --- planejamento ------------------------------------------------------
+
+    def upstream(self, targets: Optional[Sequence[str]] = None) -> list:
+        """Etapas necessárias para `targets` (todas se None) em ordem topológica."""
+        names = list(self.stages) if targets is None else list(targets)
+        order, seen = [], set()
+
+        def visit(name, path=()):
+            if name in path:
+                raise ValueError(f"Ciclo no DAG: {' -> '.join(path + (name,))}")
+            if name in seen:
+                return
+            for inp in self.stages[name].inputs:
+                if inp in self.producer:
+                    visit(self.producer[inp], path + (name,))
+            seen.add(name)
+            order.append(name)
+
+        for name in names:
+            if name not in self.stages:
+                raise KeyError(f"Etapa desconhecida: {name}")
+            visit(name)
+        return order
+
+    def _key(self, stage: Stage, params: dict, keys: dict) -> str:
+        h = hashlib.sha256(stage.code_version().encode())
+        for inp in stage.inputs:
+            if inp in self.producer:
+                part = keys[self.producer[inp]]
+            elif inp in params:
+                part = fingerprint(params[inp])
+            else:
+                raise KeyError(f"Entrada `{inp}` da etapa `{stage.name}` não encontrada")
+            h.update(f"{inp}={part};".encode())
+        return h.hexdigest()[:32]
+
+    # --- cache -------------------------------------------------------------
+
+    def _cache_path(self, stage: Stage, key: str) -> Optional[Path]:
+        if self.cache_dir is None or not stage.cache:
+            return None
+        return self.cache_dir / stage.name / f"{key}.pkl"
+
+    def _load(self, stage: Stage, key: str):
+        path = self._cache_path(stage, key)
+        if path is None or not path.is_file():
+            return None
+        with open(path, "rb") as fh:
+            entry = pickle.load(fh)
+        if stage.artifacts:
+            for file, digest in entry["files"].items():
+                if not Path(file).is_file() or _sha(Path(file).read_bytes()) != digest:
+                    return None
+        path.touch()  # marca como usada (ordem de descarte)
+        return entry
+
+    def _save(self, stage: Stage, key: str, values: tuple):
+        path = self._cache_path(stage, key)
+        if path is None:
+            return
+        entry = {"values": values}
+        if stage.artifacts:
+            entry["files"] = {str(f): _sha(Path(f).read_bytes()) for f in _flatten(values)}
+        with atomic_write(path) as tmp, open(tmp, "wb") as fh:
+            pickle.dump(entry, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        entries = sorted(path.parent.glob("*.pkl"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in entries[CACHE_ENTRIES:]:
+            old.unlink(missing_ok=True)
+
+    # --- execução ----------------------------------------------------------
+
+    def _execute(self, stage: Stage, key: str, args: list) -> tuple:
+        """Lê a etapa do cache ou a executa (e grava o resultado)."""
+        if self.profile is None:
+            return self._load_or_run(stage, key, args, {})
+        with self.profile.span(stage.name, memory=self.workers <= 1) as span:
+            return self._load_or_run(stage, key, args, span)
+
+    def _load_or_run(self, stage: Stage, key: str, args: list, span: dict) -> tuple:
+        entry = self._load(stage, key)
+        if entry is not None:
+            self.status[stage.name] = "cached"
+            span["cached"] = True
+            return entry["values"]
+        if stage.process and self._process_pool is not None:
+            span["process"] = True  # roda em outro processo: cpu_s e passos não são medidos
+            result = self._process_pool.submit(stage.func, *args).result()
+        else:
+            result = stage.func(*args)
+        result = result if len(stage.outputs) > 1 else (result,)
+        span["rows"] = _rows(result[0])
+        self._save(stage, key, result)
+        self.status[stage.name] = "run"
+        return result
+
+    def run(self, params: dict, targets: Optional[Sequence[str]] = None) -> dict:
+        """
+        Executa as etapas necessárias para `targets` e devolve todas as saídas
+        produzidas ou lidas do cache (nome da saída -> valor).
+
+        Uma etapa entra no pool assim que todas as etapas de que depende
+        terminam; ramos independentes rodam ao mesmo tempo.
+        """
+        pending = self.upstream(targets)
+        values, keys, done = {}, {}, set()
+        running = {}
+
+        if self.processes and any(self.stages[n].process for n in pending):
+            self._process_pool = ProcessPoolExecutor(max_workers=1, mp_context=_mp_context())
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(self.workers, 1)) as pool:
+                while pending or running:
+                    for name in [n for n in pending if self._deps(n) <= done]:
+                        pending.remove(name)
+                        stage = self.stages[name]
+                        keys[name] = key = self._key(stage, params, keys)
+                        args = [values[i] if i in self.producer else params[i] for i in stage.inputs]
+                        running[pool.submit(self._execute, stage, key, args)] = name
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        values.update(zip(self.stages[name].outputs, future.result()))
+                        done.add(name)
+        finally:
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
+        return values
+
+    def _deps(self, name: str) -> set:
+        return {self.producer[i] for i in self.stages[name].inputs if i in self.producer}
+
+
+def _mp_context():
+    # forkserver/spawn: fork com threads do pool já ativas pode herdar locks presos
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _flatten(values):
+    for v in values:
+        if isinstance(v, (list, tuple)):
+            yield from _flatten(v)
+        elif v is not None:
+            yield v
+
+
+def _rows(value):
+    try:
+        return len(value)
+    except TypeError:
+        return None
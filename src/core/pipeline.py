@@ -0,0 +1,383 @@
+# core/pipeline.py
+"""
+Etapas do pipeline de `main.py` como funções puras (sem prints nem escrita
+em disco), para que o script, os benchmarks e os testes executem exatamente
+o mesmo código.
+
+`build_stages` monta o DAG de `main.py` (ver `core.dag`): cada etapa declara
+entradas e saídas e é cacheada em disco pelo hash das entradas e do código.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.dag import Stage
+from core.spread_calculator import compute_spreads
+from core.windowing import build_observation_windows
+from utils.file_io import (atomic_write, load_corp_bond_data, load_di_surface, load_yield_surface, precompress,
+                           read_sheet, write_surface)
+from utils.filters import flag_non_business_days, reindex_business_days
+from utils.interpolation import interpolate_di_surface, interpolate_surface
+from utils.plotting import (
+    LOD_MAX_DATES,
+    write_figure,
+    plot_surface_spread_with_bonds,
+    plot_yield_curve_surface,
+    show_summary_table,
+    show_di_summary_table,
+    show_ipca_summary_table
+)
+from utils.profiling import step
+
+CURVE_COLUMNS = {
+    "Curve date": "obs_date",
+    "Generic ticker": "generic_ticker_id",
+    "Term": "tenor",
+    "px_last": "yield"
+}
+
+
+def ordered_tenors(tenors: dict, columns=None) -> list:
+    """Nomes dos tenores em ordem crescente de prazo (só os presentes em `columns`)."""
+    names = [k for k, _ in sorted(tenors.items(), key=lambda x: x[1])]
+    return names if columns is None else [k for k in names if k in columns]
+
+
+# ---------------------------------------------------------------------------
+# Curva DI
+# ---------------------------------------------------------------------------
+
+def clean_surface(surface: pd.DataFrame) -> pd.DataFrame:
+    """Remove yields/tenores ausentes, yields não positivos e volume zero."""
+    surface = surface.dropna(subset=["yield", "tenor"])
+    surface = surface[surface["yield"] > 0]
+    if "volume" in surface.columns:
+        surface = surface.assign(volume=pd.to_numeric(surface["volume"], errors="coerce"))
+        surface = surface[surface["volume"] > 0]
+    return surface
+
+
+def dedupe_surface(surface: pd.DataFrame) -> pd.DataFrame:
+    """Uma cotação por (obs_date, tenor), mantendo a última."""
+    return surface.drop_duplicates(subset=["obs_date", "tenor"], keep="last")
+
+
+def pivot_surface(surface: pd.DataFrame) -> pd.DataFrame:
+    """Curva em formato wide (sem duplicatas), indexada por curve_id yyyymmdd."""
+    pivoted = surface.pivot(index="obs_date", columns="tenor", values="yield").sort_index()
+    pivoted["curve_id"] = pivoted.index.strftime("%Y%m%d")
+    return pivoted.reset_index().set_index("curve_id")
+
+
+def di_view(yc_table: pd.DataFrame, tenors: dict) -> pd.DataFrame:
+    """Curva DI interpolada com as colunas em ordem de prazo (para gráficos)."""
+    ordered_cols = ordered_tenors(tenors)
+    if all(col in yc_table.columns for col in ordered_cols):
+        return yc_table[ordered_cols]
+    return yc_table
+
+
+def render_di(df_vis: pd.DataFrame, max_dates: int = None):
+    """Superfície DI (decimada acima de `max_dates` datas) e tabela resumo (pode ser None)."""
+    fig = plot_yield_curve_surface(df_vis, source_text="Source: DI B3 – cálculos propios",
+                                   max_dates=max_dates)
+    return fig, show_di_summary_table(df_vis)
+
+
+# ---------------------------------------------------------------------------
+# Spreads
+# ---------------------------------------------------------------------------
+
+def spread_pivot(corp_bonds: pd.DataFrame, tenors: dict) -> pd.DataFrame:
+    """Spread médio por (OBS_DATE, TENOR_BUCKET), colunas em ordem de prazo."""
+    spread_surface = corp_bonds.pivot_table(
+        index="OBS_DATE",
+        columns="TENOR_BUCKET",
+        values="SPREAD",
+        aggfunc="mean"
+    ).sort_index()
+    return spread_surface[ordered_tenors(tenors, spread_surface.columns)]
+
+
+def render_spreads(spread_surface: pd.DataFrame, corp_bonds: pd.DataFrame, max_dates: int = None):
+    """Superfície 3D de spreads (decimada acima de `max_dates` datas) e tabela resumo (pode ser None)."""
+    fig = plot_surface_spread_with_bonds(
+        df_surface=spread_surface,
+        audit=corp_bonds,
+        title="Corporate vs. DI Spread Surface (Filtered Universe with Point-in-Time Yields)",
+        zmin=-200,
+        zmax=2000,
+        max_dates=max_dates
+    )
+    return fig, show_summary_table(corp_bonds)
+
+
+# ---------------------------------------------------------------------------
+# ID x IPCA (WLA)
+# ---------------------------------------------------------------------------
+
+def load_ipca_surface(path) -> pd.DataFrame:
+    """Curva WLA (aba `only_values`) no formato long do pipeline, sem duplicatas."""
+    ipca_curve = read_sheet(path, "only_values")
+    ipca_curve["Curve date"] = pd.to_datetime(ipca_curve["Curve date"])
+    ipca_surface = ipca_curve.rename(columns=CURVE_COLUMNS)
+    ipca_surface = ipca_surface.dropna(subset=["yield", "tenor"])
+    ipca_surface = ipca_surface[ipca_surface["yield"] > 0].copy()
+    ipca_surface["curve_id"] = ipca_surface["generic_ticker_id"] + ipca_surface["obs_date"].dt.strftime("%Y%m%d")
+    return ipca_surface.drop_duplicates(subset=["curve_id"], keep="last")
+
+
+def interpolate_ipca(ipca_surface: pd.DataFrame, tenors: dict) -> pd.DataFrame:
+    """Curva WLA interpolada nos tenores alvo, colunas em ordem de prazo."""
+    ipca_interp = interpolate_surface(ipca_surface, tenors)
+    ipca_ordered = ordered_tenors(tenors)
+    if all(c in ipca_interp.columns for c in ipca_ordered):
+        return ipca_interp[ipca_ordered]
+    return ipca_interp
+
+
+def render_ipca(df_ipca_vis: pd.DataFrame, ipca_surface: pd.DataFrame, max_dates: int = None):
+    """Superfície e tabela resumo do contrato ID x IPCA."""
+    fig = plot_yield_curve_surface(df_ipca_vis, source_text="Source: WLA B3 – cálculos próprios",
+                                   max_dates=max_dates)
+    return fig, show_ipca_summary_table(ipca_surface)
+
+
+# ---------------------------------------------------------------------------
+# DAG de main.py
+# ---------------------------------------------------------------------------
+
+SKIPPED_COLUMNS = ["Bond ID", "Obs Date", "Reason"]
+
+
+def di_surface_stage(hist_curve_path, calendar):
+    """Curva DI limpa e sem duplicatas + nº de datas fora do `calendar`."""
+    with step("load") as span:
+        surface = load_di_surface(hist_curve_path)
+        off_calendar = flag_non_business_days(surface, "obs_date", calendar)["obs_date"].nunique()
+        span["rows"] = len(surface)
+    with step("clean", rows=len(surface)):
+        surface = clean_surface(surface)
+    with step("dedupe", rows=len(surface)):
+        surface = dedupe_surface(surface)
+    return surface, off_calendar
+
+
+def yields_panel_stage(ya_path, calendar):
+    """
+    Yields YAS na grade de dias úteis do `calendar` + nº de datas fora dele
+    (o mesmo calendário dos spreads, para que as duas contagens batam).
+    """
+    with step("load") as span:
+        yields_ts = load_yield_surface(ya_path)
+        yields_ts.columns = yields_ts.columns.astype(str).str.strip()
+        off_calendar = len(flag_non_business_days(yields_ts, calendar=calendar))
+        span["rows"] = yields_ts.size
+    with step("reindex", rows=yields_ts.size):
+        yields_ts = reindex_business_days(yields_ts, calendar)
+    return yields_ts, off_calendar
+
+
+def corp_universe_stage(corp_path, yields_ts):
+    """Debêntures elegíveis que têm série de yields."""
+    corp_data = load_corp_bond_data(corp_path)
+    return corp_data[corp_data["id"].isin(yields_ts.columns)]
+
+
+def select_dates(df: pd.DataFrame, start=None, end=None, column=None) -> pd.DataFrame:
+    """Linhas com data (índice ou `column`) em [start, end]; None = sem limite."""
+    dates = df.index if column is None else df[column]
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= np.asarray(dates >= start)
+    if end is not None:
+        mask &= np.asarray(dates <= end)
+    return df[mask]
+
+
+def di_window_stage(surface, start, end):
+    return select_dates(surface, start, end, "obs_date")
+
+
+def ipca_window_stage(ipca_surface, start, end):
+    """
+    Curvas WLA no intervalo. A WLA é mensal: num intervalo curto sem curva,
+    usa a última curva até `end` (a que vale para o período).
+    """
+    selected = select_dates(ipca_surface, start, end, "obs_date")
+    if selected.empty and start is not None:
+        previous = select_dates(ipca_surface, None, end, "obs_date")
+        if not previous.empty:
+            selected = previous[previous["obs_date"] == previous["obs_date"].max()]
+    return selected
+
+
+def yields_window_stage(yields_ts, start, end, bonds):
+    """Painel de yields no intervalo de datas e, se dado, só nas colunas de `bonds`."""
+    yields_ts = select_dates(yields_ts, start, end)
+    if bonds is not None:
+        yields_ts = yields_ts[[c for c in yields_ts.columns if c in bonds]]
+    return yields_ts
+
+
+def corp_selection_stage(corp_base, bonds):
+    return corp_base if bonds is None else corp_base[corp_base["id"].isin(bonds)]
+
+
+def spreads_stage(corp_base, yields_ts, yc_table, windows, tenors, calendar):
+    corp_bonds, skipped = compute_spreads(corp_base, yields_ts, yc_table, windows, tenors, calendar)
+    return corp_bonds, pd.DataFrame(skipped, columns=SKIPPED_COLUMNS)
+
+
+def surface_path(data_dir, name) -> Path:
+    """Superfície em resolução total servida por /api/surface/<name> (di, spread, ipca)."""
+    return Path(data_dir) / "surfaces" / f"{name}.csv"
+
+
+def _write_figures(static_dir, data_dir, name, surface, fig, fig_name, table, table_name) -> list:
+    """
+    Grava os HTMLs (atômicos, com o plotly.js compartilhado) com variantes
+    gzip/brotli para o app.py, e a superfície em resolução total que a página
+    busca pela API ao abrir um intervalo de datas.
+    """
+    with step("write", rows=len(surface)):
+        paths = write_figure(fig, Path(static_dir) / fig_name, api=f"/api/surface/{name}")
+        if table is not None:
+            paths.append(write_figure(table, Path(static_dir) / table_name)[0])
+    with step("compress"):
+        paths += [variant for path in paths for variant in precompress(path)]
+    paths.append(write_surface(surface, surface_path(data_dir, name)))
+    return paths
+
+
+def di_figures_stage(yc_table, tenors, static_dir, data_dir):
+    df_vis = di_view(yc_table, tenors)
+    with step("render", rows=len(df_vis)):
+        fig, table = render_di(df_vis, max_dates=LOD_MAX_DATES)
+    return _write_figures(static_dir, data_dir, "di", df_vis, fig, "di_surface.html",
+                          table, "di_summary_table.html")
+
+
+def spread_figures_stage(spread_surface, corp_bonds, static_dir, data_dir):
+    with step("render", rows=len(corp_bonds)):
+        fig, table = render_spreads(spread_surface, corp_bonds, max_dates=LOD_MAX_DATES)
+    return _write_figures(static_dir, data_dir, "spread", spread_surface, fig, "spread_surface.html",
+                          table, "summary_table.html")
+
+
+def ipca_figures_stage(ipca_table, ipca_surface, static_dir, data_dir):
+    with step("render", rows=len(ipca_table)):
+        fig, table = render_ipca(ipca_table, ipca_surface, max_dates=LOD_MAX_DATES)
+    return _write_figures(static_dir, data_dir, "ipca", ipca_table, fig, "ipca_surface.html",
+                          table, "ipca_summary_table.html")
+
+
+def skipped_csv_stage(skipped, data_dir):
+    path = Path(data_dir) / "skipped_yields.csv"
+    with atomic_write(path) as tmp:
+        skipped.to_csv(tmp, index=False)
+    return [path]
+
+
+TABLES = ("di_table", "ipca_table", "spreads", "spread_surface", "skipped")
+TABLE_FORMATS = ("csv", "parquet")
+
+
+def export_tables_stage(di_table, ipca_table, spreads, spread_surface, skipped, formats, data_dir):
+    """Tabelas do pipeline em `data_dir/tables/<tabela>.<formato>` (formatos de TABLE_FORMATS)."""
+    frames = dict(zip(TABLES, (di_table, ipca_table, spreads, spread_surface, skipped)))
+    paths = []
+    for fmt in (f for f in formats if f in TABLE_FORMATS):
+        for name, df in frames.items():
+            path = Path(data_dir) / "tables" / f"{name}.{fmt}"
+            with atomic_write(path) as tmp:
+                if fmt == "csv":
+                    df.to_csv(tmp)
+                else:
+                    df.to_parquet(tmp)
+            paths.append(path)
+    return paths
+
+
+def pipeline_params(config: dict, static_dir="static", data_dir="data", start=None, end=None,
+                    bonds=None, formats=("html",)) -> dict:
+    """
+    Parâmetros de entrada do DAG a partir do CONFIG (arquivos são hasheados pelo
+    conteúdo). `start`/`end` limitam as datas de observação e `bonds` os ids
+    das debêntures; as etapas de carga não dependem deles e seguem no cache.
+    """
+    return {
+        "hist_curve_path": Path(config["HIST_CURVE_PATH"]),
+        "wla_curve_path": Path(config["WLA_CURVE_PATH"]),
+        "corp_path": Path(config["CORP_PATH"]),
+        "ya_path": Path(config["YA_PATH"]),
+        "tenors": config["TENORS"],
+        "wla_tenors": config["WLA_TENORS"],
+        "calendar": config["CALENDAR"],
+        "obs_window": config["OBS_WINDOW"],
+        "static_dir": str(static_dir),
+        "data_dir": str(data_dir),
+        "start": None if start is None else pd.Timestamp(start),
+        "end": None if end is None else pd.Timestamp(end),
+        "bonds": None if bonds is None else tuple(sorted(set(bonds))),
+        "formats": tuple(formats),
+    }
+
+
+def default_targets(formats=("html",)) -> list:
+    """Etapas finais de uma execução completa para os formatos de saída pedidos."""
+    targets = ["skipped_csv"]
+    if "html" in formats:
+        targets += ["di_figures", "spread_figures", "ipca_figures"]
+    if any(f in TABLE_FORMATS for f in formats):
+        targets.append("export_tables")
+    return targets
+
+
+def build_stages() -> list:
+    """
+    Etapas de main.py. Os ramos DI/spreads e IPCA (ipca_surface → ipca_table →
+    ipca_figures) não dependem um do outro; o ramo IPCA roda num processo à
+    parte, em paralelo com o ramo DI/spreads. Os filtros de datas/debêntures
+    (*_window, corp_selection) ficam depois das cargas e fora do cache.
+    """
+    interp = ("utils.interpolation", "finmath.termstructure.curve_models")
+    figures = (_write_figures, surface_path, write_surface, precompress, "utils.plotting")
+    return [
+        Stage("di_surface", di_surface_stage, ("hist_curve_path", "calendar"), ("di_surface", "di_off_calendar"),
+              code=(load_di_surface, read_sheet, clean_surface, dedupe_surface, "utils.filters")),
+        Stage("yields_panel", yields_panel_stage, ("ya_path", "calendar"), ("yields_panel", "yields_off_calendar"),
+              code=(load_yield_surface, read_sheet, "utils.filters", "calendars.compiled")),
+        Stage("corp_universe", corp_universe_stage, ("corp_path", "yields_panel"), ("corp_universe",),
+              code=(load_corp_bond_data, read_sheet)),
+        Stage("di_window", di_window_stage, ("di_surface", "start", "end"), ("di_selected",),
+              code=(select_dates,), cache=False),
+        Stage("yields_window", yields_window_stage, ("yields_panel", "start", "end", "bonds"),
+              ("yields_selected",), code=(select_dates,), cache=False),
+        Stage("corp_selection", corp_selection_stage, ("corp_universe", "bonds"), ("corp_selected",),
+              cache=False),
+        Stage("ipca_window", ipca_window_stage, ("ipca_surface", "start", "end"), ("ipca_selected",),
+              code=(select_dates,), cache=False),
+        Stage("di_table", interpolate_di_surface, ("di_selected", "tenors"), ("di_table",), code=interp),
+        Stage("ipca_surface", load_ipca_surface, ("wla_curve_path",), ("ipca_surface",),
+              code=(read_sheet,), process=True),
+        Stage("ipca_table", interpolate_ipca, ("ipca_selected", "wla_tenors"), ("ipca_table",),
+              code=interp + (ordered_tenors,), process=True),
+        Stage("windows", build_observation_windows, ("corp_selected", "yields_selected", "obs_window"),
+              ("windows",), code=("core.windowing",)),
+        Stage("spreads", spreads_stage,
+              ("corp_selected", "yields_selected", "di_table", "windows", "tenors", "calendar"),
+              ("spreads", "skipped"), code=("core.spread_calculator", "calendars.daycounts") + interp),
+        Stage("spread_surface", spread_pivot, ("spreads", "tenors"), ("spread_surface",),
+              code=(ordered_tenors,)),
+        Stage("di_figures", di_figures_stage, ("di_table", "tenors", "static_dir", "data_dir"),
+              ("di_figures",), code=(render_di, di_view, ordered_tenors) + figures, artifacts=True),
+        Stage("spread_figures", spread_figures_stage, ("spread_surface", "spreads", "static_dir", "data_dir"),
+              ("spread_figures",), code=(render_spreads,) + figures, artifacts=True),
+        Stage("ipca_figures", ipca_figures_stage, ("ipca_table", "ipca_selected", "static_dir", "data_dir"),
+              ("ipca_figures",), code=(render_ipca,) + figures, artifacts=True, process=True),
+        Stage("skipped_csv", skipped_csv_stage, ("skipped", "data_dir"), ("skipped_csv",), artifacts=True),
+        Stage("export_tables", export_tables_stage, TABLES + ("formats", "data_dir"), ("tables",),
+              artifacts=True),
+    ]
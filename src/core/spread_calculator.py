@@ -6,7 +6,9 @@ from calendars.daycounts import DayCounts
 
 DAYCOUNT = DayCounts("bus/252", calendar="cdr_anbima")
 
-def compute_spreads(corp_base, yields_ts, yc_table, observation_periods, tenors_dict):
+def compute_spreads(corp_base, yields_ts, yc_table, observation_periods, tenors_dict,
+                    calendar=DAYCOUNT.calendar):
+    daycount = DAYCOUNT if calendar == DAYCOUNT.calendar else DayCounts("bus/252", calendar=calendar)
     expanded_rows = []
     skipped = []
 
@@ -16,10 +18,13 @@ def compute_spreads(corp_base, yields_ts, yc_table, observation_periods, tenors_
         if obs_start is None:
             continue
 
-        for obs_date, di_row in yc_table.iterrows():
-            if not (obs_start <= obs_date <= obs_end):
-                continue
-
+        # Apenas dias úteis da janela que têm curva DI; curvas DI em datas
+        # fora do calendário vão para os ignorados em vez de sumirem
+        window = pd.DatetimeIndex(daycount.bus_range(obs_start, obs_end))
+        in_period = yc_table.index[(yc_table.index >= obs_start) & (yc_table.index <= obs_end)]
+        for obs_date in in_period.difference(window):
+            skipped.append((bond_id, obs_date, f"DI curve on non-business day ({daycount.calendar})"))
+        for obs_date in yc_table.index.intersection(window):
             try:
                 yas_yld = yields_ts.at[obs_date, bond_id]
             except KeyError:
@@ -29,7 +34,7 @@ def compute_spreads(corp_base, yields_ts, yc_table, observation_periods, tenors_
                 skipped.append((bond_id, obs_date, "NaN yield"))
                 continue
 
-            tenor_yrs = DAYCOUNT.tf(obs_date, bond["MATURITY"])
+            tenor_yrs = daycount.tf(obs_date, bond["MATURITY"])
 
             if tenor_yrs <= 0:
                 continue
@@ -1,13 +1,43 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import datetime as dt
 
+from collections.abc import Mapping
+from functools import lru_cache
 from scipy.interpolate import interp1d
-from math import log, exp
-from mpl_toolkits.mplot3d import Axes3D
-from datetime import datetime
-from finmath.SwapCurve.Holidays.AnbimaHolidays import AnbimaHolidays
+
+
+def _pyplot():
+    """Imports matplotlib only when something is actually plotted, so the
+    curve math stays cheap to import on headless workers."""
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 (registers '3d')
+    return plt
+
+
+class _LazyCalendars(Mapping):
+    """Maps SwapCurve calendar names to holidays of the shared calendar
+    registry (`calendars.holidays.Holidays`). Holidays are only resolved on
+    first access and then kept as a datetime64 array."""
+
+    def __init__(self, names):
+        self._names = dict(names)
+        self._resolved = {}
+
+    def __getitem__(self, calendar):
+        if calendar not in self._resolved:
+            from calendars.holidays import Holidays
+            holidays = Holidays.holidays(cdr=self._names[calendar])
+            self._resolved[calendar] = np.array(holidays, dtype='datetime64[D]')
+        return self._resolved[calendar]
+
+    def __contains__(self, calendar):
+        return calendar in self._names
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
 
 
 class SwapCurve(object):
@@ -25,9 +55,9 @@ class SwapCurve(object):
             'calendar_days': 360
             }
 
-    calendars = {
-        'br_anbima': AnbimaHolidays().get_holidays()
-    }
+    calendars = _LazyCalendars({
+        'br_anbima': 'cdr_anbima'
+    })
 
     def __init__(self, rates, convention='business_days',
                  calendar='br_anbima'):
@@ -52,7 +82,13 @@ class SwapCurve(object):
         self.convention = convention
         self.convention_year = self.conventions[convention]
         self.rates = rates
-        self.holidays = self.calendars[calendar]
+        if calendar not in self.calendars:
+            raise KeyError(calendar)
+        self.calendar = calendar
+
+    @property
+    def holidays(self):
+        return self.calendars[self.calendar]
 
     def plot_3d(self, plot_type='surface'):
         """Function to plot the surface of the swap curve.
@@ -85,6 +121,7 @@ class SwapCurve(object):
         x, y = np.meshgrid(x, y)
 
         # Plotting Graphic
+        plt = _pyplot()
         fig = plt.figure()
         ax = fig.add_subplot(111, projection='3d')
         if plot_type == 'surface':
@@ -138,43 +175,18 @@ class SwapCurve(object):
         if type(interpolate_methods) not in (list, np.ndarray):
             raise TypeError("Argument 'interpolate_methods' should be array_like.")
 
-        # Checking if base_curves are valid:
-        curves = []
-        for date in base_curves:
-            try:
-                curve = self.rates[date]
-                curve = curve.dropna()
-            except IndexError as e:
-                print('{}. {} is an invalid date, since there is not a curve for this date. It will not be used.'.format(e, date))
-            else:
-                curves.append(curve)
+        # Gathering all base curves at once (terms x dates)
+        table = self.rates[list(base_curves)].dropna(how='all')
 
         # Checking if there are curves to be plotted
-        if len(curves) == 0:
+        if table.shape[1] == 0 or table.empty:
             raise ValueError('There are no Base Curves to be used.')
 
-        # Creating dataFrame with information asked
+        # One dense (dates x desired_terms) block per interpolation method
         info = {}
         for method in interpolate_methods:
-            info[method] = pd.DataFrame()
-        for curve in curves:
-            for method in interpolate_methods:
-                terms = curve.index
-                dterms = [self._days_in_term(t, self.convention) for
-                          t in terms]
-                n_desired_terms = desired_terms.copy()
-                # Checks if desired_terms are valid
-                for term in desired_terms:
-                    if term < min(dterms) or term > max(dterms):
-                        print('{} is an invalid term.'.format(term))
-                        n_desired_terms.remove(term)
-                irates = self._interpolate_rates(dterms, list(curve),
-                                                 n_desired_terms, method,
-                                                 self.convention_year)
-                rates = {k: v for k, v in zip(n_desired_terms,
-                                              irates)}
-                for k in rates.keys():
-                    info[method].at[curve.name, k] = rates[k]
+            info[method] = self._interpolate_curves(table, desired_terms,
+                                                    method)
 
         return info
 
@@ -198,22 +210,56 @@ class SwapCurve(object):
                 Let the user decide which Interpolation Method will be used.
         """
 
-        historic = pd.Series()
-        for i in range(len(self.rates.columns)):
-            date = self.rates.columns[i]
-            rate1 = self.get_rate([date], [maturity1],
-                                  [interpolate_method])[interpolate_method][maturity1][date]
-            rate2 = self.get_rate([date], [maturity2],
-                                  [interpolate_method])[interpolate_method][maturity2][date]
-            forward = self._forward_rate(date, maturity1, maturity2,
-                                         rate1, rate2, self.convention_year)
-            historic.at[date] = forward
+        pair = (maturity1, maturity2)
+        historic = self.get_forward_matrix([pair], interpolate_method)[pair]
+        historic.name = None
         if plot:
             historic.plot()
-            plt.show()
+            _pyplot().show()
 
         return historic
 
+    def get_forward_matrix(self, pairs, interpolate_method='cubic'):
+        """Function that returns the historic forward rates for many pairs of
+        maturities at once.
+
+        Arguments
+        ----------
+            pairs : array_like
+                Collection of (maturity1, maturity2) tuples, as in
+                `get_historic_forward`.
+
+        Keyword Arguments
+        ----------
+            interpolate_method {str} (default: {'cubic'})
+                Let the user decide which Interpolation Method will be used.
+
+        Return
+        ----------
+            forwards : pandas df
+                One row per date and one column per (maturity1, maturity2)
+                pair.
+        """
+
+        pairs = [tuple(pair) for pair in pairs]
+        maturities = sorted({m for pair in pairs for m in pair})
+        dates = list(self.rates.columns)
+        rates = self.get_rate(dates, maturities, [interpolate_method])
+        rates = rates[interpolate_method].reindex(columns=maturities)
+
+        maturity1 = np.array([pair[0] for pair in pairs])
+        maturity2 = np.array([pair[1] for pair in pairs])
+        rate1 = rates[list(maturity1)].to_numpy(dtype=float)
+        rate2 = rates[list(maturity2)].to_numpy(dtype=float)
+        base_dates = np.array(rates.index, dtype='datetime64[D]')[:, None]
+
+        forwards = self._forward_rate(base_dates, maturity1[None, :],
+                                      maturity2[None, :], rate1, rate2,
+                                      self.convention_year, self.calendar)
+        columns = pd.MultiIndex.from_tuples(pairs,
+                                            names=['maturity1', 'maturity2'])
+        return pd.DataFrame(forwards, index=rates.index, columns=columns)
+
     def get_historic_rates(self, maturity, plot=False):
         terms = self.rates.index
         day_terms = [self._days_in_term(term, self.convention) for term in terms]
@@ -221,7 +267,7 @@ class SwapCurve(object):
             historic_rates_curve = self.rates.loc[maturity]
             if plot:
                 historic_rates_curve.plot()
-                plt.show()
+                _pyplot().show()
             return historic_rates_curve
         else:
             dates = list(self.rates.columns)
@@ -229,7 +275,7 @@ class SwapCurve(object):
             table_term = response["cubic"][maturity]
             if plot:
                 table_term.plot()
-                plt.show()
+                _pyplot().show()
             return table_term
 
     def plot_day_curve(self, dates, interpolate=False,
@@ -285,6 +331,7 @@ class SwapCurve(object):
         if len(curves) == 0:
             raise ValueError('There are no dates to be plotted.')
 
+        plt = _pyplot()
         plotted = False
         # Start plotting
         for curve in curves:
@@ -355,7 +402,7 @@ class SwapCurve(object):
 
         if plot:
             durations.plot()
-            plt.show()
+            _pyplot().show()
 
         return durations
 
@@ -379,6 +426,37 @@ class SwapCurve(object):
 
         return base_curve
 
+    def _interpolate_curves(self, table, desired_terms, method):
+        """Interpolates the curves in `table` (terms x dates) at once. Curves
+        sharing the same set of available terms are stacked and interpolated
+        in a single call."""
+
+        dates = table.columns
+        result = np.full((len(dates), len(desired_terms)), np.nan)
+        desired = np.asarray(desired_terms, dtype=float)
+
+        values = table.to_numpy(dtype=float).T
+        patterns, group = np.unique(~np.isnan(values), axis=0,
+                                    return_inverse=True)
+        for g, pattern in enumerate(patterns):
+            positions = np.flatnonzero(group.ravel() == g)
+            terms = table.index[pattern]
+            dterms = np.array([self._days_in_term(t, self.convention) for
+                               t in terms], dtype=float)
+            valid = (desired >= dterms.min()) & (desired <= dterms.max())
+            for term in desired[~valid]:
+                print('{} is an invalid term.'.format(term))
+            if not valid.any():
+                continue
+            irates = self._interpolate_rates(dterms,
+                                             values[np.ix_(positions, pattern)],
+                                             desired[valid],
+                                             method, self.convention_year)
+            result[np.ix_(positions, np.flatnonzero(valid))] = irates
+
+        info = pd.DataFrame(result, index=dates, columns=list(desired_terms))
+        return info.dropna(axis=1, how='all')
+
     @staticmethod
     def _get_duration(maturity, rate, convention):
 
@@ -393,8 +471,12 @@ class SwapCurve(object):
                            method, convention_days):
 
         if method != 'flat_forward':
-            func = interp1d(day_terms, rates, kind=method)
-            interp_rates = [func(day) for day in interp_terms]
+            # Spline coefficients for every curve (row) are fitted at once
+            rates = np.asarray(rates, dtype=float)
+            func = interp1d(day_terms, rates, kind=method, axis=-1)
+            interp_rates = func(np.asarray(interp_terms, dtype=float))
+            if rates.ndim == 1:
+                interp_rates = interp_rates.tolist()
         else:
             ff = FlatForward()
             interp_rates = ff.interpolate(rates, day_terms,
@@ -435,21 +517,21 @@ class SwapCurve(object):
 
     @staticmethod
     def _forward_rate(base_date, maturity1, maturity2,
-                      rate1, rate2, convention):
+                      rate1, rate2, convention, calendar='br_anbima'):
+        """Forward rate between two maturities (in calendar days from
+        `base_date`). Every argument may also be an array, in which case all
+        forwards are computed at once."""
 
-        rate1 = rate1/100
-        rate2 = rate2/100
-        holidays = AnbimaHolidays().get_holidays()
+        rate1 = np.asarray(rate1, dtype=float)/100
+        rate2 = np.asarray(rate2, dtype=float)/100
+        cal = _compiled_calendar(calendar)
 
-        maturity1_date = base_date + dt.timedelta(days=maturity1)
-        print(maturity1_date)
-        print(base_date)
-        maturity2_date = base_date + dt.timedelta(days=maturity2)
+        base_date = np.array(base_date).astype('datetime64[D]')
+        maturity1_date = base_date + np.asarray(maturity1).astype('timedelta64[D]')
+        maturity2_date = base_date + np.asarray(maturity2).astype('timedelta64[D]')
 
-        business_days1 = np.busday_count(np.array(base_date).astype('datetime64[D]'),
-                                         np.array(maturity1_date).astype('datetime64[D]'), holidays=holidays)
-        business_days2 = np.busday_count(np.array(base_date).astype('datetime64[D]'),
-                                         np.array(maturity2_date).astype('datetime64[D]'), holidays=holidays)
+        business_days1 = cal.bus_count(base_date, maturity1_date)
+        business_days2 = cal.bus_count(base_date, maturity2_date)
 
         days_to_years1 = (business_days1/convention)
         days_to_years2 = (business_days2/convention)
@@ -462,6 +544,14 @@ class SwapCurve(object):
         return get_forward
 
 
+@lru_cache(maxsize=None)
+def _compiled_calendar(calendar):
+    """Business-day lookup tables built once per `SwapCurve.calendars`
+    entry; business-day counts are then two array lookups."""
+    from calendars.compiled import CompiledCalendar
+    return CompiledCalendar(SwapCurve.calendars[calendar])
+
+
 class FlatForward(object):
     """This class has the abilities of creating a Flat Forward interpolation
     on a specific set of swap rates.
@@ -476,6 +566,7 @@ class FlatForward(object):
         ----------
             rates : list
                 A List or a Numpy ndarray containing a collection of rates (Real Ones).
+                A 2-D array interpolates one curve per row in a single call.
             maturities : list
                 A List or a Numpy ndarray containing a collection of maturities (On DU unities).
             desired_maturities {list}
@@ -489,32 +580,34 @@ class FlatForward(object):
         ----------
             desired_rates : list
                 A list containing the rates the user wanted. Indexing correspond desired_maturities indexing.
+                For 2-D `rates`, an ndarray with one row per curve.
         """
 
-        discounts = [self._convert_rate(rate, maturity, convention_days) for
-                     rate, maturity in zip(rates, maturities)]
-        interp_func = interp1d(maturities, discounts)
+        rates = np.asarray(rates, dtype=float)
+        maturities = np.asarray(maturities, dtype=float)
+        desired = np.asarray(desired_maturities, dtype=float)
 
-        desired_rates = []
-        for maturity in desired_maturities:
-            discount = interp_func(maturity)
-            rate = self._convert_discount(discount, maturity, convention_days)
-            desired_rates.append(rate)
+        # One interpolation call on log-discounts for every curve (row)
+        discounts = self._convert_rate(rates, maturities, convention_days)
+        interp_func = interp1d(maturities, discounts, axis=-1)
+        desired_rates = self._convert_discount(interp_func(desired), desired,
+                                               convention_days)
 
+        if rates.ndim == 1:
+            return desired_rates.tolist()
         return desired_rates
 
     @staticmethod
     def _convert_rate(rate, maturity, convention_days):
 
-        rate = rate/100
-        discount = 1/((1+rate)**(maturity/convention_days))
-        discount = log(discount)
+        rate = np.asarray(rate, dtype=float)/100
+        discount = -(np.asarray(maturity)/convention_days)*np.log1p(rate)
         return discount
 
     @staticmethod
     def _convert_discount(discount, maturity, convention_days):
 
-        discount = exp(discount)
-        rate = (1/discount)**(convention_days/maturity) - 1
+        discount = np.exp(discount)
+        rate = (1/discount)**(convention_days/np.asarray(maturity)) - 1
         rate = rate*100
         return rate
@@ -1,6 +1,4 @@
-__all__ = ['SwapCurve', 'curve_models']
+__all__ = ['SwapCurve', 'curve_models', 'key_rates']
 
 from finmath.SwapCurve.SwapCurve import SwapCurve
-from finmath.termstructure import curve_models
-
-
+from finmath.termstructure import curve_models, key_rates
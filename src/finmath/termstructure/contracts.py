@@ -0,0 +1,161 @@
+import re
+from functools import lru_cache
+from typing import Collection, Tuple
+
+import numpy as np
+import pandas as pd
+
+from calendars import DayCounts
+
+# ---------------------------------------------------------------------------
+# Module-level constants
+# ---------------------------------------------------------------------------
+
+# Day of the expiry month each root settles on, rolled forward to a B3
+# business day: DI1 on the first business day, DAP/WLA on the 15th.
+EXPIRY_DAY = {"od": 1, "wl": 15}
+
+# Listing rule of each root: (months ahead of the observation month, listed
+# calendar months) tiers, the last one open-ended. DI1 lists every month for
+# the front year, then the quarterly months, then only January contracts;
+# DAP/WLA generics are consecutive monthly contracts.
+MONTHLY = tuple(range(1, 13))
+LISTING = {
+    "od": ((12, MONTHLY), (36, (1, 4, 7, 10)), (None, (1,))),
+    "wl": ((None, MONTHLY),),
+}
+
+# Months covered by the cached expiry tables
+FIRST_MONTH = np.datetime64("1990-01", "M")
+LAST_MONTH = np.datetime64("2080-12", "M")
+
+_TICKER = re.compile(r"^\s*([A-Za-z]+?)(\d+)\b")
+
+# ---------------------------------------------------------------------------
+# Helper functions
+# ---------------------------------------------------------------------------
+
+
+def parse_generic_ticker(ticker: str) -> Tuple[str, int]:
+    """Split a generic ticker into (root, position), e.g. 'wl3 Index' -> ('wl', 3)."""
+    match = _TICKER.match(ticker)
+    if match is None:
+        raise ValueError(f"Not a generic ticker: {ticker!r}")
+    return match.group(1).lower(), int(match.group(2))
+
+
+@lru_cache(maxsize=None)
+def _busdaycalendar(calendar: str) -> np.busdaycalendar:
+    return DayCounts("bus/252", calendar=calendar).buscore
+
+
+@lru_cache(maxsize=None)
+def expiry_table(root: str, calendar: str = "cdr_b3_settlement") -> np.ndarray:
+    """Expiry of every monthly contract of `root`, one per month since FIRST_MONTH.
+
+    Built once per (root, calendar) with a single `busday_offset` roll, so a
+    (root, month) expiry is then a plain array lookup.
+    """
+    if root not in EXPIRY_DAY:
+        raise KeyError(f"Unknown contract root {root!r}")
+    months = np.arange(FIRST_MONTH, LAST_MONTH + 1)
+    days = months.astype("datetime64[D]") + (EXPIRY_DAY[root] - 1)
+    table = np.busday_offset(
+        days, 0, roll="forward", busdaycal=_busdaycalendar(calendar)
+    )
+    table.setflags(write=False)
+    return table
+
+
+@lru_cache(maxsize=4096)
+def listed_months(root: str, month: np.datetime64, count: int) -> np.ndarray:
+    """The first `count` contract months of `root` listed from `month` on."""
+    if root not in LISTING:
+        raise KeyError(f"Unknown contract root {root!r}")
+    ahead = np.arange(12 * count + 12)  # enough even for January-only tiers
+    month_of_year = (np.datetime64(month, "M").astype(int) + ahead) % 12 + 1
+    listed = np.zeros(len(ahead), dtype=bool)
+    start = 0
+    for end, months in LISTING[root]:
+        tier = slice(start, end)
+        listed[tier] = np.isin(month_of_year[tier], months)
+        if end is None:
+            break
+        start = end
+    return np.datetime64(month, "M") + ahead[listed][:count]
+
+
+def contract_expiry(
+    root: str, month: np.ndarray, calendar: str = "cdr_b3_settlement"
+) -> np.ndarray:
+    """Expiry dates of `root` contracts for datetime64[M] `month`s."""
+    month = np.asarray(month, dtype="datetime64[M]")
+    pos = (month - FIRST_MONTH).astype(int)
+    if pos.size and (pos.min() < 0 or pos.max() >= len(expiry_table(root, calendar))):
+        raise ValueError(f"Contract months outside {FIRST_MONTH}..{LAST_MONTH}")
+    return expiry_table(root, calendar)[pos]
+
+
+# ---------------------------------------------------------------------------
+# Generic ticker resolution
+# ---------------------------------------------------------------------------
+
+
+def resolve_generic_tickers(
+    tickers: Collection[str],
+    obs_dates: Collection,
+    calendar: str = "cdr_b3_settlement",
+) -> pd.DataFrame:
+    """Map (generic ticker, observation date) rows to contract expiries.
+
+    Generic N is the N-th listed contract (see `LISTING`) still alive on the
+    observation date (expiry strictly after it), e.g. 'wl1 Index' on
+    2025-06-30 is the July 2025 contract expiring 2025-07-15 and 'od20
+    Comdty' the January 2029 DI1, past the monthly and quarterly tiers.
+
+    Args:
+        tickers: Generic tickers ('wl1 Index', 'od12 Comdty', ...).
+        obs_dates: Observation dates, aligned with `tickers`.
+        calendar (str): Business-day calendar for rolls and day counts.
+
+    Returns:
+        pd.DataFrame: Columns ``maturity``, ``du`` (business days from the
+        observation date to expiry) and ``tenor`` (du / 252), one row per
+        input row in the input order.
+
+    Work is done once per unique (ticker, date) pair; expiries come from the
+    cached per-root tables of `expiry_table` and listed months from the
+    cached `listed_months` of each observation month.
+    """
+    ticker_codes, names = pd.factorize(pd.Series(tickers), sort=False)
+    dates = pd.to_datetime(pd.Series(obs_dates)).values.astype("datetime64[D]")
+    date_codes, uniq_dates = pd.factorize(dates)
+    key = ticker_codes.astype(np.int64) * len(uniq_dates) + date_codes
+    pairs, codes = np.unique(key, return_inverse=True)
+
+    pair_ticker, pair_date = np.divmod(pairs, len(uniq_dates))
+    parsed = [parse_generic_ticker(t) for t in names]
+    roots = np.array([p[0] for p in parsed], dtype=object)[pair_ticker]
+    position = np.array([p[1] for p in parsed], dtype=int)[pair_ticker]
+    obs = np.asarray(uniq_dates, dtype="datetime64[D]")[pair_date]
+
+    expiry = np.empty(len(obs), dtype="datetime64[D]")
+    obs_month = obs.astype("datetime64[M]")
+    for root in np.unique(roots):
+        sel = roots == root
+        month = obs_month[sel]
+        # Skip the observation month when its contract has already expired
+        # (the observation month is always listed)
+        expired = contract_expiry(root, month, calendar) <= obs[sel]
+        nth = position[sel] - 1 + expired
+        contract = np.empty(len(month), dtype="datetime64[M]")
+        for m in np.unique(month):
+            same = month == m
+            contract[same] = listed_months(root, m, int(nth[same].max()) + 1)[nth[same]]
+        expiry[sel] = contract_expiry(root, contract, calendar)
+
+    du = np.busday_count(obs, expiry, busdaycal=_busdaycalendar(calendar))
+    result = pd.DataFrame(
+        {"maturity": expiry.astype("datetime64[ns]"), "du": du, "tenor": du / 252.0}
+    )
+    return result.iloc[codes].reset_index(drop=True)
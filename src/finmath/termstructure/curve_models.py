@@ -1,6 +1,9 @@
-from typing import Union, Collection, Optional, Tuple
+from typing import Union, Collection, Mapping, Optional, Tuple
 
 import warnings
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
@@ -8,6 +11,7 @@ import scipy.optimize as opt
 
 from calendars import DayCounts
 from calendars.custom_date_types import Date, TODAY
+from finmath.termstructure.contracts import resolve_generic_tickers
 
 # ---------------------------------------------------------------------------
 # Module-level constants
@@ -85,6 +89,101 @@ def flat_forward_interpolation(
     return y
 
 
+def flat_forward_weights(
+    t: np.ndarray, knots: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Linear weights of flat-forward log-discounts on the curve knots.
+
+    Flat-forward interpolation is linear in ``t * log(1 + y(t))``, so the
+    log-discount at any ``t`` is ``w1 * L[i1] + w2 * L[i2]`` with
+    ``L = -knots * log(1 + rates)``. Outside the knots the rate is kept flat,
+    as in `flat_forward_interpolation`. ``knots`` must be sorted and > 0.
+    """
+    t = np.asarray(t, dtype=float)
+    knots = np.asarray(knots, dtype=float)
+    n = len(knots)
+    if n == 1:
+        idx = np.zeros(t.shape, dtype=int)
+        return idx, idx, t / knots[0], np.zeros(t.shape)
+
+    i2 = np.clip(np.searchsorted(knots, t, side="right"), 1, n - 1)
+    i1 = i2 - 1
+    t1, t2 = knots[i1], knots[i2]
+    w2 = (t - t1) / (t2 - t1)
+    w1 = 1.0 - w2
+
+    lo, hi = t <= knots[0], t >= knots[-1]
+    w1 = np.where(lo, t / knots[0], np.where(hi, 0.0, w1))
+    w2 = np.where(lo, 0.0, np.where(hi, t / knots[-1], w2))
+    return i1, i2, w1, w2
+
+
+def flat_forward_log_discount(
+    t: np.ndarray, knots: np.ndarray, rates: np.ndarray
+) -> np.ndarray:
+    """Vectorized flat-forward log-discount factors ``-t * log(1 + y(t))``.
+
+    ``rates`` holds one rate per knot along its last axis; leading axes (e.g.
+    one curve per date) broadcast against ``t``.
+    """
+    knots = np.asarray(knots, dtype=float)
+    log_df = -knots * np.log1p(np.asarray(rates, dtype=float))
+    i1, i2, w1, w2 = flat_forward_weights(t, knots)
+    return w1 * log_df[..., i1] + w2 * log_df[..., i2]
+
+
+def flat_forward_rates(
+    t: np.ndarray, knots: np.ndarray, rates: np.ndarray
+) -> np.ndarray:
+    """Vectorized counterpart of `flat_forward_interpolation` (t > 0)."""
+    t = np.asarray(t, dtype=float)
+    return np.expm1(-flat_forward_log_discount(t, knots, rates) / t)
+
+
+def cash_flow_matrix(
+    cash_flows: Collection[pd.Series],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pad cash flows into (bonds x flows) arrays.
+
+    Returns the unique payment dates and, per bond, the index of each
+    payment into them plus the amounts (zero-padded). Year fractions then
+    only need to be computed once per unique date.
+    """
+    cash_flows = list(cash_flows)
+    width = max(len(cf) for cf in cash_flows)
+    all_dates = np.concatenate(
+        [pd.DatetimeIndex(cf.index).values.astype("datetime64[D]")
+         for cf in cash_flows]
+    )
+    pay_dates, inverse = np.unique(all_dates, return_inverse=True)
+
+    idx = np.zeros((len(cash_flows), width), dtype=int)
+    amounts = np.zeros((len(cash_flows), width))
+    pos = 0
+    for b, cf in enumerate(cash_flows):
+        n = len(cf)
+        idx[b, :n] = inverse.ravel()[pos:pos + n]
+        amounts[b, :n] = cf.values
+        pos += n
+    return pay_dates, idx, amounts
+
+
+def year_fractions(dc: DayCounts, ref_date: Date, pay_dates: np.ndarray) -> np.ndarray:
+    """Year fractions from `ref_date` to each date (negative for past dates)."""
+    ref = np.datetime64(pd.Timestamp(ref_date).date(), "D")
+    pay_dates = np.asarray(pay_dates, dtype="datetime64[D]")
+    if dc.dc in ("BUS/252", "BUS/30", "BUS/1"):
+        return np.busday_count(ref, pay_dates, busdaycal=dc.buscore) / dc.dib()
+
+    yf = np.zeros(len(pay_dates))
+    future, past = pay_dates > ref, pay_dates < ref
+    if future.any():
+        yf[future] = dc.tf(pd.Timestamp(ref), pd.DatetimeIndex(pay_dates[future]))
+    if past.any():
+        yf[past] = -dc.tf(pd.DatetimeIndex(pay_dates[past]), pd.Timestamp(ref))
+    return yf
+
+
 # ---------------------------------------------------------------------------
 # Nelson-Siegel-Svensson parametric curve
 # ---------------------------------------------------------------------------
@@ -99,6 +198,7 @@ class NelsonSiegelSvensson:
         calendar: str = "cdr_anbima",
         ref_date: Date = TODAY,
         lambdas: Optional[np.array] = ANBIMA_LAMBDAS,
+        fit_lambdas: bool = False,
     ):
         if isinstance(prices, float):
             prices = [prices]
@@ -109,6 +209,11 @@ class NelsonSiegelSvensson:
         self.dc = DayCounts(dc=day_count_convention, calendar=calendar)
 
         self.lambdas = np.ones(2) if lambdas is None else lambdas
+        if fit_lambdas:
+            self.betas, self.lambdas = self.estimate_lambdas(
+                prices=prices, cash_flows=cash_flows, dc=self.dc, ref_date=self.ref_date
+            )
+            return
         self.betas = self.estimate_betas(
             prices=prices,
             cash_flows=cash_flows,
@@ -132,6 +237,58 @@ class NelsonSiegelSvensson:
         y += betas[3] * g2(ytm)
         return y
 
+    @staticmethod
+    def factor_loadings(ytm, lambdas=ANBIMA_LAMBDAS) -> np.ndarray:
+        """Loadings of the four betas, shape ``ytm.shape + (4,)``, so that
+        ``rate_for_ytm(betas, lambdas, ytm) == factor_loadings(ytm) @ betas``."""
+        ytm = np.asarray(ytm, dtype=float)
+        e1, e2 = np.exp(-lambdas[0] * ytm), np.exp(-lambdas[1] * ytm)
+        f1 = (1.0 - e1) / (lambdas[0] * ytm)
+        g1 = (1.0 - e2) / (lambdas[1] * ytm)
+        return np.stack([np.ones_like(f1 * g1), f1, f1 - e1, g1 - e2], axis=-1)
+
+    @staticmethod
+    def cash_flow_grid(
+        cash_flows: Collection[pd.Series], dc: DayCounts, ref_date: Date
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(bonds x flows) year fractions and amounts, plus the duration
+        weights of `price_errors`. Built once per ref date."""
+        pay_dates, idx, amounts = cash_flow_matrix(cash_flows)
+        ytm = year_fractions(dc, ref_date, pay_dates)[idx]
+        ytm = np.where(amounts != 0.0, ytm, 1.0)  # padding: any t > 0 works
+        weights = 1.0 / np.where(amounts != 0.0, ytm, -np.inf).max(axis=1)
+        return ytm, amounts, weights
+
+    @staticmethod
+    def _objective(x, prices, ytm, amounts, weights, lambdas, lambda_grad=False):
+        """Weighted squared relative price errors and their gradient in x
+        (extended with the two lambdas when `lambda_grad` is set)."""
+        loadings = NelsonSiegelSvensson.factor_loadings(ytm, lambdas)
+        y = loadings @ x
+        disc = (1.0 + y) ** -ytm
+        theo = (amounts * disc).sum(axis=1)
+
+        rel = (prices - theo) / prices
+        value = (weights * rel ** 2).sum()
+
+        # d theo / d x = sum_c cf * (-t) * (1 + y)^(-t - 1) * loadings
+        d_disc = amounts * -ytm * disc / (1.0 + y)
+        d_theo = np.einsum("bc,bck->bk", d_disc, loadings)
+        d_value = -2.0 * weights * rel / prices
+        grad = d_value @ d_theo
+        if lambda_grad:
+            # d f1 / d l1 = (e1 - f1) / l1 and d e1 / d l1 = -t * e1 (same in l2)
+            l1, l2 = lambdas
+            e1, e2 = np.exp(-l1 * ytm), np.exp(-l2 * ytm)
+            df1 = (e1 - loadings[..., 1]) / l1
+            dg1 = (e2 - (1.0 - e2) / (l2 * ytm)) / l2
+            dy = np.stack([
+                x[1] * df1 + x[2] * (df1 + ytm * e1),
+                x[3] * (dg1 + ytm * e2),
+            ], axis=-1)
+            grad = np.concatenate([grad, d_value @ np.einsum("bc,bck->bk", d_disc, dy)])
+        return value, grad
+
     # --- pricing -----------------------------------------------------------
 
     def bond_price(
@@ -147,12 +304,9 @@ class NelsonSiegelSvensson:
         betas = betas if betas is not None else self.betas
         lambdas = lambdas if lambdas is not None else self.lambdas
 
-        pv = 0.0
-        for d, dpay in cf.items():
-            ytm = dc.tf(ref_date, d)
-            y = self.rate_for_ytm(betas=betas, lambdas=lambdas, ytm=ytm)
-            pv += dpay / ((1.0 + y) ** ytm)
-        return pv
+        ytm = year_fractions(dc, ref_date, pd.DatetimeIndex(cf.index).values)
+        y = self.factor_loadings(ytm, lambdas) @ betas
+        return float((cf.values / ((1.0 + y) ** ytm)).sum())
 
     def price_errors(
         self,
@@ -166,18 +320,35 @@ class NelsonSiegelSvensson:
         assert len(prices) == len(cash_flows), "Not the same number of prices and CFs!"
         dc = dc or self.dc
         ref_date = ref_date or self.ref_date
+        betas = betas if betas is not None else self.betas
+        lambdas = lambdas if lambdas is not None else self.lambdas
 
-        pe = 0.0
-        for p, cf in zip(prices, cash_flows):
-            theo = self.bond_price(
-                cf, dc, ref_date=ref_date, betas=betas, lambdas=lambdas
-            )
-            w = 1.0 / dc.tf(ref_date, max(cf.index))  # TODO: duration weight
-            pe += w * ((p - theo) / p) ** 2.0
+        ytm, amounts, weights = self.cash_flow_grid(cash_flows, dc, ref_date)
+        pe, _ = self._objective(
+            betas, np.asarray(prices, dtype=float), ytm, amounts, weights, lambdas
+        )
         return pe
 
     # --- parameter estimation ---------------------------------------------
 
+    @classmethod
+    def minimize(
+        cls,
+        prices: Collection[float],
+        cash_flows: Collection[pd.Series],
+        dc: DayCounts,
+        ref_date: Date,
+        lambdas: np.array = ANBIMA_LAMBDAS,
+        x0: Optional[np.array] = None,
+    ) -> opt.OptimizeResult:
+        """Raw SLSQP result of the beta fit, starting from `x0` (or zeros)."""
+        assert len(prices) == len(cash_flows), "Not the same number of prices and CFs!"
+        ytm, amounts, weights = cls.cash_flow_grid(cash_flows, dc, ref_date)
+        args = (np.asarray(prices, dtype=float), ytm, amounts, weights, lambdas)
+        x0 = np.zeros(4) if x0 is None else np.asarray(x0, dtype=float)
+
+        return opt.minimize(cls._objective, x0, args=args, jac=True, method="SLSQP")
+
     def estimate_betas(
         self,
         prices: Union[float, Collection[float]],
@@ -185,21 +356,301 @@ class NelsonSiegelSvensson:
         dc: Optional[DayCounts],
         ref_date: Optional[Date],
         lambdas: Optional[np.array],
+        x0: Optional[np.array] = None,
     ):
-        obj = lambda x: self.price_errors(
-            prices=prices,
-            cash_flows=cash_flows,
-            dc=dc,
-            ref_date=ref_date,
-            betas=x,
-            lambdas=lambdas,
-        )
-
-        res = opt.minimize(obj, np.zeros(4), method="SLSQP")
+        res = self.minimize(prices, cash_flows, dc, ref_date, lambdas, x0=x0)
         if res.status != 0:
             raise ArithmeticError(f"Optimization failed: {res.message}")
         return res.x
 
+    @classmethod
+    def estimate_lambdas(
+        cls,
+        prices: Collection[float],
+        cash_flows: Collection[pd.Series],
+        dc: DayCounts,
+        ref_date: Date,
+        grid: Optional[Collection[Tuple[float, float]]] = None,
+        refine: bool = True,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Joint (betas, lambdas) fit: linear grid search, then a refinement.
+
+        Each bond is reduced to its flat yield at its Macaulay duration. For
+        every (l1, l2) of `grid` the betas are then the weighted linear least
+        squares solution on those yields, all grid points solved in one
+        batched SVD (the minimum-norm solution `np.linalg.lstsq` gives, which
+        stays stable when the loadings are nearly collinear). The best grid
+        point seeds a 6-parameter SLSQP fit on the price errors, with the
+        analytic gradient (skipped with ``refine=False``).
+        """
+        assert len(prices) == len(cash_flows), "Not the same number of prices and CFs!"
+        prices = np.asarray(prices, dtype=float)
+        ytm, amounts, weights = cls.cash_flow_grid(cash_flows, dc, ref_date)
+        grid = LAMBDA_GRID if grid is None else tuple(map(tuple, grid))
+
+        yields, durations = _flat_yields(prices, ytm, amounts)
+        X = _grid_loadings(grid, durations) * np.sqrt(weights)[:, None]
+        b = yields * np.sqrt(weights)
+        # Least squares for every grid point at once: pinv of (G, n, 4) is SVD based
+        betas = np.einsum("gkn,n->gk", np.linalg.pinv(X), b)
+        sse = ((np.einsum("gnk,gk->gn", X, betas) - b) ** 2).sum(axis=1)
+
+        best = int(np.nanargmin(sse))
+        x0 = np.concatenate([betas[best], grid[best]])
+        if not refine:
+            return x0[:4], x0[4:]
+
+        def objective(x):
+            return cls._objective(
+                x[:4], prices, ytm, amounts, weights, x[4:], lambda_grad=True
+            )
+
+        bounds = [(None, None)] * 4 + [LAMBDA_BOUNDS] * 2
+        # The objective is a sum of squared relative errors (~1e-8 near a
+        # good fit), far below SLSQP's default absolute ftol of 1e-6
+        res = opt.minimize(
+            objective, x0, jac=True, method="SLSQP", bounds=bounds,
+            options={"ftol": 1e-14, "maxiter": 500},
+        )
+        if not res.success or res.fun > objective(x0)[0]:
+            return x0[:4], x0[4:]
+        return res.x[:4], res.x[4:]
+
+
+# ---------------------------------------------------------------------------
+# Lambda grid helpers
+# ---------------------------------------------------------------------------
+
+LAMBDA_BOUNDS = (1e-2, 10.0)
+LAMBDA_GRID = tuple(
+    (float(l1), float(l2))
+    for l1 in np.geomspace(0.1, 5.0, 15)
+    for l2 in np.geomspace(0.05, 3.0, 15)
+    if l1 > l2
+)
+
+
+# Fixed maturity grid (weekly, 60 years) on which the loadings are cached
+LOADINGS_STEP = 1.0 / 52
+LOADINGS_MATURITIES = np.arange(0.0, 60.0 + LOADINGS_STEP, LOADINGS_STEP)
+
+
+@lru_cache(maxsize=1024)
+def _point_loadings(l1: float, l2: float) -> np.ndarray:
+    """NSS loadings of one grid point on LOADINGS_MATURITIES, shape (M, 4).
+
+    Keyed on the lambdas only, so every date and bond set reuses them.
+    """
+    with np.errstate(invalid="ignore"):
+        loadings = NelsonSiegelSvensson.factor_loadings(LOADINGS_MATURITIES, (l1, l2))
+    loadings[0] = (1.0, 1.0, 0.0, 0.0)  # limit at t -> 0
+    loadings.setflags(write=False)
+    return loadings
+
+
+def _grid_loadings(
+    grid: Tuple[Tuple[float, float], ...], ytm: np.ndarray
+) -> np.ndarray:
+    """NSS loadings at `ytm` for every grid point, shape (G, n, 4).
+
+    Linear interpolation of the cached per-point loadings; the loadings are
+    smooth, so on a weekly grid the error is far below the fit tolerance.
+    """
+    t = np.clip(np.asarray(ytm, dtype=float), 0.0, LOADINGS_MATURITIES[-1])
+    i = np.minimum((t / LOADINGS_STEP).astype(int), len(LOADINGS_MATURITIES) - 2)
+    w = ((t - LOADINGS_MATURITIES[i]) / LOADINGS_STEP)[:, None]
+    return np.stack([
+        (1.0 - w) * L[i] + w * L[i + 1]
+        for L in (_point_loadings(l1, l2) for l1, l2 in grid)
+    ])
+
+
+def _flat_yields(
+    prices: np.ndarray, ytm: np.ndarray, amounts: np.ndarray, tol: float = 1e-12
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Flat yield and Macaulay duration of each bond (vectorized Newton)."""
+    y = np.full(len(prices), 0.1)
+    for _ in range(50):
+        disc = amounts * (1.0 + y[:, None]) ** -ytm
+        pv = disc.sum(axis=1)
+        dpv = -(disc * ytm).sum(axis=1) / (1.0 + y)
+        step = (pv - prices) / dpv
+        y -= step
+        if np.abs(step).max() < tol:
+            break
+    disc = amounts * (1.0 + y[:, None]) ** -ytm
+    return y, (disc * ytm).sum(axis=1) / disc.sum(axis=1)
+
+
+# ---------------------------------------------------------------------------
+# NSS history (one fit per reference date)
+# ---------------------------------------------------------------------------
+
+NSS_HISTORY_COLUMNS = [
+    "b1", "b2", "b3", "b4", "l1", "l2",
+    "n_bonds", "success", "status", "nit", "fun", "message",
+]
+
+
+def _fit_nss_chunk(
+    ref_dates: Collection[pd.Timestamp],
+    prices: pd.DataFrame,
+    cash_flows: Mapping[str, pd.Series],
+    day_count_convention: str,
+    calendar: str,
+    lambdas: np.ndarray,
+    x0: Optional[np.ndarray],
+) -> pd.DataFrame:
+    """Fit consecutive dates, each one warm-started from the last success."""
+    dc = DayCounts(dc=day_count_convention, calendar=calendar)
+    rows = []
+    for ref_date in ref_dates:
+        if ref_date not in prices.index:
+            rows.append(dict(zip(["l1", "l2"], lambdas), n_bonds=0, success=False,
+                             status=-1, message="No prices for ref_date"))
+            continue
+        quotes = prices.loc[ref_date].dropna()
+        bond_prices, bond_flows = [], []
+        for bond, price in quotes.items():
+            cf = cash_flows.get(bond)
+            if cf is None:
+                continue
+            cf = cf[cf.index > ref_date]
+            if len(cf):
+                bond_prices.append(float(price))
+                bond_flows.append(cf)
+
+        row = dict(zip(["l1", "l2"], lambdas), n_bonds=len(bond_prices))
+        if not bond_prices:
+            row.update(success=False, status=-1, message="No live bonds")
+        else:
+            res = NelsonSiegelSvensson.minimize(
+                bond_prices, bond_flows, dc, ref_date, lambdas, x0=x0
+            )
+            row.update(dict(zip(["b1", "b2", "b3", "b4"], res.x)))
+            row.update(
+                success=bool(res.success), status=int(res.status),
+                nit=int(res.nit), fun=float(res.fun), message=str(res.message),
+            )
+            if res.success:
+                x0 = res.x
+        rows.append(row)
+
+    return pd.DataFrame(
+        rows, index=pd.DatetimeIndex(ref_dates, name="ref_date"),
+        columns=NSS_HISTORY_COLUMNS,
+    )
+
+
+def fit_nss_history(
+    prices: pd.DataFrame,
+    cash_flows: Mapping[str, pd.Series],
+    ref_dates: Optional[Collection[Date]] = None,
+    day_count_convention: str = "bus/252",
+    calendar: str = "cdr_anbima",
+    lambdas: np.ndarray = ANBIMA_LAMBDAS,
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+    checkpoint: Optional[Union[str, Path]] = None,
+) -> pd.DataFrame:
+    """NSS betas for every reference date of a price panel.
+
+    Args:
+        prices (pd.DataFrame): Dirty prices, ref dates x bond ids.
+        cash_flows (dict): Bond id -> pd.Series of amounts indexed by date.
+            Only flows after each ref date are priced.
+        ref_dates: Dates to fit (default: every row of `prices`). Dates
+            missing from `prices` are returned as failed fits.
+        lambdas (np.ndarray): Fixed decay parameters.
+        workers (int): Processes; dates are split into contiguous chunks.
+        chunk_size (int): Dates per chunk (default: an even split).
+        checkpoint (str | Path): CSV of successful fits, appended after every
+            finished chunk; dates already in it are not fitted again. Failed
+            dates go to ``<checkpoint stem>.failed.csv`` instead and are
+            retried on the next run.
+
+    Returns:
+        pd.DataFrame: Indexed by ref_date with the betas, the lambdas and the
+        optimizer diagnostics (``NSS_HISTORY_COLUMNS``).
+
+    Within a chunk each date starts from the previous date's solution, which
+    is usually a few iterations away. The first date of a chunk starts from
+    the last fit before it: the previous chunk's result when run serially.
+    With several workers the chunks run at the same time, so the last date of
+    each previous chunk is fitted first in a short serial pass (each one
+    warm-started from the one before) and seeds the next chunk; a closer
+    checkpointed fit is used instead when there is one.
+    """
+    ref_dates = pd.DatetimeIndex(prices.index if ref_dates is None else ref_dates)
+    ref_dates = ref_dates.sort_values()
+    lambdas = np.asarray(lambdas, dtype=float)
+
+    done = pd.DataFrame(
+        columns=NSS_HISTORY_COLUMNS, index=pd.DatetimeIndex([], name="ref_date")
+    )
+    if checkpoint is not None and Path(checkpoint).exists():
+        done = pd.read_csv(checkpoint, index_col="ref_date", parse_dates=["ref_date"])
+        # Older checkpoints also held failed dates: fit them again
+        done = done[done["success"].astype(bool)]
+    todo = ref_dates[~ref_dates.isin(done.index)]
+
+    if len(todo):
+        workers = max(1, int(workers))
+        chunk_size = chunk_size or -(-len(todo) // workers)
+        chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+        fitted = done
+        betas = ["b1", "b2", "b3", "b4"]
+
+        def last_fit(before):
+            """(date, betas) of the last successful fit before `before`."""
+            prior = fitted[fitted.index < before]
+            if not len(prior):
+                return None, None
+            return prior.index[-1], prior.iloc[-1][betas].to_numpy(dtype=float)
+
+        args = (prices, cash_flows, day_count_convention, calendar, lambdas)
+        if workers == 1:
+            frames = []
+            for chunk in chunks:
+                frame = _fit_nss_chunk(chunk, *args, last_fit(chunk[0])[1])
+                frame = _save_chunk(frame, checkpoint)
+                fitted = pd.concat([fitted, frame[frame["success"].astype(bool)]])
+                frames.append(frame)
+        else:
+            seeds = [last_fit(chunks[0][0])[1]]
+            for previous, chunk in zip(chunks, chunks[1:]):
+                date, x0 = last_fit(chunk[0])
+                if date is None or date < previous[-1]:
+                    boundary = _fit_nss_chunk(previous[-1:], *args, seeds[-1])
+                    ok = boundary[boundary["success"].astype(bool)]
+                    x0 = ok[betas].iloc[0].to_numpy(dtype=float) if len(ok) else seeds[-1]
+                seeds.append(x0)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_fit_nss_chunk, c, *args, x0) for c, x0 in zip(chunks, seeds)
+                ]
+                frames = [_save_chunk(f.result(), checkpoint) for f in as_completed(futures)]
+        done = pd.concat([done] + frames) if len(done) else pd.concat(frames)
+
+    return done.loc[done.index.isin(ref_dates)].sort_index()
+
+
+def _save_chunk(frame: pd.DataFrame, checkpoint: Optional[Union[str, Path]]) -> pd.DataFrame:
+    """Append successes to `checkpoint` and failures to its ``.failed.csv``."""
+    if checkpoint is not None:
+        success = frame["success"].astype(bool)
+        path = Path(checkpoint)
+        for rows, target in ((frame[success], path), (frame[~success], failures_path(path))):
+            if len(rows):
+                rows.to_csv(target, mode="a", header=not target.exists())
+    return frame
+
+
+def failures_path(checkpoint: Union[str, Path]) -> Path:
+    """Where fit_nss_history logs the dates that failed (``nss.csv`` -> ``nss.failed.csv``)."""
+    checkpoint = Path(checkpoint)
+    return checkpoint.with_name(f"{checkpoint.stem}.failed{checkpoint.suffix}")
+
 
 # ---------------------------------------------------------------------------
 # Generic bootstrap from bond cash-flows
@@ -242,6 +693,28 @@ class CurveBootstrap:
 
         self.bootstrap(cash_flows=cash_flows, rates=rates, prices=prices)
 
+    # The curve lives in two arrays (year fractions, rates) that only grow
+    # at the long end; `zero_curve` is a pd.Series view built on demand.
+
+    @property
+    def zero_curve(self) -> pd.Series:
+        return pd.Series(self._rates[: self._size], index=self._knots[: self._size])
+
+    @zero_curve.setter
+    def zero_curve(self, curve: pd.Series):
+        curve = _clean_curve(curve)
+        self._knots = curve.index.to_numpy(dtype=float)
+        self._rates = curve.to_numpy(dtype=float)
+        self._size = len(curve)
+
+    def _append_knot(self, t: float, rate: float):
+        if self._size == len(self._knots):  # grow by doubling
+            capacity = max(2 * self._size, 8)
+            self._knots = np.resize(self._knots, capacity)
+            self._rates = np.resize(self._rates, capacity)
+        self._knots[self._size], self._rates[self._size] = t, rate
+        self._size += 1
+
     # ------------------------------------------------------------------ #
     # private helpers                                                    #
     # ------------------------------------------------------------------ #
@@ -277,54 +750,26 @@ class CurveBootstrap:
 
     # ------------------------- PV helpers ------------------------------- #
 
-    @staticmethod
-    def _bond_pv_for_rate(
-        expanded_rate: float,
-        zero_curve: pd.Series,
-        bond_cash_flows: pd.Series,
-        dc: Optional[DayCounts] = None,
-        ref_date: Optional[Date] = None,
-    ) -> float:
-        zero_curve_end = max(zero_curve.index)
-        ytm = dc.tf(ref_date, max(bond_cash_flows.index))
-        expanded_point = pd.Series([expanded_rate], index=[ytm])
-        zero_curve = pd.concat([zero_curve, expanded_point]).sort_index()
-
-        pv = 0.0
-        for d, c in bond_cash_flows.items():
-            t = dc.tf(ref_date, d)
-            if t > zero_curve_end:
-                y = flat_forward_interpolation(t, zero_curve, dc, ref_date)
-                pv += c / ((1.0 + y) ** t)
-        return pv
-
-    @staticmethod
     def _bond_strip(
-        zero_curve: pd.Series,
-        bond_cash_flows: pd.Series,
-        dc: Optional[DayCounts] = None,
-        ref_date: Optional[Date] = None,
+        self,
+        t: np.ndarray,
+        amounts: np.ndarray,
         rate: Optional[float] = None,
         price: Optional[float] = None,
     ) -> Tuple[float, float, float]:
+        """Target price, PV of the flows inside the curve and the maturity."""
         assert rate is not None or price is not None, "Need rate or price!"
 
-        maturity = dc.tf(ref_date, max(bond_cash_flows.index))
-        zero_curve_end = max(zero_curve.index)
-        assert zero_curve_end <= maturity, "Bond maturity < zero-curve end!"
+        maturity = t.max()
+        knots, rates = self._knots[: self._size], self._rates[: self._size]
+        assert knots[-1] <= maturity, "Bond maturity < zero-curve end!"
 
         if price is None:
-            price = sum(
-                c / ((1.0 + rate) ** dc.tf(ref_date, d))
-                for d, c in bond_cash_flows.items()
-            )
+            price = float((amounts * (1.0 + rate) ** -t).sum())
 
-        pv_known = 0.0
-        for d, c in bond_cash_flows.sort_index().items():
-            t = dc.tf(ref_date, d)
-            if t <= zero_curve_end:
-                y = flat_forward_interpolation(t, zero_curve, dc, ref_date)
-                pv_known += c / ((1.0 + y) ** t)
+        known = t <= knots[-1]
+        log_df = flat_forward_log_discount(t[known], knots, rates)
+        pv_known = float((amounts[known] * np.exp(log_df)).sum())
 
         return price, pv_known, maturity
 
@@ -332,35 +777,31 @@ class CurveBootstrap:
 
     def _expand_zero_curve(
         self,
-        bond_cash_flows: pd.Series,
+        t: np.ndarray,
+        amounts: np.ndarray,
         rate: Optional[float] = None,
         price: Optional[float] = None,
     ):
         """
-        Add one point to the zero-curve so the PV of `bond_cash_flows`
-        matches either `price` or `rate`.
+        Add one point to the zero-curve so the PV of the bond (year
+        fractions `t`, `amounts`) matches either `price` or `rate`.
 
         Uses Brent bracketing root-finder; falls back to bounded SLSQP when
         the sign of the price gap cannot be bracketed within [-5 %, 100 %].
         """
-        price, pv_known, ytm = self._bond_strip(
-            zero_curve=self.zero_curve,
-            bond_cash_flows=bond_cash_flows,
-            dc=self.dc,
-            ref_date=self.ref_date,
-            rate=rate,
-            price=price,
-        )
+        price, pv_known, ytm = self._bond_strip(t, amounts, rate=rate, price=price)
+
+        # Flows past the curve end interpolate between its last knot and the
+        # new one at `ytm`: log-discount = w1 * L_end + w2 * (-ytm * log(1+r))
+        t_end, r_end = self._knots[self._size - 1], self._rates[self._size - 1]
+        tail = t > t_end
+        c_tail = amounts[tail]
+        w2 = (t[tail] - t_end) / (ytm - t_end)
+        fixed = (1.0 - w2) * (-t_end * np.log1p(r_end))
+        w2 = w2 * -ytm
 
         def price_gap(r: float) -> float:
-            pv_tail = self._bond_pv_for_rate(
-                expanded_rate=r,
-                zero_curve=self.zero_curve,
-                bond_cash_flows=bond_cash_flows,
-                dc=self.dc,
-                ref_date=self.ref_date,
-            )
-            return (pv_tail + pv_known) - price
+            return (c_tail * np.exp(fixed + w2 * np.log1p(r))).sum() + pv_known - price
 
         lower, upper = -0.05, 1.00  # generous bracket: -5 % … 100 %
         try:
@@ -368,18 +809,17 @@ class CurveBootstrap:
         except (ValueError, RuntimeError):
             # Fallback: minimise squared error, bounded at r >= 0
             res = opt.minimize(
-                lambda x: price_gap(x) ** 2,
-                self.zero_curve.iloc[-1],
+                lambda x: price_gap(x[0]) ** 2,
+                r_end,
                 method="SLSQP",
                 bounds=[(0.0, None)],
                 options={"ftol": 1e-12, "maxiter": 1000},
             )
             if res.status != 0:
                 raise ArithmeticError(f"Bootstrap failed: {res.message}")
-            root = float(res.x)
+            root = float(res.x[0])
 
-        expanded_point = pd.Series([root], index=[ytm])
-        return pd.concat([self.zero_curve, expanded_point]).sort_index()
+        self._append_knot(ytm, root)
 
     # ---------------------------- main loop ----------------------------- #
 
@@ -390,20 +830,124 @@ class CurveBootstrap:
         prices: Optional[Collection[float]] = None,
     ):
         assert rates is not None or prices is not None, "Need rates or prices!"
-        tmax = max(self.zero_curve.index)
+        tmax = self._knots[self._size - 1]
+
+        # Year fractions once per unique payment date for the whole strip
+        pay_dates, idx, amounts = cash_flow_matrix(cash_flows)
+        yf = year_fractions(self.dc, self.ref_date, pay_dates)
 
         for i, cf in enumerate(cash_flows):
             if len(cf) == 1:
                 continue  # already dealt with zero-coupon bonds
-            maturity = self.dc.tf(self.ref_date, max(cf.index))
-            if maturity <= tmax:
+            t, c = yf[idx[i, : len(cf)]], amounts[i, : len(cf)]
+            if t.max() <= tmax:
                 continue  # maturity already covered by existing curve
 
             if prices is not None and (rates is None or rates[i] is None):
-                new_curve = self._expand_zero_curve(cf, rate=None, price=prices[i])
+                self._expand_zero_curve(t, c, rate=None, price=prices[i])
             elif rates is not None and (prices is None or prices[i] is None):
-                new_curve = self._expand_zero_curve(cf, rate=rates[i], price=None)
+                self._expand_zero_curve(t, c, rate=rates[i], price=None)
             else:
                 continue  # both given (warning issued earlier)
 
-            self.zero_curve = new_curve
+
+# ---------------------------------------------------------------------------
+# DI1 futures bootstrap (B3)
+# ---------------------------------------------------------------------------
+
+
+class DIFuturesBootstrap:
+    """Zero curves for a whole DI1 history in one vectorized pass.
+
+    A DI1 contract pays its face value at maturity, so each quote is already
+    a zero rate: ``PU = 100,000 / (1 + r) ** (du / 252)`` with `du` the B3
+    business days from the observation date (included) to maturity
+    (excluded), i.e. the number of daily DI accruals left. There is nothing
+    to strip, only exact day counts to compute; `curve` hands one date to
+    `CurveBootstrap` for interpolation.
+
+    Args:
+        quotes (pd.DataFrame): Columns ``obs_date``, ``maturity`` and the
+            `quote` column, one row per (date, contract). Without a
+            ``maturity`` column the expiries are resolved from the generic
+            tickers in ``generic_ticker_id`` (see `contracts`).
+        quote (str): ``"rate"`` (percent, see `rate_scale`) or ``"pu"``.
+        calendar (str): Business-day calendar for `du`.
+        rate_scale (float): Divisor that turns rate quotes into decimals.
+
+    Attributes:
+        zero_curves (pd.DataFrame): obs_date, maturity, du, tenor (du/252)
+            and rate (decimal, 252-day compounding), sorted by date/tenor.
+    """
+
+    PU_FACE = 100_000.0
+
+    def __init__(
+        self,
+        quotes: pd.DataFrame,
+        quote: str = "rate",
+        calendar: str = "cdr_b3_settlement",
+        rate_scale: float = 100.0,
+    ):
+        if quote not in ("rate", "pu"):
+            raise ValueError(f"Unknown quote type {quote!r}, use 'rate' or 'pu'")
+        self.calendar = calendar
+        self.dc = DayCounts(dc="bus/252", calendar=calendar)
+
+        if "maturity" not in quotes.columns:
+            resolved = resolve_generic_tickers(
+                quotes["generic_ticker_id"], quotes["obs_date"], calendar=calendar
+            )
+            quotes = quotes.assign(maturity=resolved["maturity"].values)
+
+        obs = pd.to_datetime(quotes["obs_date"]).to_numpy(dtype="datetime64[D]")
+        mty = pd.to_datetime(quotes["maturity"]).to_numpy(dtype="datetime64[D]")
+        values = pd.to_numeric(quotes[quote], errors="coerce").to_numpy(dtype=float)
+
+        du = np.busday_count(obs, mty, busdaycal=self.dc.buscore)
+        tenor = du / self.dc.dib()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if quote == "pu":
+                rate = (self.PU_FACE / values) ** (1.0 / tenor) - 1.0
+            else:
+                rate = values / rate_scale
+
+        curves = pd.DataFrame(
+            {"obs_date": obs.astype("datetime64[ns]"),
+             "maturity": mty.astype("datetime64[ns]"),
+             "du": du, "tenor": tenor, "rate": rate}
+        )
+        curves = curves[(curves["du"] > 0) & np.isfinite(curves["rate"])]
+        curves = curves.drop_duplicates(["obs_date", "maturity"], keep="last")
+        self.zero_curves = curves.sort_values(["obs_date", "du"]).reset_index(drop=True)
+
+    @property
+    def obs_dates(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.zero_curves["obs_date"].unique())
+
+    def curve(self, obs_date: Date) -> CurveBootstrap:
+        """Zero curve of one date as a `CurveBootstrap` (e.g. `rate_for_date`)."""
+        obs_date = pd.Timestamp(obs_date)
+        rows = self.zero_curves[self.zero_curves["obs_date"] == obs_date]
+        if rows.empty:
+            raise KeyError(f"No DI1 quotes on {obs_date:%Y-%m-%d}")
+
+        # One zero-coupon flow per contract: the bootstrap keeps the quotes as
+        # knots, with the tenors recomputed on the same calendar
+        return CurveBootstrap(
+            cash_flows=[pd.Series([self.PU_FACE], index=[m]) for m in rows["maturity"]],
+            rates=rows["rate"].tolist(),
+            day_count_convention="bus/252",
+            calendar=self.calendar,
+            ref_date=obs_date,
+        )
+
+    def to_surface(self, rate_scale: float = 100.0) -> pd.DataFrame:
+        """The history in the ``load_inputs`` surface layout (percent yields)."""
+        curves = self.zero_curves
+        return pd.DataFrame(
+            {"obs_date": curves["obs_date"],
+             "maturity": curves["maturity"],
+             "yield": curves["rate"] * rate_scale,
+             "tenor": curves["tenor"]}
+        )
@@ -1,21 +1,106 @@
 # utils/file_io.py
+import gzip
+import importlib.util
+import os
+import threading
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+
 import pandas as pd
 
+@contextmanager
+def atomic_write(path):
+    """
+    Caminho temporário no mesmo diretório de `path`, renomeado para `path` ao
+    final do bloco: leitores (Flask, outro processo do pipeline) nunca veem um
+    arquivo pela metade. Se o bloco falhar, o temporário é removido.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+def read_sheet(path, sheet_name):
+    """Lê a aba `sheet_name` de um Excel, ou o arquivo inteiro se for `.parquet`."""
+    if Path(path).suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_excel(path, sheet_name=sheet_name)
+
+# Extensões das variantes pré-comprimidas servidas pelo app.py (Content-Encoding)
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+# O aviso de brotli ausente sai uma vez por processo, não a cada artefato
+_brotli_warned = False
+# Qualidade 11 no plotly.js (4,8 MB) leva ~12 s para ganhar ~10% sobre a 9
+# (~0,4 s); acima de BROTLI_MAX_Q11_BYTES usa-se a 9
+BROTLI_MAX_Q11_BYTES = 1_000_000
+
+def brotli_available() -> bool:
+    return importlib.util.find_spec("brotli") is not None
+
+def parquet_available() -> bool:
+    """True se o pandas tem um engine Parquet (pyarrow ou fastparquet) instalado."""
+    return any(importlib.util.find_spec(m) is not None for m in ("pyarrow", "fastparquet"))
+
+def precompress(path) -> list:
+    """
+    Grava `path.gz` e, se o pacote `brotli` estiver instalado, `path.br` ao lado
+    do original. Variantes mais novas que o original não são refeitas.
+    Devolve os caminhos das variantes.
+    """
+    global _brotli_warned
+    path = Path(path)
+    data = None
+    variants = []
+    for encoding, suffix in ENCODINGS.items():
+        if encoding == "br" and not brotli_available():
+            if not _brotli_warned:
+                _brotli_warned = True
+                warnings.warn("brotli não instalado; gravando só a variante gzip.")
+            continue
+        target = path.with_name(path.name + suffix)
+        variants.append(target)
+        if target.is_file() and target.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            continue
+        data = path.read_bytes() if data is None else data
+        if encoding == "br":
+            import brotli
+            compressed = brotli.compress(data, quality=11 if len(data) <= BROTLI_MAX_Q11_BYTES else 9)
+        else:
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        with atomic_write(target) as tmp:
+            tmp.write_bytes(compressed)
+    return variants
+
+def read_surface(path, start=None, end=None) -> pd.DataFrame:
+    """Superfície gravada por `write_surface` (datas x tenores), opcionalmente num intervalo de datas."""
+    df = pd.read_csv(path, index_col=0, parse_dates=[0])
+    return df.loc[start:end]
+
+def write_surface(df: pd.DataFrame, path) -> Path:
+    with atomic_write(path) as tmp:
+        df.to_csv(tmp, index_label="date")
+    return Path(path)
+
 def load_di_futures(path):
-    df = pd.read_excel(path, sheet_name="periods_values_only")
+    df = read_sheet(path, "periods_values_only")
     df["End of Month date"] = pd.to_datetime(df["End of Month date"])
     df["Settlement date"] = pd.to_datetime(df["Settlement date"])
     return df
 
 def load_yield_surface(path):
-    df = pd.read_excel(path, sheet_name="ya_values_only")
+    df = read_sheet(path, "ya_values_only")
     df.rename(columns={df.columns[0]: "OBS_DATE"}, inplace=True)
     df["OBS_DATE"] = pd.to_datetime(df["OBS_DATE"])
     df = df.set_index("OBS_DATE").sort_index()
     return df
 
 def load_corp_bond_data(path):
-    df = pd.read_excel(path, sheet_name="db_values_only")
+    df = read_sheet(path, "db_values_only")
     df = df[~df['CLASSIFICATION_LEVEL_4_NAME'].str.startswith("Government", na=False)]
     df = df[~df['industry_sector'].isin(['Financial'])]
     df = df[df['CPN_TYP'].isin(['FIXED'])]
@@ -28,9 +113,9 @@ def load_corp_bond_data(path):
     df["id"] = df["id"].astype(str).str.strip()
     return df
 
-def load_inputs(config):
-    # Load DI curve data from new consolidated file
-    curve_df = pd.read_excel(config["HIST_CURVE_PATH"], sheet_name="only_values")
+def load_di_surface(path):
+    """Curva DI (aba `only_values`) no formato long: obs_date, generic_ticker_id, yield, tenor."""
+    curve_df = read_sheet(path, "only_values")
     curve_df["Curve date"] = pd.to_datetime(curve_df["Curve date"])
 
     surface = curve_df.rename(columns={
@@ -48,7 +133,11 @@ def load_inputs(config):
     surface = surface.dropna(subset=["yield", "tenor"])
     surface = surface[surface["yield"] > 0]
     surface["curve_id"] = surface["generic_ticker_id"] + surface["obs_date"].dt.strftime("%Y%m%d")
-    surface = surface.drop_duplicates(subset=["curve_id"], keep="last")
+    return surface.drop_duplicates(subset=["curve_id"], keep="last")
+
+def load_inputs(config):
+    # Load DI curve data from new consolidated file (Excel or Parquet)
+    surface = load_di_surface(config["HIST_CURVE_PATH"])
 
     # Load corporate bond metadata
     corp_data = load_corp_bond_data(config["CORP_PATH"])
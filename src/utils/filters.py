@@ -1,6 +1,8 @@
 # utils/filters.py
 import pandas as pd
 
+from calendars.compiled import compiled_calendar, is_business_day
+
 def filter_corporate_universe(df: pd.DataFrame) -> pd.DataFrame:
     """
     Aplica filtros-padrão para selecionar o universo de bonds corporativos:
@@ -20,3 +22,27 @@ def filter_corporate_universe(df: pd.DataFrame) -> pd.DataFrame:
     df["MATURITY"] = pd.to_datetime(df["MATURITY"])
     df["id"] = df["id"].astype(str).str.strip()
     return df
+
+
+def flag_non_business_days(df: pd.DataFrame, date_col: str = None, calendar: str = "cdr_b3_settlement") -> pd.DataFrame:
+    """
+    Retorna as linhas de `df` cuja data não é dia útil no calendário indicado
+    (ex.: curvas DI ou yields YAS carimbados em feriados ou fins de semana).
+
+    Args:
+        df (pd.DataFrame): Dados a verificar
+        date_col (str): Coluna de datas; se None, usa o índice
+        calendar (str): Calendário (default B3)
+    """
+    dates = df.index if date_col is None else df[date_col]
+    return df[~is_business_day(dates, calendar)]
+
+
+def reindex_business_days(df: pd.DataFrame, calendar: str = "cdr_anbima") -> pd.DataFrame:
+    """
+    Reindexa `df` (índice de datas) na grade de dias úteis do calendário entre
+    a primeira e a última data: datas faltantes viram NaN e datas fora do
+    calendário são descartadas.
+    """
+    grid = compiled_calendar(calendar).bus_range(df.index.min(), df.index.max())
+    return df.reindex(pd.DatetimeIndex(grid, name=df.index.name))
@@ -1,8 +1,94 @@
 # utils/plotting.py
+from pathlib import Path
+
 import plotly.graph_objects as go
 import pandas as pd
 
-def plot_yield_curve_surface(df, source_text=""):
+from utils.file_io import atomic_write
+
+# plotly.js compartilhado por todas as páginas (em vez de ~3.5 MB embutidos em cada HTML)
+PLOTLY_JS = "plotly.min.js"
+
+# Acima disso as superfícies saem semanais ou mensais (última data de cada período);
+# a resolução diária fica disponível pela API (/api/surface/<nome>?start=&end=)
+LOD_MAX_DATES = 260
+
+# Na página do gráfico: com ?start=&end= na URL, troca a superfície decimada
+# pela resolução total do intervalo, lida da API
+_FULL_RESOLUTION_JS = """
+var query = new URLSearchParams(window.location.search);
+if (query.get("start") || query.get("end")) {
+    var gd = document.getElementById("{plot_id}");
+    fetch("%(api)s?" + query.toString()).then(function (r) { return r.json(); }).then(function (d) {
+        Plotly.restyle(gd, {x: [d.columns], y: [d.index], z: [d.values]}, [0]);
+        if (gd.data.length > 1 && gd.data[1].mode === "lines") {
+            Plotly.restyle(gd, {x: [d.index.map(function () { return d.columns[0]; })], y: [d.index],
+                                z: [d.values.map(function (row) { return row[0]; })]}, [1]);
+        }
+    });
+}
+"""
+
+
+def lod_frequency(dates, max_dates: int = LOD_MAX_DATES):
+    """
+    Período de amostragem para que o eixo de datas tenha no máximo `max_dates`
+    pontos: None (diário), "W" (semanal) ou "M" (mensal).
+    """
+    dates = pd.DatetimeIndex(dates)
+    if dates.nunique() <= max_dates:
+        return None
+    if dates.to_period("W").nunique() <= max_dates:
+        return "W"
+    return "M"
+
+
+def decimate_dates(df: pd.DataFrame, freq=None) -> pd.DataFrame:
+    """Última linha de cada período `freq` do índice de datas (datas reais, sem médias)."""
+    if freq is None:
+        return df
+    periods = pd.DatetimeIndex(df.index).to_period(freq)
+    return df[~periods.duplicated(keep="last")]
+
+
+def surface_payload(df: pd.DataFrame) -> dict:
+    """Superfície (datas x tenores) no formato JSON da API; NaN vira null."""
+    return {
+        "index": pd.DatetimeIndex(df.index).strftime("%Y-%m-%d").tolist(),
+        "columns": [str(c) for c in df.columns],
+        "values": df.astype(object).where(df.notna(), None).values.tolist(),
+    }
+
+
+def write_plotly_js(static_dir) -> Path:
+    """Grava o plotly.js do pacote em `static_dir` (só se mudou)."""
+    from plotly.offline import get_plotlyjs
+    path = Path(static_dir) / PLOTLY_JS
+    bundle = get_plotlyjs()
+    if not path.is_file() or path.read_text(encoding="utf-8") != bundle:
+        with atomic_write(path) as tmp:
+            tmp.write_text(bundle, encoding="utf-8")
+    return path
+
+
+def write_figure(fig: go.Figure, path, api: str = None) -> list:
+    """
+    Grava `fig` referenciando o plotly.js compartilhado (mesmo diretório) e
+    devolve os arquivos de que a página depende. Com `api`, a página busca a
+    resolução total quando aberta com ?start=&end=.
+    """
+    path = Path(path)
+    post_script = None if api is None else _FULL_RESOLUTION_JS % {"api": api}
+    with atomic_write(path) as tmp:
+        fig.write_html(tmp, include_plotlyjs=PLOTLY_JS, post_script=post_script)
+    return [path, write_plotly_js(path.parent)]
+
+
+def plot_yield_curve_surface(df, source_text="", max_dates: int = None):
+    freq = None if max_dates is None else lod_frequency(df.index, max_dates)
+    df = decimate_dates(df, freq)
+    if freq is not None:
+        source_text += {"W": " · amostragem semanal", "M": " · amostragem mensal"}[freq]
     short_col = df.columns[0]
     zmin, zmax = df.values.min(), df.values.max()
 
@@ -34,7 +120,14 @@ def plot_surface_spread_with_bonds(df_surface: pd.DataFrame,
                                    audit: pd.DataFrame,
                                    title: str,
                                    zmin: float = None,
-                                   zmax: float = None):
+                                   zmax: float = None,
+                                   max_dates: int = None):
+
+    freq = None if max_dates is None else lod_frequency(df_surface.index, max_dates)
+    if freq is not None:
+        df_surface = decimate_dates(df_surface, freq)
+        audit = audit[audit["OBS_DATE"].isin(df_surface.index)]
+        title += {"W": " – semanal", "M": " – mensal"}[freq]
 
     cmin = zmin if zmin is not None else audit["SPREAD"].min()
     cmax = zmax if zmax is not None else audit["SPREAD"].max()
@@ -0,0 +1,221 @@
+# utils/profiling.py
+"""
+Medições de recursos do processo atual e spans nomeados do pipeline.
+
+No Linux o pico de RSS (VmHWM) pode ser zerado escrevendo "5" em
+/proc/self/clear_refs, o que permite medir o pico de cada etapa. Em outros
+sistemas cai para `resource.getrusage`, que só conhece o pico do processo.
+
+`RunProfile.span` mede uma etapa (wall, CPU, pico de memória, linhas) e,
+para as etapas escolhidas, grava um perfil cProfile ou pyinstrument; `step`
+mede passos dentro da etapa em andamento na thread (carga, limpeza, ...).
+"""
+import contextvars
+import json
+import os
+import sys
+import time
+import warnings
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+_STATUS = "/proc/self/status"
+
+# (RunProfile, nome) do span aberto na thread atual, para os `step`s
+_CURRENT_SPAN = contextvars.ContextVar("current_span", default=None)
+
+
+def _status_kb(field: str):
+    try:
+        with open(_STATUS) as fh:
+            for line in fh:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """Zera o pico de RSS do processo; False se o sistema não permite."""
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss() -> int:
+    """Pico de memória residente do processo em bytes (desde o último reset)."""
+    kb = _status_kb("VmHWM")
+    if kb is not None:
+        return kb * 1024
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss() -> int:
+    """Memória residente atual em bytes (0 se indisponível)."""
+    kb = _status_kb("VmRSS")
+    return 0 if kb is None else kb * 1024
+
+
+MB = 2 ** 20
+
+
+class RunProfile:
+    """
+    Spans nomeados de uma execução, gravados em JSON.
+
+    Args:
+        profile (iterable): Nomes das etapas a perfilar ("all" = todas)
+        profiler (str): "cprofile" ou "pyinstrument" (cai para cProfile se
+            pyinstrument não estiver instalado)
+        profile_dir: Onde gravar os perfis (`<etapa>.prof` / `<etapa>.html`)
+
+    O CPU de um span é o da thread que o executa (`time.thread_time`), então
+    etapas simultâneas do DAG não somam o trabalho umas das outras. O pico de
+    memória é do processo inteiro: spans com `memory=True` zeram o pico e não
+    devem ser aninhados nem simultâneos; spans com `memory=False` (etapas em
+    paralelo) não o registram e o relatório traz só o pico da execução.
+    """
+
+    def __init__(self, profile=(), profiler="cprofile", profile_dir="data/profiles"):
+        self.profile = set(profile)
+        self.profiler = profiler
+        self.profile_dir = Path(profile_dir)
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.spans = []
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """Etapas de SPREAD_PROFILE (separadas por vírgula) e SPREAD_PROFILER."""
+        stages = [s.strip() for s in os.environ.get("SPREAD_PROFILE", "").split(",") if s.strip()]
+        return cls(profile=stages, profiler=os.environ.get("SPREAD_PROFILER", "cprofile"), **kwargs)
+
+    @contextmanager
+    def span(self, name, rows=None, memory=True):
+        """
+        Mede o bloco. O dict produzido aceita `rows` (linhas processadas)
+        e campos extras, que vão para o relatório. Com `memory=False` o pico
+        de RSS não é zerado nem registrado (spans simultâneos).
+        """
+        record = {"name": name, "rows": rows}
+        profiler = self._start_profiler(name)
+        rss_start = current_rss()
+        if memory:
+            reset_peak_rss()
+        self.spans.append(record)  # antes dos seus `step`s no relatório
+        token = _CURRENT_SPAN.set((self, name))
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            _CURRENT_SPAN.reset(token)
+            peak = peak_rss() if memory else None
+            if profiler is not None:
+                record["profile"] = self._stop_profiler(name, profiler)
+            rows = record["rows"]
+            record.update({
+                "wall_s": round(wall, 4),
+                "cpu_s": round(cpu, 4),
+                "peak_rss_mb": None if peak is None else round(peak / MB, 1),
+                "peak_delta_mb": None if peak is None else round(max(peak - rss_start, 0) / MB, 1),
+                "rows_per_s": round(rows / wall, 1) if rows and wall > 0 else None,
+            })
+
+    def _start_profiler(self, name):
+        if name not in self.profile and "all" not in self.profile:
+            return None
+        if self.profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+                profiler = Profiler()
+                profiler.start()
+                return profiler
+            except ImportError:
+                warnings.warn("pyinstrument não instalado; usando cProfile.")
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _stop_profiler(self, name, profiler):
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        if hasattr(profiler, "disable"):
+            profiler.disable()
+            path = self.profile_dir / f"{name}.prof"
+            profiler.dump_stats(path)
+        else:
+            profiler.stop()
+            path = self.profile_dir / f"{name}.html"
+            path.write_text(profiler.output_html())
+        return str(path)
+
+    def report(self) -> dict:
+        spans = [s for s in self.spans if "parent" not in s]  # passos já estão no span da etapa
+        peaks = [s["peak_rss_mb"] for s in spans if s["peak_rss_mb"] is not None]
+        return {
+            "started": self.started,
+            "total_wall_s": round(sum(s["wall_s"] for s in spans), 4),
+            "total_cpu_s": round(sum(s["cpu_s"] for s in spans), 4),
+            "peak_rss_mb": max(peaks) if peaks else round(peak_rss() / MB, 1),
+            "spans": self.spans,
+        }
+
+    def write(self, path="data/run_profile.json") -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2, default=str) + "\n")
+        return path
+
+    def summary(self) -> str:
+        """Tabela curta (uma linha por span) para o console."""
+        lines = [f"{'etapa':<22} {'wall s':>9} {'cpu s':>9} {'pico MB':>9} {'linhas':>10}"]
+        # Passos logo abaixo da sua etapa (etapas simultâneas intercalam os registros)
+        spans = []
+        for s in self.spans:
+            if "parent" not in s:
+                spans += [s] + [c for c in self.spans if c.get("parent") == s["name"]]
+        for s in spans:
+            name = s["name"] if "parent" not in s else "  " + s["name"].split("/", 1)[1]
+            peak = "" if s["peak_delta_mb"] is None else f"{s['peak_delta_mb']:.1f}"
+            lines.append(f"{name:<22} {s['wall_s']:9.3f} {s['cpu_s']:9.3f} "
+                         f"{peak:>9} {s['rows'] if s['rows'] is not None else '':>10}"
+                         + ("  cache" if s.get("cached") else ""))
+        return "\n".join(lines)
+
+
+@contextmanager
+def step(name, rows=None):
+    """
+    Passo dentro do span aberto nesta thread, registrado como `<span>/<name>`
+    (wall e CPU da thread, sem pico de memória). Fora de um span
+    (ex.: etapa rodando em outro processo) não mede nada.
+    """
+    current = _CURRENT_SPAN.get()
+    record = {"name": name, "rows": rows}
+    if current is None:
+        yield record
+        return
+    profile, parent = current
+    record.update(name=f"{parent}/{name}", parent=parent)
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield record
+    finally:
+        wall = time.perf_counter() - wall
+        rows = record["rows"]
+        record.update({
+            "wall_s": round(wall, 4),
+            "cpu_s": round(time.thread_time() - cpu, 4),
+            "peak_rss_mb": None,
+            "peak_delta_mb": None,
+            "rows_per_s": round(rows / wall, 1) if rows and wall > 0 else None,
+        })
+        profile.spans.append(record)
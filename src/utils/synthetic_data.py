@@ -0,0 +1,293 @@
+# utils/synthetic_data.py
+"""
+Gerador determinístico de dados sintéticos de mercado.
+
+Produz, com o mesmo esquema dos arquivos privados de `datos_y_modelos/`:
+- curvas DI (`od<N> Comdty`, diárias) e WLA (`wl<N> Index`, fim de mês) na aba
+  `only_values`;
+- metadados de bonds corporativos (aba `db_values_only`) com as colunas que
+  `load_corp_bond_data` filtra;
+- painel de yields YAS (aba `ya_values_only`), datas x bonds.
+
+Os arquivos são gravados em Excel e/ou Parquet e `write_synthetic_data`
+devolve um CONFIG pronto para `load_inputs`. Mesma semente, mesmos dados.
+
+Uso:
+    python -m utils.synthetic_data --out data/synthetic --bonds 100 --years 1
+"""
+import argparse
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calendars.compiled import compiled_calendar
+from config import CONFIG
+from finmath.termstructure.contracts import resolve_generic_tickers
+from finmath.termstructure.curve_models import NelsonSiegelSvensson
+from utils.file_io import parquet_available
+
+CALENDAR = "cdr_b3_settlement"
+
+# Nível/inclinação/curvatura (em %) em torno dos quais os fatores NSS oscilam
+BETAS_MEAN = np.array([11.0, -1.5, 2.0, -1.0])
+BETAS_VOL = np.array([0.08, 0.06, 0.10, 0.10])  # desvio diário
+BETAS_REVERSION = 0.01                           # reversão diária à média
+WLA_SHIFT = -5.5                                 # taxa real ~ DI - 5.5 p.p.
+
+# Arquivo e aba de cada tabela (chave de CONFIG -> (arquivo, aba))
+FILES = {
+    "HIST_CURVE_PATH": ("hist_di_curve_contracts_db", "only_values"),
+    "WLA_CURVE_PATH": ("hist_ipca_curve_contracts_db", "only_values"),
+    "CORP_PATH": ("brazil_domestic_corp_db", "db_values_only"),
+    "YA_PATH": ("ya", "ya_values_only"),
+}
+TABLES = {"HIST_CURVE_PATH": "di", "WLA_CURVE_PATH": "wla", "CORP_PATH": "corp", "YA_PATH": "ya"}
+
+# Valores que reprovam cada filtro de `load_corp_bond_data`
+_INELIGIBLE = {
+    "CLASSIFICATION_LEVEL_4_NAME": "Government Development Banks",
+    "industry_sector": "Financial",
+    "CPN_TYP": "FLOATING",
+    "MTY_TYP": "CALLABLE",
+    "CRNCY": "USD",
+    "TOT_DEBT_TO_EBITDA": "#N/A N/A",
+    "INFLATION_LINKED_INDICATOR": "N",
+}
+_SECTORS = ["Utilities", "Industrial", "Consumer, Non-cyclical", "Energy",
+            "Communications", "Basic Materials", "Consumer, Cyclical"]
+
+
+def _business_days(start, end) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(compiled_calendar(CALENDAR).bus_range(start, end))
+
+
+def _simulate_betas(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Fatores NSS (n x 4) como Ornstein-Uhlenbeck discreto ao redor da média."""
+    shocks = rng.standard_normal((n, 4)) * BETAS_VOL
+    betas = np.empty((n, 4))
+    betas[0] = BETAS_MEAN
+    for i in range(1, n):
+        betas[i] = betas[i - 1] + BETAS_REVERSION * (BETAS_MEAN - betas[i - 1]) + shocks[i]
+    return betas
+
+
+def _curve_rates(betas: np.ndarray, tenor: np.ndarray, chunk: int = 256) -> np.ndarray:
+    """Taxa NSS (em %) de cada linha de `betas` nos prazos `tenor` (mesmas linhas)."""
+    out = np.empty(tenor.shape)
+    for i in range(0, len(tenor), chunk):
+        loadings = NelsonSiegelSvensson.factor_loadings(np.maximum(tenor[i:i + chunk], 1e-4))
+        out[i:i + chunk] = np.einsum("...k,...k->...", loadings, betas[i:i + chunk, None, :])
+    return np.maximum(out, 0.25)
+
+
+def _drop_mask(shape, sparsity: float, rng: np.random.Generator, position=None) -> np.ndarray:
+    """True onde a cotação some; contratos longos (`position` alto) somem mais."""
+    if position is None:
+        return rng.random(shape) < sparsity
+    weight = 2.0 * position / (position.max() + 1.0)  # média ~1
+    return rng.random(shape) < np.minimum(sparsity * weight, 1.0)
+
+
+def _curve_table(root: str, suffix: str, n_contracts: int, dates: pd.DatetimeIndex,
+                 betas: np.ndarray, sparsity: float, rng: np.random.Generator,
+                 shift: float = 0.0) -> pd.DataFrame:
+    """Curva de contratos genéricos no esquema da aba `only_values`."""
+    position = np.tile(np.arange(1, n_contracts + 1), len(dates))
+    tickers = pd.Series([f"{root}{n} {suffix}" for n in range(1, n_contracts + 1)] * len(dates))
+    obs = np.repeat(dates.values, n_contracts)
+    expiry = resolve_generic_tickers(tickers, obs, CALENDAR)
+
+    # Term = dias úteis até o último dia útil do mês de vencimento / 252,
+    # como nas planilhas B3
+    busdaycal = compiled_calendar(CALENDAR)._busdaycalendar()
+    maturity = expiry["maturity"].values.astype("datetime64[D]")
+    month_end = (maturity.astype("datetime64[M]") + 1).astype("datetime64[D]") - 1
+    month_end = np.busday_offset(month_end, 0, roll="backward", busdaycal=busdaycal)
+    obs_days = obs.astype("datetime64[D]")
+    eom_du = np.busday_count(obs_days, month_end, busdaycal=busdaycal)
+    term = eom_du / 252.0
+
+    rates = _curve_rates(np.repeat(betas, n_contracts, axis=0), term[:, None])[:, 0] + shift
+    rates = np.round(np.maximum(rates, 0.25) + rng.normal(0.0, 0.02, len(rates)), 3)
+    volume = rng.integers(1_000, 500_000, len(rates)) // position
+    volume[_drop_mask(len(rates), sparsity, rng, position)] = 0
+
+    curve_date = pd.to_datetime(obs)
+    return pd.DataFrame({
+        "id": tickers.values + curve_date.strftime("%Y%m%d"),
+        "Months": position,
+        "Relative days": 21 * position,
+        "Relative months": [f"{n}M" for n in position],
+        "Curve date": curve_date,
+        "Generic ticker": tickers.values,
+        "Settlement date": expiry["maturity"].values,
+        "Settlement days": expiry["du"].values,
+        "End of Month date": pd.to_datetime(month_end),
+        "End of Month days": eom_du,
+        "Term": term,
+        "px_last": rates,
+        "volume": volume,
+    })
+
+
+def _corp_table(n_bonds: int, dates: pd.DatetimeIndex, eligible: float,
+                rng: np.random.Generator) -> pd.DataFrame:
+    """Metadados de bonds; uma fração `1 - eligible` reprova um dos filtros."""
+    ids = [f"SYN{i:05d} Corp" for i in range(n_bonds)]
+    # Todo bond vive parte da janela: vence depois de dates[0] + 90 dias e é
+    # emitido (2 a 12 anos antes do vencimento) até 30 dias antes do fim
+    first = dates[0] + pd.Timedelta(days=90)
+    span = (dates[-1] + pd.DateOffset(years=10) - first).days
+    maturity = first + pd.to_timedelta(rng.integers(0, span, n_bonds), unit="D")
+    term = pd.to_timedelta((rng.uniform(2.0, 12.0, n_bonds) * 365.25).astype(int), unit="D")
+    issue = np.minimum(maturity - term, dates[-1] - pd.Timedelta(days=30))
+
+    corp = pd.DataFrame({
+        "id": ids,
+        "NAME": [f"SYNTHETIC {i:05d}" for i in range(n_bonds)],
+        "CLASSIFICATION_LEVEL_4_NAME": "Corporate Bonds",
+        "industry_sector": rng.choice(_SECTORS, n_bonds),
+        "CPN_TYP": "FIXED",
+        "MTY_TYP": "AT MATURITY",
+        "CRNCY": "BRL",
+        "TOT_DEBT_TO_EBITDA": np.round(rng.gamma(2.0, 1.5, n_bonds), 2).astype(object),
+        "INFLATION_LINKED_INDICATOR": "Y",
+        "ISSUE_DT": issue.normalize(),
+        "MATURITY": maturity.normalize(),
+        "CPN": np.round(rng.uniform(4.0, 9.0, n_bonds), 2),
+    })
+    rejected = np.flatnonzero(rng.random(n_bonds) >= eligible)
+    columns = rng.choice(list(_INELIGIBLE), len(rejected))
+    for row, column in zip(rejected, columns):
+        corp.loc[row, column] = _INELIGIBLE[column]
+    return corp
+
+
+def _ya_table(corp: pd.DataFrame, dates: pd.DatetimeIndex, betas: np.ndarray,
+              sparsity: float, rng: np.random.Generator) -> pd.DataFrame:
+    """Painel de yields: curva DI no prazo do bond + spread do emissor + ruído."""
+    days = dates.values.astype("datetime64[D]")
+    maturity = corp["MATURITY"].values.astype("datetime64[D]")
+    issue = corp["ISSUE_DT"].values.astype("datetime64[D]")
+    tenor = (maturity[None, :] - days[:, None]).astype(float) / 365.25
+
+    spread = rng.gamma(2.0, 0.6, len(corp))  # em p.p.
+    ya = _curve_rates(betas, tenor) + spread + rng.normal(0.0, 0.05, tenor.shape)
+    alive = (days[:, None] >= issue[None, :]) & (tenor > 0)
+    ya = np.where(alive & ~_drop_mask(ya.shape, sparsity, rng), np.round(ya, 4), np.nan)
+
+    panel = pd.DataFrame(ya, index=pd.DatetimeIndex(dates, name="Date"), columns=corp["id"].values)
+    return panel.reset_index()
+
+
+def generate_synthetic_data(n_bonds: int = 100, n_years: float = 1.0, n_di_contracts: int = 40,
+                            n_wla_contracts: int = 21, sparsity: float = 0.05, eligible: float = 0.9,
+                            end="2025-06-30", seed: int = 0) -> dict:
+    """
+    Gera as quatro tabelas de entrada do pipeline.
+
+    Args:
+        n_bonds (int): Número de bonds corporativos (colunas do painel YAS)
+        n_years (float): Anos de histórico até `end` (dias úteis B3)
+        n_di_contracts (int): Contratos DI genéricos por data (od1..odN)
+        n_wla_contracts (int): Contratos WLA genéricos por fim de mês (wl1..wlN)
+        sparsity (float): Fração de cotações ausentes (volume zero nas curvas,
+            NaN no painel YAS); contratos longos perdem mais cotações
+        eligible (float): Fração de bonds que passa nos filtros de `load_corp_bond_data`
+        end: Última data observada
+        seed (int): Semente do gerador
+
+    Returns:
+        dict: {"di", "wla", "corp", "ya"} -> pd.DataFrame no esquema das abas originais
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end)
+    dates = _business_days(end - pd.DateOffset(days=int(round(n_years * 365.25))), end)
+    if len(dates) < 2:
+        raise ValueError("generate_synthetic_data() precisa de pelo menos 2 datas!")
+    betas = _simulate_betas(len(dates), rng)
+
+    # WLA: último dia útil de cada mês, com os fatores DI do mesmo dia
+    month_end = pd.Series(dates, index=dates).groupby(dates.to_period("M")).max()
+    at_month_end = dates.get_indexer(month_end.values)
+
+    corp = _corp_table(n_bonds, dates, eligible, rng)
+    return {
+        "di": _curve_table("od", "Comdty", n_di_contracts, dates, betas, sparsity, rng),
+        "wla": _curve_table("wl", "Index", n_wla_contracts, dates[at_month_end],
+                            betas[at_month_end], sparsity, rng, shift=WLA_SHIFT),
+        "corp": corp,
+        "ya": _ya_table(corp, dates, betas, sparsity, rng),
+    }
+
+
+def _parquet_table(table: pd.DataFrame) -> pd.DataFrame:
+    """
+    Colunas object com tipos misturados (ex.: TOT_DEBT_TO_EBITDA com números
+    e o marcador "#N/A N/A" do Bloomberg) viram texto, que o pyarrow aceita;
+    `filter_corporate_universe` converte de volta com pd.to_numeric.
+    """
+    mixed = [c for c in table.columns[table.dtypes == object] if table[c].map(type).nunique() > 1]
+    return table.astype({c: str for c in mixed})
+
+
+def write_synthetic_data(out_dir, data: dict = None, formats=("xlsx", "parquet"), **kwargs) -> dict:
+    """
+    Grava os dados sintéticos e devolve uma cópia de CONFIG apontando para eles.
+
+    Args:
+        out_dir: Diretório de saída (criado se não existir)
+        data (dict): Saída de `generate_synthetic_data`; gerada com `kwargs` se None
+        formats: "xlsx" e/ou "parquet"; o CONFIG usa o primeiro formato gravado
+            (Parquet é pulado com aviso se não houver engine instalado)
+
+    Returns:
+        dict: CONFIG com HIST_CURVE_PATH, WLA_CURVE_PATH, CORP_PATH e YA_PATH trocados
+    """
+    data = generate_synthetic_data(**kwargs) if data is None else data
+    if "parquet" in formats and not parquet_available():
+        warnings.warn("Nenhum engine Parquet instalado (pyarrow/fastparquet); gravando só Excel.")
+        formats = [f for f in formats if f != "parquet"]
+    if not formats:
+        raise ValueError("write_synthetic_data() sem formato de saída!")
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    config = dict(CONFIG)
+    for key, (stem, sheet) in FILES.items():
+        table = data[TABLES[key]]
+        for fmt in reversed(formats):
+            path = out_dir / f"{stem}.{fmt}"
+            if fmt == "parquet":
+                _parquet_table(table).to_parquet(path, index=False)
+            else:
+                table.to_excel(path, sheet_name=sheet, index=False)
+            config[key] = path
+    return config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos de mercado.")
+    parser.add_argument("--out", default="data/synthetic")
+    parser.add_argument("--bonds", type=int, default=100)
+    parser.add_argument("--years", type=float, default=1.0)
+    parser.add_argument("--di-contracts", type=int, default=40)
+    parser.add_argument("--wla-contracts", type=int, default=21)
+    parser.add_argument("--sparsity", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--formats", nargs="+", default=["xlsx", "parquet"])
+    args = parser.parse_args(argv)
+
+    config = write_synthetic_data(
+        args.out, formats=args.formats, n_bonds=args.bonds, n_years=args.years,
+        n_di_contracts=args.di_contracts, n_wla_contracts=args.wla_contracts,
+        sparsity=args.sparsity, seed=args.seed,
+    )
+    for key in FILES:
+        print(f"✅ {key}: {config[key]}")
+
+
+if __name__ == "__main__":
+    main()
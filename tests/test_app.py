@@ -0,0 +1,107 @@
+import gzip
+import re
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from core.pipeline import surface_path
+from utils.file_io import brotli_available, precompress, write_surface
+from utils.plotting import plot_yield_curve_surface, write_figure
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    import app as flask_app
+    monkeypatch.setattr(flask_app, "STATIC_DIR", tmp_path)
+    (tmp_path / "di_surface.html").write_text("<html>" + "superfície " * 5000 + "</html>")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # sem brotli: só a variante gzip
+        variants = precompress(tmp_path / "di_surface.html")
+    assert tmp_path / "di_surface.html.gz" in variants
+    assert (tmp_path / "di_surface.html.br" in variants) == brotli_available()
+    return flask_app.app.test_client()
+
+
+def test_serves_precompressed_variant_with_strong_etag(client, tmp_path):
+    response = client.get("/static/di_surface.html", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Type"].startswith("text/html")
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["Cache-Control"] == "public, no-cache"
+    assert "Last-Modified" in response.headers
+    etag = response.headers["ETag"]
+    assert etag.startswith('"') and etag.endswith('-gzip"')
+    assert gzip.decompress(response.data) == (tmp_path / "di_surface.html").read_bytes()
+
+    plain = client.get("/static/di_surface.html")
+    assert "Content-Encoding" not in plain.headers and plain.headers["ETag"] != etag
+
+
+def test_repeat_visits_get_304(client, tmp_path):
+    first = client.get("/static/di_surface.html", headers={"Accept-Encoding": "gzip"})
+    again = client.get("/static/di_surface.html", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304 and again.data == b""
+    since = client.get("/static/di_surface.html", headers={
+        "Accept-Encoding": "gzip", "If-Modified-Since": first.headers["Last-Modified"]})
+    assert since.status_code == 304
+
+    # Artefato regravado: nova ETag, variante antiga ignorada até ser refeita
+    (tmp_path / "di_surface.html").write_text("<html>nova</html>")
+    changed = client.get("/static/di_surface.html", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+    assert changed.status_code == 200 and changed.data == b"<html>nova</html>"
+
+
+def test_static_dir_follows_the_app_root_not_the_cwd(tmp_path, monkeypatch):
+    import app as flask_app
+    monkeypatch.chdir(tmp_path)
+    response = flask_app.app.test_client().get("/static/summary_table.html")
+    assert response.status_code == 200
+    assert response.data == (flask_app.STATIC_DIR / "summary_table.html").read_bytes()
+
+    # A API lê as superfícies de <raiz do app>/data, qualquer que seja o cwd
+    assert flask_app.DATA_DIR == Path(flask_app.app.root_path) / "data"
+    assert surface_path(flask_app.DATA_DIR, "di").is_absolute()
+
+
+def test_missing_and_outside_files_are_404(client):
+    assert client.get("/static/nada.html").status_code == 404
+    assert client.get("/static/../app.py").status_code == 404
+
+
+def test_page_fetches_full_resolution_window_from_api(tmp_path, monkeypatch):
+    import app as flask_app
+    monkeypatch.setattr(flask_app, "STATIC_DIR", tmp_path / "static")
+    monkeypatch.setattr(flask_app, "DATA_DIR", tmp_path / "data")
+    dates = pd.bdate_range("2020-01-01", periods=600)
+    df = pd.DataFrame({"1-year": np.linspace(10, 12, 600), "5-year": np.linspace(11, 13, 600)}, index=dates)
+    write_surface(df, surface_path(tmp_path / "data", "di"))
+    fig = plot_yield_curve_surface(df, max_dates=260)  # página com amostragem semanal
+    write_figure(fig, tmp_path / "static" / "di_surface.html", api="/api/surface/di")
+
+    client = flask_app.app.test_client()
+    page = client.get("/static/di_surface.html").get_data(as_text=True)
+    api = re.search(r'fetch\("([^"?]+)\?"', page).group(1)
+    assert api == "/api/surface/di"
+
+    # A página repassa ?start=&end=; a API devolve todas as datas diárias da janela
+    data = client.get(f"{api}?start=2020-03-02&end=2020-03-13").get_json()
+    window = dates[(dates >= "2020-03-02") & (dates <= "2020-03-13")]
+    assert data["index"] == window.strftime("%Y-%m-%d").tolist() and len(window) == 10
+    assert len(data["values"]) == 10 and len(fig.data[0].y) < len(dates)
+    assert np.allclose(data["values"][0], df.loc["2020-03-02"])
+
+
+def test_missing_brotli_warns_once_per_process(tmp_path, monkeypatch):
+    from utils import file_io
+    monkeypatch.setattr(file_io, "brotli_available", lambda: False)
+    monkeypatch.setattr(file_io, "_brotli_warned", False)
+    with pytest.warns(UserWarning, match="brotli") as record:
+        for name in ("a.html", "b.html"):
+            (tmp_path / name).write_text("<html></html>")
+            assert precompress(tmp_path / name) == [tmp_path / f"{name}.gz"]
+    assert len(record) == 1
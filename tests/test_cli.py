@@ -0,0 +1,53 @@
+import pandas as pd
+from config import CONFIG
+from core.cli import main
+from core.pipeline import ipca_window_stage, select_dates
+from utils.synthetic_data import generate_synthetic_data, write_synthetic_data
+
+
+def test_select_dates_and_monthly_ipca_fallback():
+    ipca = pd.DataFrame({"obs_date": pd.to_datetime(["2025-04-30", "2025-05-30", "2025-06-30"]),
+                         "yield": [1.0, 2.0, 3.0]})
+    assert select_dates(ipca, pd.Timestamp("2025-05-01"), None, "obs_date")["yield"].tolist() == [2.0, 3.0]
+    week = ipca_window_stage(ipca, pd.Timestamp("2025-06-02"), pd.Timestamp("2025-06-06"))
+    assert week["yield"].tolist() == [2.0]
+
+
+def test_run_one_bond_one_week(tmp_path, monkeypatch, capsys):
+    data = generate_synthetic_data(n_bonds=5, n_years=0.5, n_di_contracts=10, n_wla_contracts=8)
+    for key, path in write_synthetic_data(tmp_path / "in", data, formats=("xlsx",)).items():
+        if key.endswith("_PATH"):
+            monkeypatch.setitem(CONFIG, key, path)
+    bond = data["ya"].columns[1]
+    dirs = ["--cache-dir", str(tmp_path / "cache"), "--static-dir", str(tmp_path / "static"),
+            "--data-dir", str(tmp_path / "data")]
+
+    assert main(["run", "--start", "2025-06-16", "--end", "2025-06-27", "--bonds", bond,
+                 "--format", "html", "csv", *dirs]) == 0
+    spreads = pd.read_csv(tmp_path / "data" / "tables" / "spreads.csv", parse_dates=["OBS_DATE"])
+    assert set(spreads["id"]) <= {bond}
+    assert spreads["OBS_DATE"].between("2025-06-16", "2025-06-27").all()
+    assert (tmp_path / "static" / "spread_surface.html").exists()
+
+    # Outro intervalo: as etapas de carga vêm do cache
+    assert main(["run", "--only", "spreads", "--start", "2025-06-02", *dirs]) == 0
+    out = capsys.readouterr().out
+    assert "Etapas lidas do cache: corp_universe, di_surface, yields_panel" in out
+
+    assert main(["run", "--only", "nada", *dirs]) == 2
+
+
+def test_filtered_run_writes_to_scratch_dirs(tmp_path, monkeypatch, capsys):
+    data = generate_synthetic_data(n_bonds=5, n_years=0.5, n_di_contracts=10, n_wla_contracts=8)
+    for key, path in write_synthetic_data(tmp_path / "in", data, formats=("xlsx",)).items():
+        if key.endswith("_PATH"):
+            monkeypatch.setitem(CONFIG, key, path)
+    monkeypatch.chdir(tmp_path)
+
+    assert main(["run", "--start", "2025-06-16", "--bonds", data["ya"].columns[1], "--workers", "1"]) == 0
+    assert (tmp_path / "data" / "scratch" / "static" / "spread_surface.html").exists()
+    assert (tmp_path / "data" / "scratch" / "skipped_yields.csv").exists()
+    # As saídas completas (static/, data/skipped_yields.csv) ficam intocadas
+    assert not (tmp_path / "static").exists()
+    assert not (tmp_path / "data" / "skipped_yields.csv").exists()
+    assert "data/scratch" in capsys.readouterr().out
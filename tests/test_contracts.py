@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from config import CONFIG
+from finmath.termstructure.contracts import parse_generic_ticker, resolve_generic_tickers
+from finmath.termstructure.curve_models import DIFuturesBootstrap
+
+
+def test_generic_tickers_match_wla_settlement_dates():
+    df = pd.read_excel(CONFIG["WLA_CURVE_PATH"], sheet_name="only_values")
+    df = df[pd.to_datetime(df["Curve date"]).dt.year >= 1997]  # B3 calendar start
+
+    resolved = resolve_generic_tickers(df["Generic ticker"], df["Curve date"])
+
+    expected = pd.to_datetime(df["Settlement date"]).values.astype("datetime64[D]")
+    assert (resolved["maturity"].values.astype("datetime64[D]") == expected).all()
+
+
+def test_resolver_rolls_and_skips_expired_contracts():
+    assert parse_generic_ticker("od12 Comdty") == ("od", 12)
+
+    obs = pd.to_datetime(["2025-06-30", "2025-06-30", "2025-07-01", "2025-07-15", "2026-02-02"])
+    out = resolve_generic_tickers(["wl5 Index", "od1 Comdty", "od1 Comdty", "wl1 Index", "wl1 Index"], obs)
+
+    assert list(out["maturity"].dt.strftime("%Y-%m-%d")) == [
+        "2025-11-17",  # Nov 15th is a Saturday
+        "2025-07-01",
+        "2025-08-01",  # July contract expires on the observation date
+        "2025-08-15",
+        "2026-02-18",  # carnival
+    ]
+    assert np.allclose(out["tenor"], out["du"] / 252)
+
+
+def test_long_di1_generics_follow_the_listing_rule():
+    tickers = ["od11 Comdty", "od12 Comdty", "od19 Comdty", "od20 Comdty", "od25 Comdty"]
+    out = resolve_generic_tickers(tickers, ["2025-06-30"] * len(tickers))
+
+    assert list(out["maturity"].dt.strftime("%Y-%m-%d")) == [
+        "2026-05-04",  # last monthly contract of the front year
+        "2026-07-01",  # quarterly from here on: June 2026 is not listed
+        "2028-04-03",
+        "2029-01-02",  # January contracts only
+        "2034-01-02",
+    ]
+
+
+def test_di_bootstrap_resolves_generic_tickers():
+    quotes = pd.DataFrame({
+        "obs_date": pd.to_datetime(["2025-06-30", "2025-06-30"]),
+        "generic_ticker_id": ["od1 Comdty", "od7 Comdty"],
+        "rate": [14.90, 14.75],
+    })
+    curves = DIFuturesBootstrap(quotes).zero_curves
+    assert list(curves["maturity"].dt.strftime("%Y-%m-%d")) == ["2025-07-01", "2026-01-02"]
+    assert list(curves["du"]) == [1, 128]
@@ -0,0 +1,220 @@
+import numpy as np
+import pandas as pd
+from calendars.daycounts import DayCounts
+from finmath.termstructure.curve_models import (
+    CurveBootstrap,
+    DIFuturesBootstrap,
+    NelsonSiegelSvensson,
+    failures_path,
+    fit_nss_history,
+    flat_forward_rates,
+)
+
+dc = DayCounts("bus/252", calendar="cdr_anbima")
+ref_date = pd.Timestamp("2025-06-30")
+betas = np.array([0.13, 0.02, -0.01, 0.005])
+
+
+def _bonds():
+    maturities = ["2026-01-15", "2027-01-15", "2028-07-17", "2030-01-15", "2035-01-15"]
+    cash_flows = []
+    for m in maturities:
+        dates = pd.date_range(end=m, periods=8, freq="6MS") + pd.Timedelta(days=14)
+        dates = [d for d in dates if d > ref_date]
+        cash_flows.append(pd.Series([6.0] * (len(dates) - 1) + [106.0], index=dates))
+    return cash_flows
+
+
+def _loop_objective(x, prices, cash_flows):
+    # Reference cash flow by cash flow pricing
+    pe = 0.0
+    for p, cf in zip(prices, cash_flows):
+        theo = 0.0
+        for d, c in cf.items():
+            t = dc.tf(ref_date, d)
+            y = NelsonSiegelSvensson.rate_for_ytm(betas=x, ytm=t)
+            theo += c / (1.0 + y) ** t
+        pe += ((p - theo) / p) ** 2.0 / dc.tf(ref_date, max(cf.index))
+    return pe
+
+
+def test_nss_objective_matches_loop_and_gradient():
+    cash_flows = _bonds()
+    prices = np.array([101.0, 99.5, 98.0, 95.0, 90.0])
+    ytm, amounts, weights = NelsonSiegelSvensson.cash_flow_grid(cash_flows, dc, ref_date)
+
+    value, grad = NelsonSiegelSvensson._objective(
+        betas, prices, ytm, amounts, weights, np.array([2.2648, 0.3330])
+    )
+    assert np.isclose(value, _loop_objective(betas, prices, cash_flows), rtol=1e-12)
+
+    h = 1e-7
+    numeric = [
+        (_loop_objective(betas + h * e, prices, cash_flows)
+         - _loop_objective(betas - h * e, prices, cash_flows)) / (2 * h)
+        for e in np.eye(4)
+    ]
+    assert np.allclose(grad, numeric, rtol=1e-5, atol=1e-9)
+
+    # Joint gradient of the lambda refinement, in (betas, lambdas)
+    x = np.concatenate([betas, [2.2648, 0.3330]])
+    joint = lambda x: NelsonSiegelSvensson._objective(
+        x[:4], prices, ytm, amounts, weights, x[4:], lambda_grad=True
+    )
+    numeric = [(joint(x + h * e)[0] - joint(x - h * e)[0]) / (2 * h) for e in np.eye(6)]
+    assert np.allclose(joint(x)[1], numeric, rtol=1e-5, atol=1e-9)
+
+
+def test_nss_fit_reprices_bonds():
+    cash_flows = _bonds()
+    model = NelsonSiegelSvensson.__new__(NelsonSiegelSvensson)
+    model.dc, model.ref_date, model.betas = dc, ref_date, betas
+    model.lambdas = np.array([2.2648, 0.3330])
+    prices = [model.bond_price(cf) for cf in cash_flows]
+
+    fit = NelsonSiegelSvensson(prices, cash_flows, ref_date=ref_date)
+    assert fit.price_errors(prices, cash_flows) < 1e-6
+    assert np.allclose([fit.bond_price(cf) for cf in cash_flows], prices, rtol=1e-3)
+
+
+def test_fit_nss_history_warm_start_and_checkpoint(tmp_path):
+    cash_flows = dict(zip("ABCDE", _bonds()))
+    model = NelsonSiegelSvensson.__new__(NelsonSiegelSvensson)
+    model.dc, model.lambdas = dc, np.array([2.2648, 0.3330])
+    dates = pd.bdate_range("2025-07-01", periods=6)
+    rows = []
+    for k, d in enumerate(dates):
+        model.ref_date, model.betas = d, betas + [0.0005 * k, 0, 0, 0]
+        rows.append([model.bond_price(cf[cf.index > d]) for cf in cash_flows.values()])
+    prices = pd.DataFrame(rows, index=dates, columns=list(cash_flows))
+
+    checkpoint = tmp_path / "nss.csv"
+    first = fit_nss_history(prices.iloc[:3], cash_flows, checkpoint=checkpoint)
+    assert first["success"].all() and len(pd.read_csv(checkpoint)) == 3
+
+    hist = fit_nss_history(prices, cash_flows, workers=2, checkpoint=checkpoint)
+    assert list(hist.index) == list(dates)
+    assert len(pd.read_csv(checkpoint)) == 6
+    assert hist["success"].all() and (hist["fun"] < 1e-6).all()
+    assert np.allclose(hist["b1"], betas[0] + 0.0005 * np.arange(6), atol=5e-3)
+
+
+def test_fit_nss_history_seeds_parallel_chunks_and_retries_failures(tmp_path):
+    cash_flows = dict(zip("ABCDE", _bonds()))
+    model = NelsonSiegelSvensson.__new__(NelsonSiegelSvensson)
+    model.dc, model.lambdas = dc, np.array([2.2648, 0.3330])
+    dates = pd.bdate_range("2025-07-01", periods=6)
+    rows = []
+    for k, d in enumerate(dates):
+        model.ref_date, model.betas = d, betas + [0.0005 * k, 0, 0, 0]
+        rows.append([model.bond_price(cf[cf.index > d]) for cf in cash_flows.values()])
+    prices = pd.DataFrame(rows, index=dates, columns=list(cash_flows))
+
+    # Chunks start warm (from the previous chunk), not from zeros
+    cold = fit_nss_history(prices.iloc[2:3], cash_flows)["nit"].iloc[0]
+    hist = fit_nss_history(prices, cash_flows, workers=3, chunk_size=2)
+    assert (hist["nit"].iloc[[2, 4]] < cold).all()
+
+    # A date without quotes fails, is logged apart and fitted on resume
+    checkpoint = tmp_path / "nss.csv"
+    gap = prices.copy()
+    gap.iloc[3] = np.nan
+    first = fit_nss_history(gap, cash_flows, checkpoint=checkpoint)
+    assert first["success"].sum() == 5
+    assert len(pd.read_csv(checkpoint)) == 5 and len(pd.read_csv(failures_path(checkpoint))) == 1
+
+    resumed = fit_nss_history(prices, cash_flows, checkpoint=checkpoint)
+    assert resumed["success"].all() and len(pd.read_csv(checkpoint)) == 6
+
+
+def test_estimate_lambdas_recovers_curve():
+    cash_flows = _bonds() + [
+        pd.Series([100.0], index=[pd.Timestamp(m)])
+        for m in ["2025-10-01", "2026-07-01", "2029-01-02", "2032-01-02"]
+    ]
+    lambdas = np.array([1.2, 0.15])
+    model = NelsonSiegelSvensson.__new__(NelsonSiegelSvensson)
+    model.dc, model.ref_date, model.betas, model.lambdas = dc, ref_date, betas, lambdas
+    prices = [model.bond_price(cf) for cf in cash_flows]
+
+    grid_betas, grid_lambdas = NelsonSiegelSvensson.estimate_lambdas(
+        prices, cash_flows, dc, ref_date, refine=False
+    )
+    fit = NelsonSiegelSvensson(prices, cash_flows, ref_date=ref_date, fit_lambdas=True)
+    fixed = NelsonSiegelSvensson(prices, cash_flows, ref_date=ref_date)
+
+    pe = lambda m: m.price_errors(prices, cash_flows)
+    grid_pe = fit.price_errors(prices, cash_flows, betas=grid_betas, lambdas=grid_lambdas)
+    assert pe(fit) <= grid_pe
+    assert pe(fit) < pe(fixed)
+    assert np.allclose([fit.bond_price(cf) for cf in cash_flows], prices, rtol=2e-4)
+
+
+def test_curve_bootstrap_reprices_every_bond():
+    cash_flows = [
+        pd.Series([100.0], index=[pd.Timestamp(m)])
+        for m in ["2025-10-01", "2026-01-02", "2026-07-01"]
+    ] + _bonds()[1:]
+    rates = [0.145, 0.146, 0.144, 0.141, 0.138, 0.135, 0.132]
+
+    boot = CurveBootstrap(cash_flows, rates=rates, ref_date=ref_date)
+    curve = boot.zero_curve
+    assert curve.index.is_monotonic_increasing and len(curve) == len(cash_flows)
+
+    for cf, r in zip(cash_flows, rates):
+        t = np.array([dc.tf(ref_date, d) for d in cf.index])
+        zero = flat_forward_rates(t, curve.index.values, curve.values)
+        assert np.isclose((cf.values / (1 + zero) ** t).sum(),
+                          (cf.values / (1 + r) ** t).sum(), rtol=1e-10)
+
+
+def test_di_futures_bootstrap_from_pu_and_rates():
+    b3 = DayCounts("bus/252", calendar="cdr_b3_settlement")
+    obs = pd.to_datetime(["2025-06-30"] * 3 + ["2025-07-01"] * 3)
+    mty = pd.to_datetime(["2025-07-01", "2026-01-02", "2027-01-04"] * 2)
+    rates = np.array([14.90, 14.75, 14.10, 14.91, 14.76, 14.12])
+    du = np.array([b3.days(o, m) for o, m in zip(obs, mty)])
+    pu = 100_000 / (1 + rates / 100) ** (du / 252)
+
+    by_rate = DIFuturesBootstrap(
+        pd.DataFrame({"obs_date": obs, "maturity": mty, "rate": rates})
+    )
+    by_pu = DIFuturesBootstrap(
+        pd.DataFrame({"obs_date": obs, "maturity": mty, "pu": pu}), quote="pu"
+    )
+
+    # The 2025-07-01 contract has expired on 2025-07-01
+    curves = by_pu.zero_curves
+    assert len(curves) == 5
+    assert list(curves["du"]) == list(du[[0, 1, 2, 4, 5]])
+    assert np.allclose(curves["rate"], by_rate.zero_curves["rate"], rtol=1e-12)
+
+    curve = by_pu.curve("2025-07-01")
+    assert np.isclose(curve.rate_for_date(pd.Timestamp("2026-01-02")), 0.1476)
+
+    # A fully built CurveBootstrap: its own knots, interpolation and bootstrap
+    rows = curves[curves["obs_date"] == "2025-07-01"]
+    assert np.allclose(curve.zero_curve.index, rows["tenor"])
+    assert np.allclose(curve.zero_curve.values, rows["rate"])
+    assert curve.ref_date == pd.Timestamp("2025-07-01")
+
+
+def test_fit_nss_history_records_ref_dates_without_prices_as_failures(tmp_path):
+    cash_flows = dict(zip("ABCDE", _bonds()))
+    model = NelsonSiegelSvensson.__new__(NelsonSiegelSvensson)
+    model.dc, model.lambdas, model.betas = dc, np.array([2.2648, 0.3330]), betas
+    dates = pd.bdate_range("2025-07-01", periods=3)
+    rows = []
+    for d in dates:
+        model.ref_date = d
+        rows.append([model.bond_price(cf[cf.index > d]) for cf in cash_flows.values()])
+    prices = pd.DataFrame(rows, index=dates, columns=list(cash_flows))
+
+    # A requested date missing from the panel fails alone instead of raising
+    missing = pd.Timestamp("2025-07-09")
+    checkpoint = tmp_path / "nss.csv"
+    hist = fit_nss_history(prices, cash_flows, ref_dates=[*dates, missing], checkpoint=checkpoint)
+    assert hist["success"].sum() == 3 and not hist.loc[missing, "success"]
+    assert hist.loc[missing, "message"] == "No prices for ref_date"
+    failed = pd.read_csv(failures_path(checkpoint), parse_dates=["ref_date"])
+    assert list(failed["ref_date"]) == [missing]
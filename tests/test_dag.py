@@ -0,0 +1,165 @@
+import importlib
+import os
+import sys
+import threading
+
+import pandas as pd
+import pytest
+from config import CONFIG
+from core import dag
+from core.dag import Stage, StageRunner
+from core.pipeline import build_stages, pipeline_params
+from utils.file_io import atomic_write
+from utils.profiling import RunProfile
+from utils.synthetic_data import generate_synthetic_data, write_synthetic_data
+
+CALLS = []
+
+
+def double(x):
+    CALLS.append("double")
+    return 2 * x
+
+
+def add(a, b):
+    CALLS.append("add")
+    return a + b
+
+
+def split(a):
+    CALLS.append("split")
+    return a, -a
+
+
+def toy_stages():
+    return [
+        Stage("double", double, ("x",), ("doubled",)),
+        Stage("split", split, ("y",), ("pos", "neg")),
+        Stage("add", add, ("doubled", "neg"), ("total",)),
+    ]
+
+
+def test_only_stages_with_changed_inputs_rerun(tmp_path):
+    CALLS.clear()
+    runner = StageRunner(toy_stages(), cache_dir=tmp_path)
+    assert runner.run({"x": 1, "y": 5})["total"] == -3
+    assert sorted(CALLS) == ["add", "double", "split"]
+
+    CALLS.clear()
+    runner = StageRunner(toy_stages(), cache_dir=tmp_path)
+    assert runner.run({"x": 1, "y": 5})["total"] == -3
+    assert CALLS == [] and set(runner.status.values()) == {"cached"}
+
+    CALLS.clear()
+    assert runner.run({"x": 2, "y": 5})["total"] == -1
+    assert sorted(CALLS) == ["add", "double"]
+    assert runner.status["split"] == "cached"
+
+
+def test_editing_an_imported_module_invalidates_downstream_stages(tmp_path, monkeypatch):
+    pkg = tmp_path / "toyproj"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "rates.py").write_text("def scale(x):\n    return 2 * x\n")
+    (pkg / "loaders.py").write_text("from toyproj import rates\n\n\ndef load(x):\n    return rates.scale(x)\n")
+    (pkg / "unused.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(dag, "PROJECT_PACKAGES", dag.PROJECT_PACKAGES + ("toyproj",))
+    loaders = importlib.import_module("toyproj.loaders")
+    try:
+        stages = [Stage("load", loaders.load, ("x",), ("doubled",)),
+                  Stage("add", add, ("doubled", "neg"), ("total",))]
+        assert stages[0].code_modules() == ["toyproj", "toyproj.rates"]
+
+        def rerun():
+            runner = StageRunner(stages, cache_dir=tmp_path / "cache")
+            runner.run({"x": 1, "neg": 0})
+            return sorted(name for name, status in runner.status.items() if status == "run")
+
+        assert rerun() == ["add", "load"]
+        (pkg / "unused.py").write_text("VALUE = 2\n")
+        assert rerun() == []
+        # Só o fonte do módulo importado muda: a etapa e as seguintes voltam a rodar
+        (pkg / "rates.py").write_text("def scale(x):\n    return x + x\n")
+        assert rerun() == ["add", "load"]
+    finally:
+        for name in [m for m in sys.modules if m.split(".")[0] == "toyproj"]:
+            del sys.modules[name]
+
+    # No DAG real: regras de feriados e calendário compilado entram via imports
+    stages = {stage.name: stage for stage in build_stages()}
+    assert "calendars.holidays.brazil.rules" in stages["yields_panel"].code_modules()
+    assert {"calendars.compiled", "calendars.holidays.brazil.rules"} <= set(stages["spreads"].code_modules())
+
+
+def test_targets_and_disabled_cache(tmp_path):
+    CALLS.clear()
+    runner = StageRunner(toy_stages(), cache_dir=None)
+    assert runner.upstream(["add"]) in (["double", "split", "add"], ["split", "double", "add"])
+    out = runner.run({"y": 3}, targets=["split"])
+    assert out == {"pos": 3, "neg": -3} and CALLS == ["split"]
+    with pytest.raises(KeyError):
+        runner.run({"y": 3}, targets=["double"])
+
+
+def test_independent_branches_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(x):
+        barrier.wait()  # só passa se os dois ramos estiverem rodando ao mesmo tempo
+        return x
+
+    stages = [Stage("di", branch, ("a",), ("di",)), Stage("ipca", branch, ("b",), ("ipca",))]
+    assert StageRunner(stages, cache_dir=None, workers=2).run({"a": 1, "b": 2}) == {"di": 1, "ipca": 2}
+
+
+def pid(_):
+    return os.getpid()
+
+
+def test_process_stages_run_outside_the_main_process():
+    stages = [Stage("local", pid, ("a",), ("local",)), Stage("remote", pid, ("a",), ("remote",), process=True)]
+    out = StageRunner(stages, cache_dir=None).run({"a": 0})
+    assert out["local"] == os.getpid() != out["remote"]
+    out = StageRunner(stages, cache_dir=None, processes=False).run({"a": 0})
+    assert out["remote"] == os.getpid()
+
+
+def test_atomic_write_keeps_previous_file_on_failure(tmp_path):
+    path = tmp_path / "static" / "chart.html"
+    with atomic_write(path) as tmp:
+        tmp.write_text("v1")
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as tmp:
+            tmp.write_text("v2 pela metade")
+            raise RuntimeError
+    assert path.read_text() == "v1"
+    assert os.listdir(path.parent) == ["chart.html"]
+
+
+def test_main_dag_is_cached_on_synthetic_data(tmp_path):
+    data = generate_synthetic_data(n_bonds=5, n_years=0.5, n_di_contracts=10, n_wla_contracts=8)
+    config = {**CONFIG, **write_synthetic_data(tmp_path / "data", data, formats=("xlsx",))}
+    params = pipeline_params(config, static_dir=tmp_path / "static", data_dir=tmp_path / "out")
+
+    run = RunProfile()
+    first = StageRunner(build_stages(), cache_dir=tmp_path / "cache", profile=run)
+    out = first.run(params)
+    assert set(first.status.values()) == {"run"}
+    assert (tmp_path / "static" / "di_surface.html").exists()
+    assert (tmp_path / "static" / "ipca_surface.html").exists()
+    assert (tmp_path / "out" / "skipped_yields.csv").exists()
+
+    # Gráfico apagado: só a etapa que o grava volta a rodar
+    (tmp_path / "static" / "ipca_surface.html").unlink()
+    second = StageRunner(build_stages(), cache_dir=tmp_path / "cache", profile=run)
+    again = second.run(params)
+    cached = {s.name for s in build_stages() if s.cache}
+    assert [n for n, s in second.status.items() if s == "run" and n in cached] == ["ipca_figures"]
+    assert (tmp_path / "static" / "ipca_surface.html").exists()
+    pd.testing.assert_frame_equal(again["spreads"], out["spreads"])
+    assert sum(1 for s in run.spans if s.get("cached")) == len(cached) - 1
+    # Passos dentro das etapas; em paralelo (workers=2) sem pico de memória por etapa
+    names = {s["name"] for s in run.spans}
+    assert {"di_surface/load", "di_surface/clean", "di_surface/dedupe", "di_figures/render"} <= names
+    assert all(s["peak_rss_mb"] is None for s in run.spans)
@@ -0,0 +1,126 @@
+import datetime
+import hashlib
+
+import numpy as np
+import pandas as pd
+import pytest
+from calendars import DayCounts, Holidays, is_business_day, is_holiday
+from calendars.compiled import compiled_calendar
+from calendars.holidays.brazil.rules import easter_sunday, holiday_array
+from finmath.SwapCurve.Holidays.AnbimaHolidays import AnbimaHolidays
+from utils.filters import flag_non_business_days
+
+# SHA-1 of the int64 day ordinals of the former hand-typed lists
+LEGACY_LISTS = {
+    "cdr_anbima": ("1994-01-01", "2078-12-25", 1028,
+                   "7a584efc4a4c85a56ab93d4edd3a2b7dd44a3fa7"),
+    "cdr_b3_settlement": ("1997-01-01", "2036-12-31", 540,
+                          "50c1a253b5937f6fbaeb4c4cab970867cc1de993"),
+    "cdr_anbima_swap": ("2001-01-01", "2031-01-01", 360,
+                        "f5f93893f1dfd54d71fd1805136a36722ac33256"),
+}
+
+
+def _digest(dates):
+    return hashlib.sha1(np.asarray(dates, dtype="datetime64[D]").astype("int64").tobytes()).hexdigest()
+
+
+def test_rules_reproduce_legacy_lists():
+    for name, (start, end, count, digest) in LEGACY_LISTS.items():
+        h = holiday_array(name)
+        h = h[(h >= np.datetime64(start)) & (h <= np.datetime64(end))]
+        assert len(h) == count and _digest(h) == digest, name
+
+    swap = AnbimaHolidays().get_holidays()
+    assert _digest(swap[swap <= np.datetime64("2031-01-01")]) == LEGACY_LISTS["cdr_anbima_swap"][3]
+    assert swap.max() == np.datetime64("2070-12-25")
+
+
+def test_rules_extend_past_legacy_lists():
+    assert list(easter_sunday([2024, 2025, 2100]).astype(str)) == [
+        "2024-03-31", "2025-04-20", "2100-03-28"]
+
+    b3 = np.array(Holidays.holidays("cdr_b3_settlement"), dtype="datetime64[D]")
+    for d in ["2040-02-13", "2040-02-14", "2040-03-30", "2040-05-31", "2040-11-20", "2040-12-24", "2040-12-31"]:
+        assert np.datetime64(d) in b3
+    assert np.is_busday(b3).all()  # weekends dropped
+
+    anbima = np.array(Holidays.holidays("cdr_anbima"), dtype="datetime64[D]")
+    assert anbima.max() == np.datetime64("2200-12-25")
+
+
+def test_compiled_calendar_lookups():
+    dates = np.array(["2025-03-04", "2025-03-05", "2025-03-08", "NaT", "2301-01-02"], dtype="datetime64[D]")
+    assert list(is_business_day(dates, "cdr_anbima")) == [False, True, False, False, True]
+    assert list(is_holiday(dates, "cdr_anbima")) == [True, False, False, False, False]
+    assert is_holiday("2025-11-20", "cdr_b3_settlement") is True
+
+    dc = DayCounts("bus/252", calendar="cdr_anbima")
+    days = pd.date_range("2020-01-01", "2030-12-31")
+    assert (dc.isbus(days) == np.is_busday(days.values.astype("datetime64[D]"), busdaycal=dc.buscore)).all()
+
+    anbima = AnbimaHolidays()
+    assert anbima.check_date(datetime.datetime(2025, 3, 4)) is True
+    assert anbima.check_date(datetime.date(2025, 3, 5)) is False
+
+
+def test_flag_non_business_days():
+    df = pd.DataFrame({"obs_date": pd.to_datetime(["2025-06-30", "2025-07-05", "2025-07-09"]), "yield": 1.0})
+    flagged = flag_non_business_days(df, "obs_date")
+    assert list(flagged["obs_date"].dt.strftime("%Y-%m-%d")) == ["2025-07-05", "2025-07-09"]
+
+
+def test_composite_calendars():
+    anbima = set(Holidays.holidays("cdr_anbima"))
+    us = set(Holidays.holidays("cdr_us_trading"))
+    assert set(Holidays.holidays("anbima + us_trading")) == anbima | us
+    assert set(Holidays.holidays("cdr_anbima&cdr_us_trading")) == anbima & us
+
+    joint = DayCounts("bus/252", calendar="cdr_anbima+cdr_us_trading")
+    assert joint.calendar == "cdr_anbima+cdr_us_trading"
+    assert joint.buscore is DayCounts("bus/252", calendar="anbima+us_trading").buscore
+    # Thanksgiving 2025 is only a US holiday, Carnival only a Brazilian one
+    assert list(joint.isbus(["2025-11-27", "2025-03-04", "2025-03-05"])) == [False, False, True]
+    assert joint.days("2025-11-26", "2025-11-28") == 1
+
+
+def test_bus_range_and_vectorized_rolls():
+    dc = DayCounts("bus/252", calendar="cdr_anbima")
+    grid = dc.bus_range("2025-02-28", "2025-03-10")
+    assert list(grid.astype(str)) == [
+        "2025-02-28", "2025-03-05", "2025-03-06", "2025-03-07", "2025-03-10"]
+    assert list(dc.gendates("2025-03-01", "2025-03-09")) == list(pd.to_datetime(grid[1:4]))
+
+    cal = compiled_calendar("cdr_anbima")
+    start = np.array(["2025-01-01", "1930-06-01", "2024-12-31"], dtype="datetime64[D]")
+    end = np.array(["2026-01-01", "2025-01-01", "2210-01-01"], dtype="datetime64[D]")
+    assert (cal.bus_count(start, end) == np.busday_count(start, end, busdaycal=dc.buscore)).all()
+
+    d = pd.Timestamp("2025-03-03")
+    assert dc.workday(d, 1) == pd.Timestamp("2025-03-05")
+    assert dc.following(pd.Timestamp("2025-03-04")) == pd.Timestamp("2025-03-05")
+    assert dc.preceding(datetime.date(2025, 3, 4)) == pd.Timestamp("2025-02-28")
+    assert list(dc.following(pd.to_datetime(["2025-03-04", "2025-03-08"]))) == \
+        list(pd.to_datetime(["2025-03-05", "2025-03-10"]))
+
+
+def test_engines_are_imported_on_first_use():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "from calendars import DayCounts\n"
+        "DayCounts('bus/252', calendar='cdr_anbima')\n"
+        "assert 'pandas.tseries.holiday' not in sys.modules\n"
+        "assert 'calendars.holidays.libor' not in sys.modules\n"
+        "from calendars import Holidays, LiborEurON, Y_END\n"
+        "assert len(Holidays.holidays('cdr_libor_eur_on')) > 0\n"
+        "assert 'pandas.tseries.holiday' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_unknown_calendar_is_not_implemented():
+    with pytest.raises(NotImplementedError, match="cdr_nowhere"):
+        Holidays.holidays("cdr_nowhere")
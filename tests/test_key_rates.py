@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from calendars.daycounts import DayCounts
+from finmath.termstructure.curve_models import flat_forward_interpolation
+from finmath.termstructure.key_rates import key_rate_dv01
+
+dc = DayCounts("bus/252", calendar="cdr_anbima")
+tenors = {"6-month": 0.5, "1-year": 1.0, "2-year": 2.0, "5-year": 5.0}
+
+
+def _pv(cf, obs_date, curve, spread=0.0):
+    pv = 0.0
+    for d, c in cf.items():
+        t = dc.tf(obs_date, d)
+        if t > 0:
+            pv += c / (1.0 + flat_forward_interpolation(t, curve) + spread) ** t
+    return pv
+
+
+def test_key_rate_dv01_matches_full_repricing():
+    dates = pd.to_datetime(["2025-06-30", "2025-07-31"])
+    curves = pd.DataFrame(
+        [[0.149, 0.1475, 0.139, 0.132], [0.150, 0.1480, 0.140, 0.133]],
+        index=dates, columns=list(tenors),
+    )
+    cash_flows = {
+        "ZERO": pd.Series([100.0], index=[pd.Timestamp("2028-03-15")]),
+        "CPN": pd.Series([6.0, 6.0, 106.0], index=pd.to_datetime(
+            ["2026-01-15", "2027-01-15", "2028-01-17"])),
+    }
+
+    ladder = key_rate_dv01(curves, tenors, cash_flows, dc=dc, rate_scale=1.0)
+
+    assert ladder.shape == (4, 4)
+    for obs_date in dates:
+        base = pd.Series(curves.loc[obs_date].values, index=list(tenors.values()))
+        for bond, cf in cash_flows.items():
+            for name, t in tenors.items():
+                bumped = base.copy()
+                bumped[t] += 1e-4
+                expected = _pv(cf, obs_date, base) - _pv(cf, obs_date, bumped)
+                got = ladder.loc[(obs_date, bond), name]
+                assert np.isclose(got, expected, rtol=1e-9, atol=1e-12)
+
+    # A 2028 zero has no exposure to the 6-month pillar
+    assert ladder.loc[(dates[0], "ZERO"), "6-month"] == 0.0
+
+
+def test_key_rate_dv01_with_spread_matches_full_repricing():
+    # Spread aditivo sobre a taxa zero interpolada: SPREAD = YAS - DI
+    obs_date = pd.Timestamp("2025-06-30")
+    curves = pd.DataFrame([[0.149, 0.1475, 0.139, 0.132]], index=[obs_date], columns=list(tenors))
+    cash_flows = {
+        "ZERO": pd.Series([100.0], index=[pd.Timestamp("2028-03-15")]),
+        "CPN": pd.Series([6.0, 6.0, 106.0], index=pd.to_datetime(
+            ["2026-01-15", "2027-01-15", "2028-01-17"])),
+    }
+    spreads = pd.DataFrame({"ZERO": [0.025], "CPN": [0.04]}, index=[obs_date])
+
+    ladder = key_rate_dv01(curves, tenors, cash_flows, dc=dc, spreads=spreads, rate_scale=1.0)
+
+    base = pd.Series(curves.loc[obs_date].values, index=list(tenors.values()))
+    for bond, cf in cash_flows.items():
+        s = spreads.loc[obs_date, bond]
+        for name, t in tenors.items():
+            bumped = base.copy()
+            bumped[t] += 1e-4
+            expected = _pv(cf, obs_date, base, s) - _pv(cf, obs_date, bumped, s)
+            assert np.isclose(ladder.loc[(obs_date, bond), name], expected, rtol=1e-9, atol=1e-12)
+        expected = _pv(cf, obs_date, base, s) - _pv(cf, obs_date, base, s + 1e-4)
+        assert np.isclose(ladder.loc[(obs_date, bond), "SPREAD"], expected, rtol=1e-9)
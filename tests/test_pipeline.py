@@ -0,0 +1,49 @@
+import pandas as pd
+from config import CONFIG
+from core.pipeline import (clean_surface, dedupe_surface, di_view, interpolate_ipca, load_ipca_surface,
+                           ordered_tenors, pivot_surface, render_di, spread_pivot)
+from utils.interpolation import interpolate_di_surface
+from utils.synthetic_data import generate_synthetic_data, write_synthetic_data
+
+
+def test_surface_stages_match_main_steps():
+    surface = pd.DataFrame({
+        "obs_date": pd.to_datetime(["2025-06-30"] * 4 + ["2025-07-01"] * 2),
+        "tenor": [0.5, 1.0, 1.0, 2.0, 0.5, 1.0],
+        "yield": [14.0, 14.2, 14.3, float("nan"), 14.1, 0.0],
+        "volume": [10, 5, 7, 3, 0, 9],
+    })
+    clean = clean_surface(surface)
+    assert list(clean.index) == [0, 1, 2]
+
+    dedup = dedupe_surface(clean)
+    pivoted = pivot_surface(dedup)
+    assert len(dedup) == 2
+    assert list(pivoted.index) == ["20250630"]
+    assert pivoted.loc["20250630", 1.0] == 14.3
+
+
+def test_spread_pivot_orders_tenor_buckets():
+    corp_bonds = pd.DataFrame({
+        "OBS_DATE": pd.to_datetime(["2025-06-30"] * 3),
+        "TENOR_BUCKET": ["5-year", "1-year", "5-year"],
+        "SPREAD": [1.0, 2.0, 3.0],
+    })
+    spread_surface = spread_pivot(corp_bonds, CONFIG["TENORS"])
+    assert list(spread_surface.columns) == ["1-year", "5-year"]
+    assert spread_surface.iloc[0].tolist() == [2.0, 2.0]
+    assert ordered_tenors(CONFIG["TENORS"])[0] == "1-day"
+
+
+def test_di_and_ipca_branches_on_synthetic_data(tmp_path):
+    data = generate_synthetic_data(n_bonds=5, n_years=0.5, n_di_contracts=10, n_wla_contracts=8)
+    config = write_synthetic_data(tmp_path, data, formats=("xlsx",))
+
+    ipca_surface = load_ipca_surface(config["WLA_CURVE_PATH"])
+    ipca = interpolate_ipca(ipca_surface, CONFIG["WLA_TENORS"])
+    assert list(ipca.columns) == ordered_tenors(CONFIG["WLA_TENORS"])
+
+    surface = data["di"].rename(columns={"Curve date": "obs_date", "Term": "tenor", "px_last": "yield"})
+    surface = dedupe_surface(clean_surface(surface))
+    fig, table = render_di(di_view(interpolate_di_surface(surface, CONFIG["TENORS"]), CONFIG["TENORS"]))
+    assert fig.data and table is not None
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from utils.file_io import write_surface
+from utils.plotting import (PLOTLY_JS, decimate_dates, lod_frequency, plot_yield_curve_surface,
+                            write_figure)
+
+
+def daily_surface(n):
+    dates = pd.bdate_range("2000-01-03", periods=n)
+    return pd.DataFrame({"1-year": np.linspace(10, 12, n), "5-year": np.linspace(11, 13, n)}, index=dates)
+
+
+def test_lod_keeps_last_real_date_of_each_period():
+    assert lod_frequency(daily_surface(200).index) is None
+    assert lod_frequency(daily_surface(1000).index) == "W"
+    assert lod_frequency(daily_surface(30 * 252).index) == "M"
+
+    df = daily_surface(30 * 252)
+    monthly = decimate_dates(df, "M")
+    assert len(monthly) == df.index.to_period("M").nunique()
+    assert monthly.index[-1] == df.index[-1] and monthly.index.isin(df.index).all()
+
+    fig = plot_yield_curve_surface(df, max_dates=260)
+    assert len(fig.data[0].y) == len(monthly)
+
+
+def test_pages_share_plotly_js_and_fetch_full_resolution(tmp_path):
+    fig = plot_yield_curve_surface(daily_surface(5 * 252), max_dates=260)
+    paths = write_figure(fig, tmp_path / "di_surface.html", api="/api/surface/di")
+    page = paths[0].read_text()
+    assert paths[1] == tmp_path / PLOTLY_JS and paths[1].stat().st_size > 1_000_000
+    assert f'src="{PLOTLY_JS}"' in page and "/api/surface/di?" in page
+    assert paths[0].stat().st_size < 200_000
+
+
+def test_surface_api(tmp_path, monkeypatch):
+    import app as flask_app
+    monkeypatch.setattr(flask_app, "DATA_DIR", tmp_path)
+    df = daily_surface(10)
+    df.iloc[2, 1] = np.nan
+    write_surface(df, tmp_path / "surfaces" / "di.csv")
+
+    client = flask_app.app.test_client()
+    data = client.get("/api/surface/di?start=2000-01-04&end=2000-01-06").get_json()
+    assert data["index"] == ["2000-01-04", "2000-01-05", "2000-01-06"]
+    assert data["columns"] == ["1-year", "5-year"] and data["values"][1][1] is None
+    assert client.get("/api/surface/ipca").status_code == 404
+    assert client.get("/api/surface/di?start=ontem").status_code == 400
@@ -0,0 +1,73 @@
+import json
+import threading
+import time
+
+import numpy as np
+from utils.profiling import RunProfile, peak_rss, step
+
+
+def test_spans_record_time_memory_rows_and_profiles(tmp_path):
+    run = RunProfile(profile=["heavy"], profile_dir=tmp_path / "profiles")
+    with run.span("light", rows=3):
+        pass
+    with run.span("heavy") as span:
+        block = np.ones(4_000_000)
+        span["rows"] = len(block)
+        del block
+
+    light, heavy = run.spans
+    assert light["rows"] == 3 and "profile" not in light
+    assert heavy["rows"] == 4_000_000 and heavy["rows_per_s"] > 0
+    assert heavy["cpu_s"] >= 0 and heavy["wall_s"] >= 0
+    assert heavy["peak_delta_mb"] >= 20  # 32 MB block
+    assert (tmp_path / "profiles" / "heavy.prof").exists()
+    assert peak_rss() > 0
+
+    report = json.loads(run.write(tmp_path / "run_profile.json").read_text())
+    assert [s["name"] for s in report["spans"]] == ["light", "heavy"]
+    assert report["total_wall_s"] >= heavy["wall_s"]
+
+
+def test_profile_stages_from_env(monkeypatch):
+    monkeypatch.setenv("SPREAD_PROFILE", "spreads, interpolate_di")
+    monkeypatch.setenv("SPREAD_PROFILER", "pyinstrument")
+    run = RunProfile.from_env()
+    assert run.profile == {"spreads", "interpolate_di"}
+    assert run.profiler == "pyinstrument"
+
+
+def test_concurrent_spans_measure_their_own_thread():
+    run = RunProfile()
+    barrier = threading.Barrier(2, timeout=5)
+
+    def busy():
+        with run.span("busy", memory=False):
+            barrier.wait()
+            with step("loop", rows=1):
+                end = time.perf_counter() + 0.3
+                while time.perf_counter() < end:
+                    pass
+
+    def idle():
+        with run.span("idle", memory=False):
+            barrier.wait()
+            time.sleep(0.3)
+
+    threads = [threading.Thread(target=f) for f in (busy, idle)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    spans = {s["name"]: s for s in run.spans}
+    assert spans["busy"]["cpu_s"] > 0.2 and spans["idle"]["cpu_s"] < 0.1
+    assert spans["busy"]["peak_rss_mb"] is None and spans["idle"]["peak_delta_mb"] is None
+    assert spans["busy/loop"]["parent"] == "busy" and spans["busy/loop"]["cpu_s"] > 0.2
+    report = run.report()
+    assert report["total_cpu_s"] == round(spans["busy"]["cpu_s"] + spans["idle"]["cpu_s"], 4)
+    assert report["peak_rss_mb"] > 0
+    assert "  loop" in run.summary()
+
+    with step("sem span") as record:  # fora de um span: não registra nada
+        pass
+    assert len(run.spans) == 3 and "wall_s" not in record
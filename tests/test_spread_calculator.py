@@ -41,5 +41,26 @@ def test_compute_spread_positive():
     result, skipped = compute_spreads(corp_base, yields_ts, yc_table, obs_win, tenors_dict)
 
     assert not result.empty
-    assert skipped == []
-    assert all(result["SPREAD"] > 0)
\ No newline at end of file
+    # 2025-01-01 é feriado: a curva DI dessa data é registrada como ignorada
+    assert [(bond, date) for bond, date, _ in skipped] == [("BOND1", pd.Timestamp("2025-01-01"))]
+    assert all(result["SPREAD"] > 0)
+
+def test_flag_reindex_and_spreads_share_the_configured_calendar(monkeypatch):
+    from core import pipeline
+
+    # 2025-07-09 é feriado só em São Paulo (B3), dia útil na ANBIMA
+    index = pd.to_datetime(["2025-07-08", "2025-07-09", "2025-07-10"])
+    yields_ts = pd.DataFrame({"BOND1": [12.5, 12.7, 12.9]}, index=index)
+    monkeypatch.setattr(pipeline, "load_yield_surface", lambda path: yields_ts.copy())
+    corp_base = pd.DataFrame({"id": ["BOND1"], "MATURITY": [pd.Timestamp("2026-07-01")]})
+    yc_table = pd.DataFrame({"1-year": 11.0, "2-year": 11.5}, index=index)
+    obs_win = {"BOND1": (index[0], index[-1])}
+
+    for calendar, n in (("cdr_anbima", 3), ("cdr_b3_settlement", 2)):
+        panel, off_calendar = pipeline.yields_panel_stage("ya.xlsx", calendar)
+        assert off_calendar == 3 - n and len(panel) == n
+        result, skipped = compute_spreads(corp_base, panel, yc_table, obs_win, {"1-year": 1.0, "2-year": 2.0},
+                                          calendar)
+        assert len(result) == n
+        # A curva DI do feriado B3 não some: vai para os ignorados
+        assert [d for _, d, _ in skipped] == list(index.difference(panel.index))
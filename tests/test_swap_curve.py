@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from finmath.SwapCurve.SwapCurve import SwapCurve, FlatForward
+
+
+def _rates():
+    dates = pd.bdate_range("2024-01-02", periods=30)
+    terms = ["21D", "63D", "126D", "252D", "504D", "1260D"]
+    rng = np.random.default_rng(7)
+    base = np.array([10.5, 10.7, 10.9, 11.2, 11.5, 11.9])
+    values = base[:, None] + rng.normal(0, 0.05, (len(terms), len(dates)))
+    rates = pd.DataFrame(values, index=terms, columns=dates)
+    rates.iloc[4, 3] = np.nan  # uma curva sem o vértice de 504 DU
+    return rates
+
+
+def _flat_forward_scalar(rates, maturities, desired, convention=252):
+    logs = [np.log(1 / (1 + r / 100) ** (m / convention)) for r, m in zip(rates, maturities)]
+    disc = np.interp(desired, maturities, logs)
+    return (1 / np.exp(disc)) ** (convention / desired) * 100 - 100
+
+
+def test_flat_forward_interpolate_matches_scalar_formula():
+    rates, maturities = [10.5, 10.9, 11.5], [21, 126, 504]
+    got = FlatForward().interpolate(rates, maturities, [50, 300], 252)
+    assert isinstance(got, list)
+    assert np.allclose(got, [_flat_forward_scalar(rates, maturities, d) for d in (50, 300)])
+
+
+def test_get_rate_flat_forward_over_history():
+    rates = _rates()
+    curve = SwapCurve(rates)
+    desired = [30, 200, 700]
+    info = curve.get_rate(list(rates.columns), desired, ["flat_forward"])["flat_forward"]
+
+    assert info.shape == (len(rates.columns), len(desired))
+    for date in rates.columns:
+        col = rates[date].dropna()
+        mats = [SwapCurve._days_in_term(t, "business_days") for t in col.index]
+        expected = [_flat_forward_scalar(col.values, mats, d) for d in desired]
+        assert np.allclose(info.loc[date, desired].values, expected)
+
+
+def test_get_rate_batched_matches_per_date_scipy():
+    from scipy.interpolate import interp1d
+
+    rates = _rates()
+    desired = [30, 200, 700]
+    methods = ["cubic", "linear", "nearest"]
+    info = SwapCurve(rates).get_rate(list(rates.columns), desired, methods)
+
+    for method in methods:
+        assert info[method].shape == (len(rates.columns), len(desired))
+        for date in rates.columns[:5]:
+            col = rates[date].dropna()
+            mats = [SwapCurve._days_in_term(t, "business_days") for t in col.index]
+            expected = interp1d(mats, col.values, kind=method)(desired)
+            assert np.allclose(info[method].loc[date].values, expected)
+
+
+def test_get_forward_matrix_matches_single_pair_forward():
+    rates = _rates()
+    curve = SwapCurve(rates)
+    pairs = [(30, 200), (100, 700)]
+    forwards = curve.get_forward_matrix(pairs, "linear")
+
+    assert forwards.shape == (len(rates.columns), len(pairs))
+    date = rates.columns[10]
+    r = curve.get_rate([date], [30, 200], ["linear"])["linear"].loc[date]
+    esperado = SwapCurve._forward_rate(date, 30, 200, r[30], r[200], 252)
+    assert np.isclose(forwards.loc[date, (30, 200)], esperado)
+    assert forwards[(30, 200)].equals(curve.get_historic_forward(30, 200, interpolate_method="linear"))
+
+
+def test_import_does_not_load_matplotlib_or_calendars():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "from finmath.SwapCurve.SwapCurve import SwapCurve\n"
+        "assert 'matplotlib' not in sys.modules\n"
+        "assert not SwapCurve.calendars._resolved\n"
+        "assert len(SwapCurve.calendars['br_anbima']) > 0\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+from core.spread_calculator import compute_spreads
+from core.windowing import build_observation_windows
+from utils.file_io import load_inputs, parquet_available
+from utils.interpolation import interpolate_di_surface
+from utils.synthetic_data import generate_synthetic_data, write_synthetic_data
+from config import CONFIG
+
+
+def _small(**kwargs):
+    return generate_synthetic_data(n_bonds=20, n_years=0.25, n_di_contracts=12, **kwargs)
+
+
+def test_same_seed_same_data():
+    a, b, c = _small(seed=7), _small(seed=7), _small(seed=8)
+    for name in a:
+        pd.testing.assert_frame_equal(a[name], b[name])
+    assert not a["ya"].equals(c["ya"])
+
+
+def test_excel_feeds_load_inputs_and_spreads(tmp_path):
+    data = _small(sparsity=0.1, eligible=0.8)
+    config = write_synthetic_data(tmp_path, data, formats=("xlsx",))
+    assert config["YA_PATH"] == tmp_path / "ya.xlsx"
+
+    surface, corp_base, yields_ts = load_inputs(config)
+    assert 0 < len(corp_base) < 20
+    assert list(yields_ts.columns) == list(data["corp"]["id"])
+    # Volume zero (cotações esparsas) sai em load_inputs
+    assert len(surface) == (data["di"]["volume"] > 0).sum()
+
+    yc_table = interpolate_di_surface(surface, CONFIG["TENORS"])
+    windows = build_observation_windows(corp_base, yields_ts, CONFIG["OBS_WINDOW"])
+    corp_bonds, skipped = compute_spreads(corp_base, yields_ts, yc_table, windows, CONFIG["TENORS"])
+    assert corp_bonds["SPREAD"].between(0, 10).all()
+    assert skipped
+
+
+def test_parquet_round_trip(tmp_path):
+    if not parquet_available():
+        pytest.skip("pyarrow/fastparquet não instalado")
+    data = _small()
+    config = write_synthetic_data(tmp_path, data, formats=("parquet", "xlsx"))
+    assert config["HIST_CURVE_PATH"].suffix == ".parquet"
+    assert (tmp_path / "ya.xlsx").exists()
+    surface, corp_base, yields_ts = load_inputs(config)
+    assert len(yields_ts) == len(data["ya"])